@@ -0,0 +1,270 @@
+import functools
+import logging
+import math
+import time
+import uuid
+from django.conf import settings
+from django.db import connection
+from rest_framework import status
+from rest_framework.response import Response
+from .distributed_lock import redis_client
+
+logger = logging.getLogger(__name__)
+
+TICKET_HEADER = 'X-Admission-Ticket'
+
+DEFAULT_CONFIG = {
+    'INITIAL_LIMIT': 50,
+    'MIN_LIMIT': 5,
+    'MAX_LIMIT': 500,
+    'TARGET_DB_LATENCY_MS': 20,
+    'LEASE_SECONDS': 30,
+    'TICKET_TTL': 600,
+    'ADMIT_LEASE_SECONDS': 10,
+}
+
+# 대기열 진행 처리
+# 처리 중인 요청과 입장이 허가되었지만 아직 다시 요청하지 않은 번호표(admitted)를 합쳐 limit보다 적을 때만
+# 빈 자리만큼 head를 진행시키고, 새로 허가된 번호표는 ADMIT_LEASE_SECONDS 동안 admitted에 자리를 잡아 둡니다.
+# KEYS: inflight, head, tail, limit, tickets, admitted
+# ARGV: now, initial_limit, ticket_ttl, admit_lease, ...
+_ADVANCE = """
+local now = tonumber(ARGV[1])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+redis.call('ZREMRANGEBYSCORE', KEYS[5], '-inf', now - tonumber(ARGV[3]))
+redis.call('ZREMRANGEBYSCORE', KEYS[6], '-inf', now)
+local limit = tonumber(redis.call('GET', KEYS[4]) or ARGV[2])
+local active = redis.call('ZCARD', KEYS[1]) + redis.call('ZCARD', KEYS[6])
+local head = tonumber(redis.call('GET', KEYS[2]) or 0)
+local tail = tonumber(redis.call('GET', KEYS[3]) or 0)
+local free = math.floor(limit - active)
+if head < tail and free > 0 then
+    local next_head = math.min(tail, head + free)
+    for ticket = head + 1, next_head do
+        redis.call('ZADD', KEYS[6], now + tonumber(ARGV[4]), ticket)
+    end
+    active = active + next_head - head
+    head = next_head
+    redis.call('SET', KEYS[2], head)
+end
+"""
+
+# 입장 처리: 허가된 번호표는 admitted 자리를 처리 중 요청으로 옮기고,
+# 번호표가 없으면 대기 중인 번호표가 없고 자리가 남을 때만 바로 입장시킵니다.
+# ARGV: now, initial_limit, ticket_ttl, admit_lease, request_id, lease, ticket(없으면 ''), ident
+_ENTER_SCRIPT = redis_client.register_script(_ADVANCE + """
+local ticket = tonumber(ARGV[7])
+if ticket then
+    local member = ARGV[7] .. ':' .. ARGV[8]
+    if not redis.call('ZSCORE', KEYS[5], member) then
+        ticket = nil
+    elseif ticket <= head then
+        redis.call('ZREM', KEYS[5], member)
+        if redis.call('ZREM', KEYS[6], ARGV[7]) == 1 then
+            redis.call('ZADD', KEYS[1], now + tonumber(ARGV[6]), ARGV[5])
+            return {1, 0, head, tostring(limit)}
+        end
+        -- 입장 허가 후 ADMIT_LEASE_SECONDS 안에 다시 요청하지 않은 번호표는 새로 줄을 섭니다.
+        ticket = nil
+    else
+        return {0, ticket, head, tostring(limit)}
+    end
+end
+if head >= tail and active < limit then
+    redis.call('ZADD', KEYS[1], now + tonumber(ARGV[6]), ARGV[5])
+    return {1, 0, head, tostring(limit)}
+end
+tail = redis.call('INCR', KEYS[3])
+redis.call('ZADD', KEYS[5], now, tail .. ':' .. ARGV[8])
+return {0, tail, head, tostring(limit)}
+""")
+
+# ARGV: now, initial_limit, ticket_ttl, admit_lease, ticket, ident
+_STATUS_SCRIPT = redis_client.register_script(_ADVANCE + """
+if not redis.call('ZSCORE', KEYS[5], ARGV[5] .. ':' .. ARGV[6]) then
+    return {-1, head, tostring(limit)}
+end
+if tonumber(ARGV[5]) > head then
+    return {0, head, tostring(limit)}
+end
+if not redis.call('ZSCORE', KEYS[6], ARGV[5]) then
+    return {-1, head, tostring(limit)}
+end
+return {1, head, tostring(limit)}
+""")
+
+# 요청 종료 처리 및 DB 지연 시간 기반 limit 조정
+# KEYS: inflight, limit, latency
+# ARGV: request_id, latency_ms(측정값이 없으면 -1), target_ms, min_limit, max_limit, initial_limit
+_RELEASE_SCRIPT = redis_client.register_script("""
+redis.call('ZREM', KEYS[1], ARGV[1])
+local sample = tonumber(ARGV[2])
+if sample < 0 then
+    return false
+end
+local ewma = tonumber(redis.call('GET', KEYS[3]) or sample)
+ewma = 0.2 * sample + 0.8 * ewma
+redis.call('SET', KEYS[3], tostring(ewma))
+local limit = tonumber(redis.call('GET', KEYS[2]) or ARGV[6])
+local target = tonumber(ARGV[3])
+if ewma > target then
+    limit = 0.9 * limit + 0.1 * (limit * target / ewma)
+else
+    limit = limit + 1 / limit
+end
+limit = math.max(tonumber(ARGV[4]), math.min(tonumber(ARGV[5]), limit))
+redis.call('SET', KEYS[2], tostring(limit))
+return tostring(limit)
+""")
+
+
+def get_config(scope):
+    config = getattr(settings, 'ADMISSION_CONTROL', {}).get(scope)
+    if config is None:
+        return None
+    return {**DEFAULT_CONFIG, **config}
+
+
+def _keys(scope):
+    prefix = f"admission:{scope}"
+    return {
+        'inflight': f"{prefix}:inflight",
+        'head': f"{prefix}:head",
+        'tail': f"{prefix}:tail",
+        'limit': f"{prefix}:limit",
+        'tickets': f"{prefix}:tickets",
+        'admitted': f"{prefix}:admitted",
+        'latency': f"{prefix}:latency",
+    }
+
+
+def _advance_keys(keys):
+    return [keys['inflight'], keys['head'], keys['tail'], keys['limit'], keys['tickets'], keys['admitted']]
+
+
+def _retry_after(scope, position, limit):
+    latency_ms = float(redis_client.get(_keys(scope)['latency']) or 100)
+    return max(1, math.ceil(position * latency_ms / 1000 / max(limit, 1)))
+
+
+def enter(scope, ident, ticket=None):
+    """
+    입장을 시도합니다.
+    (입장 여부, 요청 ID 또는 대기 번호표, 대기 순번, limit)을 반환합니다.
+    """
+    config = get_config(scope)
+    keys = _keys(scope)
+    request_id = uuid.uuid4().hex
+    admitted, issued, head, limit = _ENTER_SCRIPT(
+        keys=_advance_keys(keys),
+        args=[time.time(), config['INITIAL_LIMIT'], config['TICKET_TTL'], config['ADMIT_LEASE_SECONDS'], request_id,
+              config['LEASE_SECONDS'], ticket or '', ident]
+    )
+    if admitted:
+        return True, request_id, 0, float(limit)
+    return False, issued, issued - head, float(limit)
+
+
+def get_status(scope, ident, ticket):
+    """
+    번호표의 대기 상태를 조회합니다. 만료되었거나 없는 번호표이면 None을 반환합니다.
+    입장이 허가된 번호표는 ADMIT_LEASE_SECONDS 안에 다시 요청해야 하며, 그동안 자리를 차지합니다.
+    """
+    config = get_config(scope)
+    keys = _keys(scope)
+    admitted, head, limit = _STATUS_SCRIPT(
+        keys=_advance_keys(keys),
+        args=[time.time(), config['INITIAL_LIMIT'], config['TICKET_TTL'], config['ADMIT_LEASE_SECONDS'], ticket, ident]
+    )
+    if admitted < 0:
+        return None
+    position = max(0, ticket - head)
+    return {
+        'ticket': ticket,
+        'admitted': bool(admitted),
+        'position': position,
+        'retry_after': 0 if admitted else _retry_after(scope, position, float(limit)),
+    }
+
+
+def release(scope, request_id, db_latency_ms=None):
+    config = get_config(scope)
+    keys = _keys(scope)
+    _RELEASE_SCRIPT(
+        keys=[keys['inflight'], keys['limit'], keys['latency']],
+        args=[request_id, -1 if db_latency_ms is None else db_latency_ms, config['TARGET_DB_LATENCY_MS'],
+              config['MIN_LIMIT'], config['MAX_LIMIT'], config['INITIAL_LIMIT']]
+    )
+
+
+class QueryTimer:
+    """요청 처리 중 실행된 쿼리의 평균 실행 시간(ms)을 측정합니다."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.monotonic()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.total += time.monotonic() - start
+            self.count += 1
+
+    @property
+    def average_ms(self):
+        if not self.count:
+            return None
+        return self.total / self.count * 1000
+
+
+def with_admission_control(scope, methods=None):
+    """
+    대기열(waiting room) 기반 입장 제어 데코레이터
+
+    동시에 처리 중인 요청이 limit를 넘으면 대기 번호표를 발급하고 429를 반환합니다.
+    클라이언트는 대기 상태 조회 API로 입장 여부를 확인한 뒤 X-Admission-Ticket 헤더에
+    번호표를 담아 다시 요청합니다. limit는 관측된 DB 지연 시간에 따라 조정됩니다.
+    methods를 지정하면 해당 메서드의 요청만 입장 제어합니다. (조회 요청이 쓰기용 자리를 차지하지 않도록)
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(request, *args, **kwargs):
+            if get_config(scope) is None or (methods is not None and request.method not in methods):
+                return func(request, *args, **kwargs)
+
+            ident = request.user.pk if request.user and request.user.is_authenticated else request.META.get('REMOTE_ADDR')
+            ticket = request.headers.get(TICKET_HEADER)
+            try:
+                admitted, value, position, limit = enter(scope, ident, int(ticket) if ticket and ticket.isdigit() else None)
+            except Exception as e:
+                logger.error(f"Error entering admission control {scope}: {str(e)}")
+                return func(request, *args, **kwargs)
+
+            if not admitted:
+                retry_after = _retry_after(scope, position, limit)
+                response = Response(
+                    {
+                        'error': '요청이 많아 대기열에 등록되었습니다. 대기 상태를 확인한 뒤 다시 시도해주세요.',
+                        'ticket': value,
+                        'position': position,
+                        'retry_after': retry_after,
+                    },
+                    status=status.HTTP_429_TOO_MANY_REQUESTS
+                )
+                response['Retry-After'] = str(retry_after)
+                return response
+
+            timer = QueryTimer()
+            try:
+                with connection.execute_wrapper(timer):
+                    return func(request, *args, **kwargs)
+            finally:
+                try:
+                    release(scope, value, timer.average_ms)
+                except Exception as e:
+                    logger.error(f"Error releasing admission control {scope}: {str(e)}")
+
+        return wrapper
+    return decorator
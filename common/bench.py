@@ -0,0 +1,311 @@
+import http.client
+import json
+import math
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from urllib.parse import urlencode, urlsplit
+from django.contrib.auth.hashers import make_password
+from django.db import connection, models
+from django.utils import timezone
+from examslots.models import ExamSlot, DailySummary
+from reservation.models import Reservation
+from users.models import User
+from users.token_store import issue_token
+
+BENCH_USER_PREFIX = "bench_user_"
+BENCH_ADMIN_USERNAME = "bench_admin"
+OPERATIONS = ['read', 'create', 'modify', 'cancel', 'confirm']
+DEFAULT_MIX = 'read=70,create=15,modify=5,cancel=5,confirm=5'
+DATETIME_FORMAT = '%Y-%m-%d %H:%M'
+
+
+def parse_mix(value):
+    """'read=70,create=15,...' 형식의 요청 비율을 {작업: 가중치}로 변환합니다."""
+    mix = {}
+    for item in value.split(','):
+        name, _, weight = item.partition('=')
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"알 수 없는 작업입니다: {name} (가능: {', '.join(OPERATIONS)})")
+        mix[name] = float(weight)
+    if not any(mix.values()):
+        raise ValueError("비율의 합이 0보다 커야 합니다.")
+    return mix
+
+
+def percentile(values, p):
+    if not values:
+        return None
+    # nearest-rank 방식
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, math.ceil(p / 100 * len(values)) - 1))
+    return values[index]
+
+
+def seed(users, days):
+    """
+    벤치마크용 사용자/관리자/시간대를 준비하고 토큰을 발급합니다.
+    이미 있는 bench 사용자와 시간대는 그대로 사용합니다.
+    """
+    password = make_password(None)
+    existing = set(User.objects.filter(username__startswith=BENCH_USER_PREFIX).values_list('username', flat=True))
+    User.objects.bulk_create([
+        User(username=f"{BENCH_USER_PREFIX}{i}", password=password)
+        for i in range(users) if f"{BENCH_USER_PREFIX}{i}" not in existing
+    ], batch_size=1000)
+    admin, _ = User.objects.get_or_create(
+        username=BENCH_ADMIN_USERNAME, defaults={'password': password, 'is_staff': True, 'is_superuser': True}
+    )
+
+    bench_users = list(User.objects.filter(username__in=[f"{BENCH_USER_PREFIX}{i}" for i in range(users)]))
+
+    start_date = timezone.now().date() + timedelta(days=4)
+    dates = [start_date + timedelta(days=i) for i in range(days)]
+    ExamSlot.objects.bulk_create(
+        [ExamSlot(date=date, hour=hour) for date in dates for hour in range(24)],
+        ignore_conflicts=True
+    )
+    DailySummary.refresh(dates)
+
+    return {
+        'user_tokens': [issue_token(user) for user in bench_users],
+        'admin_token': issue_token(admin),
+        'dates': dates,
+    }
+
+
+def cleanup():
+    """bench 사용자의 확정된 예약 인원을 되돌리고 사용자를 삭제합니다."""
+    for reservation in Reservation.objects.filter(user__username__startswith=BENCH_USER_PREFIX, status='accepted'):
+        reservation.cancel()
+    return User.objects.filter(
+        models.Q(username__startswith=BENCH_USER_PREFIX) | models.Q(username=BENCH_ADMIN_USERNAME)
+    ).delete()[0]
+
+
+def check_consistency(dates):
+    """
+    시간대의 current_count가 확정된 예약 인원 합계와 같은지 확인합니다.
+    일치하지 않는 시간대 목록을 반환합니다.
+    """
+    expected = {
+        row['exam_slots']: row['total']
+        for row in Reservation.objects.filter(status='accepted', exam_slots__date__in=dates)
+        .values('exam_slots').annotate(total=models.Sum('count'))
+    }
+    mismatches = []
+    for slot in ExamSlot.objects.with_usage().filter(date__in=dates):
+        if slot.used_count != expected.get(slot.id, 0):
+            mismatches.append({
+                'date': slot.date.isoformat(),
+                'hour': slot.hour,
+                'current_count': slot.used_count,
+                'expected': expected.get(slot.id, 0),
+            })
+    return mismatches
+
+
+class Client:
+    """워커 스레드별 keep-alive HTTP 클라이언트"""
+
+    def __init__(self, base_url, timeout):
+        parts = urlsplit(base_url)
+        connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        self.connection = connection_class(parts.hostname, parts.port, timeout=timeout)
+        self.prefix = parts.path.rstrip('/')
+
+    def request(self, method, path, token, body=None, query=None):
+        url = f"{self.prefix}{path}"
+        if query:
+            url = f"{url}?{urlencode(query)}"
+        headers = {'Content-Type': 'application/json'}
+        if token:
+            headers['Authorization'] = f"Token {token}"
+        payload = json.dumps(body) if body is not None else None
+
+        start = time.perf_counter()
+        try:
+            self.connection.request(method, url, body=payload, headers=headers)
+            response = self.connection.getresponse()
+            data = response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            self.connection.close()
+            data, status = b'', 0
+        elapsed = time.perf_counter() - start
+
+        try:
+            data = json.loads(data) if data else None
+        except ValueError:
+            data = None
+        return status, elapsed, data
+
+
+class Workload:
+    """
+    요청 비율에 따라 작업을 고르고 실행합니다.
+    생성된 예약은 (사용자 토큰, 예약 ID)로 공유 풀에 보관하여 수정/취소/확정 작업에 사용합니다.
+    """
+
+    def __init__(self, seed_data, mix, max_count=3):
+        self.seed_data = seed_data
+        self.operations = list(mix)
+        self.weights = [mix[name] for name in self.operations]
+        self.max_count = max_count
+        self.pending = []
+        self.lock = threading.Lock()
+
+    def _take_pending(self):
+        # 대기 중인 예약 하나를 풀에서 꺼냅니다. (없으면 None)
+        with self.lock:
+            return self.pending.pop(random.randrange(len(self.pending))) if self.pending else None
+
+    def _random_time_range(self):
+        date = random.choice(self.seed_data['dates'])
+        hour = random.randrange(0, 23)
+        start = datetime.combine(date, datetime.min.time()) + timedelta(hours=hour)
+        end = start + timedelta(hours=random.choice([1, 1, 1, 2]))
+        return start.strftime(DATETIME_FORMAT), end.strftime(DATETIME_FORMAT)
+
+    def run_one(self, client):
+        operation = random.choices(self.operations, self.weights)[0]
+        token = random.choice(self.seed_data['user_tokens'])
+
+        if operation == 'read':
+            date = random.choice(self.seed_data['dates'])
+            status, elapsed, _ = client.request('GET', '/examslots/available/', token, query={'date': date.isoformat()})
+        elif operation == 'create':
+            start_time, end_time = self._random_time_range()
+            status, elapsed, data = client.request('POST', '/reservation/', token, body={
+                'start_time': start_time, 'end_time': end_time, 'count': random.randint(1, self.max_count)
+            })
+            if status == 201 and data:
+                with self.lock:
+                    self.pending.append((token, data['id']))
+        elif operation == 'modify':
+            # 수정한 예약은 계속 대기 중이므로 풀에 남겨 둡니다.
+            with self.lock:
+                owner = random.choice(self.pending) if self.pending else None
+            if owner is None:
+                return None
+            start_time, end_time = self._random_time_range()
+            status, elapsed, _ = client.request('PATCH', f"/reservation/my/{owner[1]}/", owner[0], body={
+                'start_time': start_time, 'end_time': end_time
+            })
+        elif operation == 'cancel':
+            owner = self._take_pending()
+            if owner is None:
+                return None
+            status, elapsed, _ = client.request('DELETE', f"/reservation/my/{owner[1]}/", owner[0])
+        else:
+            owner = self._take_pending()
+            if owner is None:
+                return None
+            reservation_id = owner[1]
+            status, elapsed, _ = client.request(
+                'POST', f"/reservation/admin/{reservation_id}/confirm/", self.seed_data['admin_token']
+            )
+
+        return operation, status, elapsed
+
+
+def run(base_url, seed_data, mix, concurrency, duration=None, total_requests=None, timeout=30):
+    """
+    concurrency개의 워커 스레드로 duration초 동안(또는 total_requests개) 요청을 보냅니다.
+    (작업, 상태 코드, 지연 시간) 목록과 전체 소요 시간을 반환합니다.
+    """
+    workload = Workload(seed_data, mix)
+    results = []
+    results_lock = threading.Lock()
+    remaining = [total_requests]
+    deadline = time.monotonic() + duration if duration else None
+
+    def take():
+        if deadline is not None and time.monotonic() >= deadline:
+            return False
+        if remaining[0] is None:
+            return True
+        with results_lock:
+            if remaining[0] <= 0:
+                return False
+            remaining[0] -= 1
+            return True
+
+    def worker():
+        client = Client(base_url, timeout)
+        local = []
+        while take():
+            result = workload.run_one(client)
+            if result is not None:
+                local.append(result)
+        with results_lock:
+            results.extend(local)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, time.perf_counter() - start
+
+
+def summarize(results, elapsed):
+    """작업별 처리량, 지연 시간 백분위(ms), 상태 코드 비율을 계산합니다."""
+    def stats(items):
+        latencies = [elapsed_ * 1000 for _, _, elapsed_ in items]
+        statuses = {}
+        for _, status, _ in items:
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+        count = len(items)
+        return {
+            'requests': count,
+            'throughput': round(count / elapsed, 2) if elapsed else 0,
+            'p50_ms': percentile(latencies, 50),
+            'p95_ms': percentile(latencies, 95),
+            'p99_ms': percentile(latencies, 99),
+            'status_counts': statuses,
+            'rate_409': round(statuses.get('409', 0) / count, 4) if count else 0,
+            'rate_500': round(statuses.get('500', 0) / count, 4) if count else 0,
+        }
+
+    by_operation = {}
+    for item in results:
+        by_operation.setdefault(item[0], []).append(item)
+
+    return {
+        'elapsed_seconds': round(elapsed, 3),
+        'total': stats(results),
+        'operations': {name: stats(items) for name, items in sorted(by_operation.items())},
+    }
+
+
+class LocalServer:
+    """벤치마크 대상 URL이 없을 때 사용하는 스레드 기반 Django 개발 서버"""
+
+    def __init__(self, host='127.0.0.1', port=0):
+        from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler, get_internal_wsgi_application
+
+        class QuietHandler(WSGIRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadedWSGIServer((host, port), QuietHandler, allow_reuse_address=True)
+        self.server.set_app(get_internal_wsgi_application())
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+        connection.close()
@@ -0,0 +1,250 @@
+import itertools
+import random
+from datetime import datetime, timedelta
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.utils import timezone
+from examslots.granularity import DEFAULT_EXAM_TYPE
+from examslots.models import DEFAULT_VENUE_ID, ExamSlot, DailySummary, SlotCapacityDelta, SlotCapacityStripe
+from reservation.models import Reservation
+from users.models import User
+
+SLOT_DAYS = 90
+SLOT_START_OFFSET_DAYS = 3
+DEFAULT_PASSWORD = 'password1234!'
+
+# 시간대별 선호도 (오전 9~11시, 오후 1~4시에 몰림)
+HOUR_WEIGHTS = [1, 1, 1, 1, 1, 1, 2, 4, 8, 14, 16, 12, 6, 12, 14, 14, 12, 8, 5, 4, 3, 2, 1, 1]
+DURATION_WEIGHTS = {1: 60, 2: 30, 3: 10}
+COUNT_WEIGHTS = {1: 60, 2: 20, 3: 10, 4: 6, 5: 4}
+STATUS_WEIGHTS = {'pending': 50, 'accepted': 40, 'cancelled': 10}
+
+
+def _csv_value(value):
+    # 빈 문자열은 따옴표로 감싸고 None은 비워 두어 NULL과 구분합니다.
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, str):
+        return '"' + value.replace('"', '""') + '"'
+    return str(value)
+
+
+class CsvStream:
+    """
+    행 generator를 CSV 텍스트 파일처럼 읽을 수 있게 합니다. (psycopg2 copy_expert용)
+    전체 데이터를 메모리에 올리지 않고 read() 호출마다 필요한 만큼만 만듭니다.
+    """
+
+    def __init__(self, rows):
+        self.rows = iter(rows)
+        self.pending = ''
+
+    def read(self, size=-1):
+        lines = []
+        length = len(self.pending)
+        while size < 0 or length < size:
+            try:
+                line = ','.join(_csv_value(value) for value in next(self.rows)) + '\n'
+            except StopIteration:
+                break
+            lines.append(line)
+            length += len(line)
+        data = self.pending + ''.join(lines)
+        if size < 0:
+            size = len(data)
+        chunk, self.pending = data[:size], data[size:]
+        return chunk
+
+
+def copy_rows(table, columns, rows):
+    """
+    PostgreSQL COPY로 행을 스트리밍합니다. psycopg(3)와 psycopg2를 모두 지원합니다.
+    None은 NULL로 기록됩니다.
+    """
+    column_sql = ', '.join(connection.ops.quote_name(column) for column in columns)
+    table_sql = connection.ops.quote_name(table)
+    with connection.cursor() as cursor:
+        raw = cursor.cursor
+        if hasattr(raw, 'copy_expert'):
+            raw.copy_expert(f"COPY {table_sql} ({column_sql}) FROM STDIN WITH (FORMAT csv)", CsvStream(rows))
+        else:
+            with raw.copy(f"COPY {table_sql} ({column_sql}) FROM STDIN") as copy:
+                for row in rows:
+                    copy.write_row(row)
+
+
+class WeightedChoice:
+    """누적 가중치를 미리 계산해 두고 반복해서 뽑습니다."""
+
+    def __init__(self, weights):
+        self.population = list(weights)
+        self.cum_weights = list(itertools.accumulate(weights.values()))
+
+    def __call__(self, rng):
+        return rng.choices(self.population, cum_weights=self.cum_weights)[0]
+
+
+def _reset_sequence(model):
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence(%s, 'id'), COALESCE((SELECT MAX(id) FROM {connection.ops.quote_name(table)}), 1))",
+            [table]
+        )
+
+
+def _next_id(model):
+    return (model.objects.order_by('-id').values_list('id', flat=True).first() or 0) + 1
+
+
+def seed_slots(start_date):
+    """조회 가능 기간 전체의 시간대 중 없는 것만 COPY로 추가하고 {(날짜, 시간): (id, 남은 인원)}을 반환합니다."""
+    # 기본 시험장, 기본 시험 종류(1시간 단위)의 시간대만 생성합니다. (venue, exam_type 등은 DB 기본값 사용)
+    existing = set(ExamSlot.objects.filter(venue_id=DEFAULT_VENUE_ID, exam_type=DEFAULT_EXAM_TYPE, date__gte=start_date).values_list('date', 'hour'))
+    now = timezone.now()
+    copy_rows(ExamSlot._meta.db_table, ['date', 'hour', 'max_capacity', 'current_count', 'created_at', 'updated_at'], (
+        (date, hour, 50000, 0, now, now)
+        for date in (start_date + timedelta(days=day) for day in range(SLOT_DAYS))
+        for hour in range(24)
+        if (date, hour) not in existing
+    ))
+    return {
+        (slot['date'], slot['hour']): (slot['id'], slot['max_capacity'] - slot['current_count'])
+        for slot in ExamSlot.objects.filter(venue_id=DEFAULT_VENUE_ID, exam_type=DEFAULT_EXAM_TYPE, date__gte=start_date).values('id', 'date', 'hour', 'max_capacity', 'current_count')
+    }
+
+
+def seed_users(count, password, seed):
+    """사용자를 COPY로 추가하고 추가된 id 범위를 반환합니다. (가입일은 최근 180일에 분포)"""
+    rng = random.Random(seed)
+    first_id = _next_id(User)
+    password_hash = make_password(password)
+    now = timezone.now()
+
+    def rows():
+        for user_id in range(first_id, first_id + count):
+            joined = now - timedelta(seconds=rng.randrange(180 * 86400))
+            yield (user_id, password_hash, f"seed_{user_id}", '', '', '', False, False, True, joined, joined, joined)
+
+    copy_rows(User._meta.db_table, [
+        'id', 'password', 'username', 'first_name', 'last_name', 'email',
+        'is_superuser', 'is_staff', 'is_active', 'date_joined', 'created_at', 'updated_at'
+    ], rows())
+    _reset_sequence(User)
+    return first_id, first_id + count
+
+
+def generate_reservations(first_id, count, user_range, slots, start_date, now, seed):
+    """
+    (예약 행, 연결할 시간대 id 목록)을 생성합니다.
+    같은 seed로 다시 호출하면 같은 순서의 같은 값이 나오므로 예약/연결 테이블을 따로 COPY할 수 있습니다.
+    확정(accepted) 예약은 시간대의 남은 인원을 넘지 않도록 하고, 넘으면 대기(pending)로 바꿉니다.
+    """
+    rng = random.Random(seed)
+    accepted_counts = {}
+    # 가까운 날짜와 주말이 더 인기 있음
+    choose_day = WeightedChoice({
+        day: (1.5 if (start_date + timedelta(days=day)).weekday() >= 5 else 1.0) / (1 + day / 30)
+        for day in range(SLOT_DAYS)
+    })
+    choose_hour = WeightedChoice(dict(enumerate(HOUR_WEIGHTS)))
+    choose_duration = WeightedChoice(DURATION_WEIGHTS)
+    choose_count = WeightedChoice(COUNT_WEIGHTS)
+    choose_status = WeightedChoice(STATUS_WEIGHTS)
+    start_datetime = datetime.combine(start_date, datetime.min.time())
+
+    for reservation_id in range(first_id, first_id + count):
+        day = choose_day(rng)
+        duration = choose_duration(rng)
+        hour = min(choose_hour(rng), 24 - duration)
+        start_time = start_datetime + timedelta(days=day, hours=hour)
+        end_time = start_time + timedelta(hours=duration)
+        people = choose_count(rng)
+        status = choose_status(rng)
+
+        slot_keys = [(start_time.date(), h) for h in range(hour, hour + duration)]
+        slot_ids = [slots[key][0] for key in slot_keys if key in slots]
+
+        if status == 'accepted':
+            if all(accepted_counts.get(key, 0) + people <= slots[key][1] for key in slot_keys if key in slots):
+                for key in slot_keys:
+                    accepted_counts[key] = accepted_counts.get(key, 0) + people
+            else:
+                status = 'pending'
+        if status == 'cancelled':
+            # 취소된 예약은 시간대 연결이 해제됩니다.
+            slot_ids = []
+
+        created_at = now - timedelta(seconds=rng.randrange(30 * 86400))
+        yield (
+            (reservation_id, rng.randrange(*user_range), start_time, end_time, people, status, created_at, created_at),
+            slot_ids,
+        )
+
+
+def seed_reservations(count, user_range, slots, start_date, seed):
+    first_id = _next_id(Reservation)
+    now = timezone.now()
+    copy_rows(Reservation._meta.db_table, ['id', 'user_id', 'start_time', 'end_time', 'count', 'status', 'created_at', 'updated_at'], (
+        row for row, _ in generate_reservations(first_id, count, user_range, slots, start_date, now, seed)
+    ))
+
+    through = Reservation.exam_slots.through
+    copy_rows(through._meta.db_table, ['reservation_id', 'examslot_id'], (
+        (row[0], slot_id)
+        for row, slot_ids in generate_reservations(first_id, count, user_range, slots, start_date, now, seed)
+        for slot_id in slot_ids
+    ))
+    _reset_sequence(Reservation)
+
+
+def recompute_current_counts():
+    """
+    모든 시간대의 current_count를 확정된 예약 인원 합계로 한 번에 갱신합니다.
+    합계에 이미 반영되므로 인원 변경분 원장과 인원 구간은 비웁니다.
+    """
+    SlotCapacityDelta.objects.all().delete()
+    SlotCapacityStripe.objects.all().delete()
+    slot_table = connection.ops.quote_name(ExamSlot._meta.db_table)
+    reservation_table = connection.ops.quote_name(Reservation._meta.db_table)
+    through_table = connection.ops.quote_name(Reservation.exam_slots.through._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+            UPDATE {slot_table} AS s
+            SET current_count = COALESCE(t.total, 0)
+            FROM {slot_table} AS s2
+            LEFT JOIN (
+                SELECT rs.examslot_id, SUM(r.count) AS total
+                FROM {through_table} AS rs
+                JOIN {reservation_table} AS r ON r.id = rs.reservation_id
+                WHERE r.status = 'accepted'
+                GROUP BY rs.examslot_id
+            ) AS t ON t.examslot_id = s2.id
+            WHERE s.id = s2.id AND s.current_count <> COALESCE(t.total, 0)
+        """)
+        return cursor.rowcount
+
+
+def seed_dataset(users, reservations, password=DEFAULT_PASSWORD, seed=0):
+    """
+    대량의 사용자/시간대/예약 데이터를 생성합니다. (PostgreSQL 전용)
+    모든 작업은 하나의 트랜잭션에서 실행되며, 마지막에 시간대 인원과 날짜별 요약을 다시 계산합니다.
+    """
+    if connection.vendor != 'postgresql':
+        raise ValueError("seed_dataset은 PostgreSQL에서만 실행할 수 있습니다.")
+
+    start_date = timezone.now().date() + timedelta(days=SLOT_START_OFFSET_DAYS)
+    with transaction.atomic():
+        slots = seed_slots(start_date)
+        user_range = seed_users(users, password, seed)
+        seed_reservations(reservations, user_range, slots, start_date, seed)
+        updated_slots = recompute_current_counts()
+        DailySummary.refresh({date for date, _ in slots})
+
+    with connection.cursor() as cursor:
+        for model in (User, ExamSlot, Reservation, Reservation.exam_slots.through):
+            cursor.execute(f"ANALYZE {connection.ops.quote_name(model._meta.db_table)}")
+
+    return {'users': users, 'reservations': reservations, 'slots': len(slots), 'updated_slots': updated_slots}
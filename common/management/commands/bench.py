@@ -0,0 +1,85 @@
+import json
+from contextlib import ExitStack
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from common.bench import DEFAULT_MIX, LocalServer, check_consistency, cleanup, parse_mix, run, seed, summarize
+
+
+class Command(BaseCommand):
+    help = '예약 가능 시간대 조회/예약 생성/수정/취소/확정 요청을 섞어 부하를 주고 처리량과 지연 시간을 측정합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', help='대상 서버 주소 (생략 시 현재 설정으로 내부 서버를 실행)')
+        parser.add_argument('--users', type=int, default=200, help='벤치마크 사용자 수')
+        parser.add_argument('--days', type=int, default=7, help='예약 대상 날짜 수 (4일 후부터)')
+        parser.add_argument('--concurrency', type=int, default=16, help='동시 요청 수')
+        parser.add_argument('--duration', type=float, default=30, help='측정 시간(초)')
+        parser.add_argument('--requests', type=int, help='총 요청 수 (지정하면 --duration 대신 사용)')
+        parser.add_argument('--mix', default=DEFAULT_MIX, help=f'작업 비율 (기본: {DEFAULT_MIX})')
+        parser.add_argument('--disable-throttling', action='store_true',
+                            help='내부 서버에서 토큰 버킷 throttle과 입장 제어를 끕니다.')
+        parser.add_argument('--output', help='결과(JSON)를 저장할 경로')
+        parser.add_argument('--cleanup', action='store_true', help='측정 후 벤치마크 사용자와 예약을 삭제합니다.')
+
+    def handle(self, *args, **options):
+        try:
+            mix = parse_mix(options['mix'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if options['url'] and options['disable_throttling']:
+            raise CommandError('--disable-throttling은 내부 서버에서만 사용할 수 있습니다.')
+
+        self.stdout.write(f"사용자 {options['users']}명, {options['days']}일치 시간대를 준비합니다.")
+        seed_data = seed(options['users'], options['days'])
+
+        with ExitStack() as stack:
+            if options['disable_throttling']:
+                stack.enter_context(override_settings(
+                    REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'TOKEN_BUCKET_RATES': {}},
+                    ADMISSION_CONTROL={}
+                ))
+            base_url = options['url'] or stack.enter_context(LocalServer()).url
+
+            self.stdout.write(f"{base_url} 대상으로 동시 요청 {options['concurrency']}개 측정을 시작합니다.")
+            results, elapsed = run(
+                base_url, seed_data, mix, options['concurrency'],
+                duration=None if options['requests'] else options['duration'],
+                total_requests=options['requests']
+            )
+
+        report = summarize(results, elapsed)
+        report['config'] = {key: options[key] for key in ('url', 'users', 'days', 'concurrency', 'duration', 'requests', 'mix')}
+        report['consistency_mismatches'] = check_consistency(seed_data['dates'])
+
+        self._print_report(report)
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+
+        if options['cleanup']:
+            self.stdout.write(f"벤치마크 데이터 {cleanup()}건을 삭제했습니다.")
+
+        if report['consistency_mismatches']:
+            raise CommandError(f"current_count 불일치 시간대 {len(report['consistency_mismatches'])}개")
+
+    def _print_report(self, report):
+        self.stdout.write(f"{'작업':<10}{'요청':>8}{'req/s':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'409':>8}{'500':>8}  상태 코드")
+        rows = list(report['operations'].items()) + [('total', report['total'])]
+        for name, stats in rows:
+            fmt = lambda value: f"{value:.1f}" if value is not None else '-'
+            self.stdout.write(
+                f"{name:<10}{stats['requests']:>8}{stats['throughput']:>10}{fmt(stats['p50_ms']):>10}"
+                f"{fmt(stats['p95_ms']):>10}{fmt(stats['p99_ms']):>10}"
+                f"{stats['rate_409']:>8.2%}{stats['rate_500']:>8.2%}  {stats['status_counts']}"
+            )
+
+        if report['consistency_mismatches']:
+            for mismatch in report['consistency_mismatches']:
+                self.stdout.write(self.style.ERROR(
+                    f"{mismatch['date']} {mismatch['hour']}시: current_count={mismatch['current_count']}, 확정 인원={mismatch['expected']}"
+                ))
+        else:
+            self.stdout.write(self.style.SUCCESS('current_count가 확정된 예약 인원과 일치합니다.'))
@@ -0,0 +1,60 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from common.microbench import BENCHMARKS, DEFAULT_SIZES, DEFAULT_THRESHOLD, compare, run
+
+
+class Command(BaseCommand):
+    help = ('시간대/예약 모델의 주요 경로를 데이터 크기별로 측정합니다. (실행 시간, 쿼리 수) '
+            '테스트용 임시 DB를 만들어 실행하며, DB_ENGINE=sqlite이면 SQLite를 사용합니다.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)), help='기존 예약 수 목록 (쉼표로 구분)')
+        parser.add_argument('--repeat', type=int, default=20, help='측정 반복 횟수')
+        parser.add_argument('--benchmark', action='append', choices=list(BENCHMARKS), help='측정할 항목 (생략 시 전체)')
+        parser.add_argument('--output', help='결과(JSON)를 저장할 경로')
+        parser.add_argument('--compare', help='비교할 기준 결과(JSON) 경로')
+        parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                            help='회귀로 판단할 실행 시간 증가 비율 (기본: 0.2)')
+        parser.add_argument('--keepdb', action='store_true', help='임시 DB를 삭제하지 않고 재사용합니다.')
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options['sizes'].split(',')]
+        except ValueError:
+            raise CommandError('--sizes는 쉼표로 구분된 정수여야 합니다.')
+
+        baseline = None
+        if options['compare']:
+            try:
+                with open(options['compare'], encoding='utf-8') as f:
+                    baseline = json.load(f)
+            except (OSError, ValueError) as e:
+                raise CommandError(f"기준 결과를 읽을 수 없습니다: {e}")
+
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=options['keepdb'])
+        try:
+            report = run(sizes, options['repeat'], options['benchmark'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+
+        self.stdout.write(f"{'항목':<42}{'예약 수':>8}{'median(ms)':>12}{'min(ms)':>10}{'쿼리':>6}")
+        for name, by_size in report['results'].items():
+            for size, result in by_size.items():
+                self.stdout.write(
+                    f"{name:<42}{size:>8}{result['wall_ms']['median']:>12.3f}{result['wall_ms']['min']:>10.3f}{result['queries']:>6}"
+                )
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+
+        if baseline is not None:
+            regressions = compare(report, baseline, options['threshold'])
+            for item in regressions:
+                self.stdout.write(self.style.ERROR(
+                    f"{item['benchmark']} ({item['size']}): {item['metric']} {item['baseline']} -> {item['current']}"
+                ))
+            if regressions:
+                raise CommandError(f"회귀 {len(regressions)}건이 발견되었습니다.")
+            self.stdout.write(self.style.SUCCESS('기준 결과 대비 회귀가 없습니다.'))
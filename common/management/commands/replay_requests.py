@@ -0,0 +1,61 @@
+import json
+from contextlib import ExitStack
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from common.bench import LocalServer, seed
+from common.traffic_replay import TokenMapper, compare_latencies, load_capture, replay
+
+
+class Command(BaseCommand):
+    help = 'TrafficCaptureMiddleware가 기록한 요청(JSONL)을 재생하고 원래 지연 시간 분포와 비교합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help='캡처 파일 경로 (glob 패턴 허용, 예: captures/*.jsonl)')
+        parser.add_argument('--url', help='대상 서버 주소 (생략 시 현재 설정으로 내부 서버를 실행)')
+        parser.add_argument('--speed', type=float, default=1.0,
+                            help='재생 속도 배율 (2.0이면 2배 빠르게, 0이면 간격 없이 최대한 빠르게)')
+        parser.add_argument('--concurrency', type=int, default=64, help='최대 동시 요청 수')
+        parser.add_argument('--users', type=int, default=200, help='재생에 사용할 벤치마크 사용자 수')
+        parser.add_argument('--days', type=int, default=7, help='벤치마크 시간대 날짜 수')
+        parser.add_argument('--disable-throttling', action='store_true',
+                            help='내부 서버에서 토큰 버킷 throttle과 입장 제어를 끕니다.')
+        parser.add_argument('--output', help='비교 결과(JSON)를 저장할 경로')
+
+    def handle(self, *args, **options):
+        if options['speed'] < 0:
+            raise CommandError('--speed는 0 이상이어야 합니다.')
+        if options['url'] and options['disable_throttling']:
+            raise CommandError('--disable-throttling은 내부 서버에서만 사용할 수 있습니다.')
+
+        try:
+            records = load_capture(options['paths'])
+        except (OSError, ValueError) as e:
+            raise CommandError(f"캡처 파일을 읽을 수 없습니다: {e}")
+        if not records:
+            raise CommandError('재생할 요청이 없습니다.')
+
+        token_mapper = TokenMapper(seed(options['users'], options['days']))
+
+        with ExitStack() as stack:
+            if options['disable_throttling']:
+                stack.enter_context(override_settings(
+                    REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'TOKEN_BUCKET_RATES': {}},
+                    ADMISSION_CONTROL={}
+                ))
+            base_url = options['url'] or stack.enter_context(LocalServer()).url
+
+            self.stdout.write(f"{base_url} 대상으로 요청 {len(records)}건을 {options['speed']}배 속도로 재생합니다.")
+            results = replay(base_url, records, token_mapper, options['speed'], options['concurrency'])
+
+        report = compare_latencies(results)
+
+        self.stdout.write(f"{'엔드포인트':<48}{'요청':>7}{'상태 일치':>10}{'원래 p50/p95/p99 (ms)':>28}{'재생 p50/p95/p99 (ms)':>28}")
+        for key, stats in report.items():
+            original = f"{stats['original_p50_ms']:.1f}/{stats['original_p95_ms']:.1f}/{stats['original_p99_ms']:.1f}"
+            replayed = f"{stats['replay_p50_ms']:.1f}/{stats['replay_p95_ms']:.1f}/{stats['replay_p99_ms']:.1f}"
+            self.stdout.write(f"{key:<48}{stats['requests']:>7}{stats['status_match_rate']:>10.1%}{original:>28}{replayed:>28}")
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,229 @@
+import platform
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+import django
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from examslots.models import ExamSlot
+from examslots.serializers import ExamSlotSerializer
+from reservation.models import Reservation
+from reservation.serializers import ReservationDetailSerializer
+from users.models import User
+
+SLOT_DAYS = 90
+DEFAULT_SIZES = [100, 1000, 10000]
+DEFAULT_THRESHOLD = 0.2
+USER_COUNT = 100
+
+
+class Context:
+    """벤치마크 데이터 (시간대 90일치와 size개의 예약)"""
+
+    def __init__(self, size):
+        self.size = size
+        self.base = datetime.combine(timezone.now().date() + timedelta(days=10), datetime.min.time())
+        self.users = list(User.objects.filter(username__startswith='microbench_'))
+        self.random = random.Random(size)
+
+    def span(self, hours, offset_hours=9):
+        start = self.base + timedelta(hours=offset_hours)
+        return start, start + timedelta(hours=hours)
+
+    def create_reservation(self, hours=3, offset_hours=9, count=1, confirm=False):
+        start_time, end_time = self.span(hours, offset_hours)
+        reservation = Reservation.objects.create(
+            user=self.users[0], start_time=start_time, end_time=end_time, count=count, status='pending'
+        )
+        reservation.exam_slots.set(ExamSlot.get_available_slots(start_time, end_time))
+        if confirm:
+            reservation.confirm()
+        return reservation
+
+
+def _get_available_slots_same_day(ctx):
+    start_time, end_time = ctx.span(3)
+    return lambda: list(ExamSlot.get_available_slots(start_time, end_time))
+
+
+def _get_available_slots_multi_day(ctx):
+    start_time, end_time = ctx.span(72)
+    return lambda: list(ExamSlot.get_available_slots(start_time, end_time))
+
+
+def _check_and_get_available_slots(ctx):
+    start_time, end_time = ctx.span(3)
+    return lambda: ExamSlot.check_and_get_available_slots(start_time, end_time, 1)
+
+
+def _update_slots(ctx):
+    start_time, end_time = ctx.span(3)
+    slots = list(ExamSlot.get_available_slots(start_time, end_time))
+    return lambda: ExamSlot.update_slots(slots, 1)
+
+
+def _reservation_confirm(ctx):
+    return ctx.create_reservation().confirm
+
+
+def _reservation_modify(ctx):
+    reservation = ctx.create_reservation()
+    start_time, end_time = ctx.span(3, offset_hours=30)
+    return lambda: reservation.modify(start_time, end_time, 2)
+
+
+def _reservation_modify_accepted(ctx):
+    reservation = ctx.create_reservation(confirm=True)
+    start_time, end_time = ctx.span(3, offset_hours=30)
+    return lambda: reservation.modify(start_time, end_time, 2)
+
+
+def _reservation_cancel(ctx):
+    return ctx.create_reservation(confirm=True).cancel
+
+
+def _reservation_serializer(ctx):
+    reservations = list(Reservation.objects.order_by('id')[:ctx.size])
+    return lambda: ReservationDetailSerializer(reservations, many=True).data
+
+
+def _exam_slot_serializer(ctx):
+    slots = list(ExamSlot.objects.order_by('date', 'hour')[:ctx.size])
+    return lambda: ExamSlotSerializer(slots, many=True).data
+
+
+# 이름: 준비 함수 (측정할 함수를 반환하며, 준비 과정은 측정하지 않습니다.)
+BENCHMARKS = {
+    'examslot.get_available_slots.same_day': _get_available_slots_same_day,
+    'examslot.get_available_slots.multi_day': _get_available_slots_multi_day,
+    'examslot.check_and_get_available_slots': _check_and_get_available_slots,
+    'examslot.update_slots': _update_slots,
+    'reservation.confirm': _reservation_confirm,
+    'reservation.modify': _reservation_modify,
+    'reservation.modify.accepted': _reservation_modify_accepted,
+    'reservation.cancel': _reservation_cancel,
+    'serializer.reservation_detail': _reservation_serializer,
+    'serializer.exam_slot': _exam_slot_serializer,
+}
+
+
+def seed_slots():
+    start_date = timezone.now().date() + timedelta(days=3)
+    ExamSlot.objects.bulk_create(
+        [ExamSlot(date=start_date + timedelta(days=day), hour=hour) for day in range(SLOT_DAYS) for hour in range(24)],
+        ignore_conflicts=True
+    )
+    User.objects.bulk_create(
+        [User(username=f"microbench_{i}", password='!') for i in range(USER_COUNT)],
+        ignore_conflicts=True
+    )
+
+
+def seed_reservations(size):
+    """기존 예약을 지우고 size개의 예약(1~3시간, 시간대 연결 포함)을 생성합니다."""
+    Reservation.objects.all().delete()
+
+    rng = random.Random(size)
+    users = list(User.objects.filter(username__startswith='microbench_'))
+    slots = {(slot.date, slot.hour): slot.id for slot in ExamSlot.objects.all()}
+    start = datetime.combine(timezone.now().date() + timedelta(days=3), datetime.min.time())
+
+    reservations = []
+    slot_ids = []
+    for _ in range(size):
+        start_time = start + timedelta(hours=rng.randrange(SLOT_DAYS * 24 - 3))
+        end_time = start_time + timedelta(hours=rng.randint(1, 3))
+        reservations.append(Reservation(
+            user=rng.choice(users), start_time=start_time, end_time=end_time, count=rng.randint(1, 5), status='pending'
+        ))
+        slot_ids.append([
+            slots[((start_time + timedelta(hours=h)).date(), (start_time + timedelta(hours=h)).hour)]
+            for h in range(int((end_time - start_time).total_seconds() // 3600))
+        ])
+
+    reservations = Reservation.objects.bulk_create(reservations, batch_size=1000)
+    through = Reservation.exam_slots.through
+    through.objects.bulk_create([
+        through(reservation_id=reservation.id, examslot_id=slot_id)
+        for reservation, ids in zip(reservations, slot_ids)
+        for slot_id in ids
+    ], batch_size=5000)
+
+
+def measure(setup, ctx, repeat):
+    """
+    준비와 측정을 repeat번 반복합니다.
+    매 반복은 롤백되는 트랜잭션 안에서 실행되므로 데이터가 누적되지 않고,
+    커밋 후 실행되는 Redis 작업(버전 갱신, 발행)도 실행되지 않습니다.
+    """
+    timings = []
+    queries = []
+    for _ in range(repeat):
+        with transaction.atomic():
+            func = setup(ctx)
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                func()
+                timings.append((time.perf_counter() - start) * 1000)
+            queries.append(len(captured.captured_queries))
+            transaction.set_rollback(True)
+
+    return {
+        'wall_ms': {
+            'min': round(min(timings), 3),
+            'median': round(statistics.median(timings), 3),
+            'mean': round(statistics.mean(timings), 3),
+        },
+        'queries': max(queries),
+    }
+
+
+def run(sizes, repeat, names=None):
+    names = names or list(BENCHMARKS)
+    seed_slots()
+
+    results = {name: {} for name in names}
+    for size in sizes:
+        seed_reservations(size)
+        ctx = Context(size)
+        for name in names:
+            results[name][str(size)] = measure(BENCHMARKS[name], ctx, repeat)
+
+    return {
+        'meta': {
+            'created_at': timezone.now().isoformat(),
+            'vendor': connection.vendor,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'repeat': repeat,
+            'sizes': sizes,
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    기준 결과와 비교하여 회귀 목록을 반환합니다.
+    - 중앙값이 threshold 비율 이상 느려진 경우
+    - 쿼리 수가 늘어난 경우
+    """
+    regressions = []
+    for name, by_size in current['results'].items():
+        for size, result in by_size.items():
+            base = baseline.get('results', {}).get(name, {}).get(size)
+            if base is None:
+                continue
+            if result['queries'] > base['queries']:
+                regressions.append({
+                    'benchmark': name, 'size': size, 'metric': 'queries',
+                    'baseline': base['queries'], 'current': result['queries'],
+                })
+            if result['wall_ms']['median'] > base['wall_ms']['median'] * (1 + threshold):
+                regressions.append({
+                    'benchmark': name, 'size': size, 'metric': 'wall_ms.median',
+                    'baseline': base['wall_ms']['median'], 'current': result['wall_ms']['median'],
+                })
+    return regressions
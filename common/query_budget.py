@@ -0,0 +1,78 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+
+ATTRIBUTE = 'query_budget'
+
+
+def query_budget(max_queries=None, **methods):
+    """
+    뷰가 한 번의 요청에서 실행할 수 있는 최대 SQL 쿼리 수를 선언합니다.
+
+    @query_budget(3)                     # 모든 메서드
+    @query_budget(GET=3, PATCH=12)       # 메서드별
+
+    인증(토큰 조회) 쿼리는 포함하지 않으며, 테스트에서 QueryBudgetTestMixin으로 검사합니다.
+    """
+    budgets = {method.upper(): value for method, value in methods.items()}
+
+    def decorator(view_func):
+        setattr(view_func, ATTRIBUTE, {'default': max_queries, **budgets})
+        return view_func
+    return decorator
+
+
+def get_query_budget(view_func, method):
+    """뷰에 선언된 메서드의 쿼리 예산을 반환합니다. 선언되지 않았으면 None을 반환합니다."""
+    budgets = getattr(view_func, ATTRIBUTE, None)
+    if budgets is None:
+        return None
+    return budgets.get(method.upper(), budgets['default'])
+
+
+def iter_undeclared(urlpatterns):
+    """쿼리 예산이 선언되지 않은 URL 이름을 반환합니다."""
+    for pattern in urlpatterns:
+        if hasattr(pattern, 'url_patterns'):
+            yield from iter_undeclared(pattern.url_patterns)
+        elif not hasattr(pattern.callback, ATTRIBUTE):
+            yield pattern.name
+
+
+class QueryBudgetTestMixin:
+    """
+    APIClient(self.client) 요청의 쿼리 수를 URL에 연결된 뷰의 예산과 비교합니다.
+    """
+
+    def request_within_budget(self, method, path, data=None, **extra):
+        match = resolve(path.split('?')[0])
+        budget = get_query_budget(match.func, method)
+        self.assertIsNotNone(budget, f"{match.url_name}에 쿼리 예산이 선언되지 않았습니다.")
+
+        with CaptureQueriesContext(connection) as captured:
+            if 'content_type' not in extra:
+                extra['format'] = 'json'
+            response = getattr(self.client, method.lower())(path, data, **extra)
+
+        queries = '\n'.join(f"{i}. {query['sql']}" for i, query in enumerate(captured.captured_queries, start=1))
+        self.assertLessEqual(
+            len(captured), budget,
+            f"{method} {match.url_name}: 쿼리 {len(captured)}개 실행 (예산 {budget}개)\n{queries}"
+        )
+        return response, len(captured)
+
+    def assertQueriesConstant(self, method, sizes, setup, data=None, **extra):
+        """
+        데이터 크기별로 setup(size)으로 데이터를 준비하고 요청 경로를 받아 요청하여,
+        모든 크기에서 예산을 지키고 쿼리 수가 행 수에 따라 늘어나지 않는지 확인합니다.
+        """
+        counts = {}
+        for size in sizes:
+            path = setup(size)
+            response, counts[size] = self.request_within_budget(method, path, data, **extra)
+            self.assertLess(response.status_code, 500, response.content)
+        self.assertEqual(
+            len(set(counts.values())), 1,
+            f"{method} {path}: 데이터 크기에 따라 쿼리 수가 늘어납니다. {counts}"
+        )
+        return counts
@@ -19,4 +19,15 @@ class ErrorResponseSerializer(serializers.Serializer):
         if isinstance(instance, str):
             return {'error': instance}
             
-        return {'error': str(instance)} 
\ No newline at end of file
+        return {'error': str(instance)} 
+
+class ThrottleRejectionResponseSerializer(serializers.Serializer):
+    rejections = serializers.DictField(child=serializers.IntegerField(), help_text='scope:종류별 누적 거부 횟수')
+
+
+class AdmissionTicketSerializer(serializers.Serializer):
+    error = serializers.CharField(required=False, help_text='대기열 등록 안내 메시지')
+    ticket = serializers.IntegerField(help_text='대기 번호표')
+    admitted = serializers.BooleanField(required=False, help_text='입장 가능 여부')
+    position = serializers.IntegerField(help_text='남은 대기 순번')
+    retry_after = serializers.IntegerField(help_text='다시 시도하기까지 권장 대기 시간(초)')
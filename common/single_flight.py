@@ -0,0 +1,179 @@
+import json
+import logging
+import math
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from django.db import close_old_connections
+from redis.exceptions import RedisError
+from .distributed_lock import redis_client
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = "sf:"
+LOCK_KEY_PREFIX = "sf_lock:"
+LOCK_POLL_SECONDS = 0.05
+
+# 토큰이 일치할 때만 락을 해제합니다.
+_RELEASE_SCRIPT = redis_client.register_script("""
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+""")
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+_calls = {}
+_calls_lock = threading.Lock()
+_refreshing = set()
+_refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='single-flight')
+
+
+def _do_once(key, func):
+    """같은 프로세스에서 같은 키로 동시에 호출되면 한 번만 실행하고 나머지는 그 결과를 기다립니다."""
+    with _calls_lock:
+        call = _calls.get(key)
+        leader = call is None
+        if leader:
+            call = _calls[key] = _Call()
+
+    if not leader:
+        call.event.wait()
+        if call.error is not None:
+            raise call.error
+        return call.value
+
+    try:
+        call.value = func()
+        return call.value
+    except Exception as e:
+        call.error = e
+        raise
+    finally:
+        with _calls_lock:
+            del _calls[key]
+        call.event.set()
+
+
+def _read(key):
+    raw = redis_client.get(f"{CACHE_KEY_PREFIX}{key}")
+    return json.loads(raw) if raw else None
+
+
+def _write(key, value, version, timeout, stale_timeout):
+    entry = {'value': value, 'version': version, 'fresh_until': time.time() + timeout}
+    redis_client.set(f"{CACHE_KEY_PREFIX}{key}", json.dumps(entry), ex=math.ceil(timeout + stale_timeout))
+
+
+def _is_fresh(entry, version):
+    return entry['version'] == version and entry['fresh_until'] > time.time()
+
+
+def _acquire(key, lock_timeout):
+    token = uuid.uuid4().hex
+    if redis_client.set(f"{LOCK_KEY_PREFIX}{key}", token, nx=True, px=int(lock_timeout * 1000)):
+        return token
+    return None
+
+
+def _release(key, token):
+    try:
+        _RELEASE_SCRIPT(keys=[f"{LOCK_KEY_PREFIX}{key}"], args=[token])
+    except Exception as e:
+        logger.error(f"Error releasing single-flight lock {key}: {str(e)}")
+
+
+def _load(key, compute, version, timeout, stale_timeout, lock_timeout):
+    """
+    프로세스 간 단일 실행: Redis 락을 얻은 요청만 다시 계산하고,
+    나머지는 캐시가 채워질 때까지 기다립니다. lock_timeout이 지나도 채워지지 않으면 직접 계산합니다.
+    """
+    deadline = time.monotonic() + lock_timeout
+    while True:
+        token = _acquire(key, lock_timeout)
+        if token:
+            try:
+                # 락을 기다리는 동안 다른 프로세스가 채웠을 수 있습니다.
+                entry = _read(key)
+                if entry and _is_fresh(entry, version):
+                    return entry['value']
+                value = compute()
+                _write(key, value, version, timeout, stale_timeout)
+                return value
+            finally:
+                _release(key, token)
+
+        time.sleep(LOCK_POLL_SECONDS)
+        entry = _read(key)
+        if entry and _is_fresh(entry, version):
+            return entry['value']
+        if time.monotonic() > deadline:
+            logger.warning(f"Single-flight wait timed out for {key}")
+            return compute()
+
+
+def _refresh(key, compute, version, timeout, stale_timeout, lock_timeout):
+    try:
+        token = _acquire(key, lock_timeout)
+        if not token:
+            return
+        try:
+            _write(key, compute(), version, timeout, stale_timeout)
+        finally:
+            _release(key, token)
+    except Exception as e:
+        logger.error(f"Error refreshing {key}: {str(e)}")
+    finally:
+        close_old_connections()
+        with _calls_lock:
+            _refreshing.discard(key)
+
+
+def _refresh_in_background(key, compute, version, timeout, stale_timeout, lock_timeout):
+    with _calls_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+    _refresh_executor.submit(_refresh, key, compute, version, timeout, stale_timeout, lock_timeout)
+
+
+def get_or_compute(key, compute, timeout, stale_timeout=0, lock_timeout=5, version=None):
+    """
+    요청 병합(single-flight) 캐시 조회
+
+    - 캐시가 최신이면 그대로 반환합니다.
+    - 만료된 지 stale_timeout 이내이면 이전 값을 바로 반환하고,
+      백그라운드에서 한 번만 다시 계산합니다. (stale-while-revalidate)
+    - 캐시가 없거나 version이 바뀌었으면 프로세스 내부와 프로세스 간(Redis 락) 모두에서 한 요청만 compute를 실행하고
+      나머지는 그 결과를 기다립니다.
+    - Redis 장애 시에는 캐시 없이 compute 결과를 반환합니다.
+    compute의 반환값은 JSON으로 직렬화할 수 있어야 합니다.
+    """
+    try:
+        entry = _read(key)
+    except RedisError as e:
+        logger.error(f"Error reading single-flight cache {key}: {str(e)}")
+        return compute()
+
+    # 버전이 바뀐 항목은 이전 데이터이므로 응답하지 않고 다시 계산합니다.
+    if entry is not None and entry['version'] == version:
+        if entry['fresh_until'] <= time.time():
+            _refresh_in_background(key, compute, version, timeout, stale_timeout, lock_timeout)
+        return entry['value']
+
+    def load():
+        try:
+            return _load(key, compute, version, timeout, stale_timeout, lock_timeout)
+        except RedisError as e:
+            logger.error(f"Error loading single-flight cache {key}: {str(e)}")
+            return compute()
+
+    return _do_once(key, load)
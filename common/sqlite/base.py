@@ -0,0 +1,41 @@
+"""
+로컬 벤치마크/개발용 SQLite 백엔드 (DB_ENGINE=sqlite)
+PostgreSQL 전용 인덱스(GIN, 연산자 클래스 등)는 마이그레이션 상태에만 남기고 실제로는 만들지 않습니다.
+이미 적용된 마이그레이션을 고치지 않고도 SQLite에서 migrate 할 수 있게 하기 위함입니다.
+"""
+from django.contrib.postgres.indexes import OpClass, PostgresIndex
+from django.db.backends.sqlite3 import base, schema
+
+
+def is_postgres_only(index):
+    # GIN 등 PostgreSQL 인덱스 타입이거나, 연산자 클래스를 지정한 표현식 인덱스
+    return isinstance(index, PostgresIndex) or any(
+        isinstance(expression, OpClass) for expression in index.expressions
+    )
+
+
+class DatabaseSchemaEditor(schema.DatabaseSchemaEditor):
+
+    def add_index(self, model, index, concurrently=False):
+        if not is_postgres_only(index):
+            super().add_index(model, index)
+
+    def remove_index(self, model, index, concurrently=False):
+        if not is_postgres_only(index):
+            super().remove_index(model, index)
+
+    def _model_indexes_sql(self, model):
+        # 테이블을 다시 만들 때(SQLite ALTER 대체)도 PostgreSQL 전용 인덱스는 제외
+        skipped = {
+            self.quote_name(index.name)
+            for index in model._meta.indexes
+            if is_postgres_only(index)
+        }
+        return [
+            statement for statement in super()._model_indexes_sql(model)
+            if str(statement.parts.get('name')) not in skipped
+        ]
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    SchemaEditorClass = DatabaseSchemaEditor
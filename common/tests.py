@@ -1,3 +1,276 @@
-from django.test import TestCase
+import glob
+import json
+import os
+import tempfile
+import threading
+import time
+from importlib import import_module
+from unittest import mock
+from django.http import JsonResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+from users.models import User
+from .distributed_lock import redis_client
+from .single_flight import CACHE_KEY_PREFIX, get_or_compute
+from . import admission
+from .bench import parse_mix, percentile
+from .microbench import compare
+from .traffic_capture import TrafficCaptureMiddleware, anonymize
+from .dataset import CsvStream
+from .query_budget import QueryBudgetTestMixin, iter_undeclared
+from .versioning import VERSION_KEY_PREFIX, bump_versions, conditional_on_version
+from .sqlite.base import is_postgres_only
 
-# Create your tests here.
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+@conditional_on_version(lambda request: 'test:conditional')
+def versioned_view(request):
+    return Response({'ok': True})
+
+
+@api_view(['GET', 'POST'])
+@permission_classes([AllowAny])
+@admission.with_admission_control('test', methods=('POST',))
+def admission_view(request):
+    return Response({'ok': True})
+
+
+class SingleFlightTest(TestCase):
+    # 요청 병합(single-flight) 캐시 테스트
+
+    def setUp(self):
+        self.key = 'test:single-flight'
+        redis_client.delete(f"{CACHE_KEY_PREFIX}{self.key}")
+
+    def test_concurrent_misses_compute_once(self):
+        # 캐시가 없을 때 동시에 들어온 요청들은 한 번만 계산해야 함
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return {'value': 1}
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(get_or_compute(self.key, compute, timeout=10)))
+            for _ in range(10)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{'value': 1}] * 10)
+
+    def test_stale_value_served_while_revalidating(self):
+        # 만료된 값은 stale 기간 동안 바로 반환하고 백그라운드에서 갱신해야 함
+        get_or_compute(self.key, lambda: 'old', timeout=0.1, stale_timeout=10, version=1)
+        time.sleep(0.2)
+
+        self.assertEqual(get_or_compute(self.key, lambda: 'new', timeout=10, stale_timeout=10, version=1), 'old')
+
+        for _ in range(50):
+            value = get_or_compute(self.key, lambda: 'newer', timeout=10, stale_timeout=10, version=1)
+            if value == 'new':
+                break
+            time.sleep(0.02)
+        self.assertEqual(value, 'new')
+
+    def test_version_change_recomputes(self):
+        # 버전이 바뀌면 이전 값을 반환하지 않고 다시 계산해야 함
+        get_or_compute(self.key, lambda: 'old', timeout=10, stale_timeout=10, version=1)
+        self.assertEqual(get_or_compute(self.key, lambda: 'new', timeout=10, stale_timeout=10, version=2), 'new')
+
+
+class BenchHelperTest(TestCase):
+    # 벤치마크 설정/집계 함수 테스트
+
+    def test_parse_mix(self):
+        self.assertEqual(parse_mix('read=80,create=20'), {'read': 80.0, 'create': 20.0})
+        with self.assertRaises(ValueError):
+            parse_mix('read=80,delete=20')
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertIsNone(percentile([], 50))
+
+
+class MicrobenchCompareTest(TestCase):
+    # 마이크로 벤치마크 결과 비교 테스트
+
+    def test_regressions_flagged(self):
+        # 실행 시간이 기준 이상 늘거나 쿼리 수가 늘면 회귀로 판단해야 함
+        def report(median, queries):
+            return {'results': {'examslot.update_slots': {'100': {'wall_ms': {'median': median}, 'queries': queries}}}}
+
+        self.assertEqual(compare(report(1.1, 8), report(1.0, 8), threshold=0.2), [])
+
+        regressions = compare(report(1.5, 9), report(1.0, 8), threshold=0.2)
+        self.assertEqual({item['metric'] for item in regressions}, {'queries', 'wall_ms.median'})
+
+
+class SqliteBackendTest(TestCase):
+    # DB_ENGINE=sqlite 백엔드가 건너뛰는 인덱스 구분 테스트
+
+    def test_postgres_only_indexes(self):
+        indexes = {index.name: is_postgres_only(index) for index in User._meta.indexes}
+        # 연산자 클래스(text_pattern_ops)와 GIN 인덱스만 제외하고 일반 인덱스는 그대로 생성
+        self.assertTrue(indexes['users_username_prefix_idx'])
+        self.assertTrue(indexes['users_username_trgm_idx'])
+        self.assertFalse(indexes['users_created_at_idx'])
+
+
+class TrafficCaptureTest(TestCase):
+    # 요청 기록 미들웨어 테스트
+
+    def test_sensitive_fields_anonymized(self):
+        # 비밀번호는 저장하지 않고, 사용자 이름은 같은 값이면 같은 가명이어야 함
+        first = anonymize({'username': 'alice', 'password': 'secret', 'count': 2})
+        second = anonymize({'username': 'alice'})
+        self.assertEqual(first['password'], '***')
+        self.assertEqual(first['count'], 2)
+        self.assertNotIn('alice', first['username'])
+        self.assertEqual(first['username'], second['username'])
+
+    def test_request_written_to_jsonl(self):
+        # 샘플링된 요청이 JSONL 파일에 기록되어야 함
+        with tempfile.TemporaryDirectory() as directory:
+            config = {'ENABLED': True, 'SAMPLE_RATE': 1.0, 'DIRECTORY': directory}
+            with override_settings(TRAFFIC_CAPTURE=config):
+                middleware = TrafficCaptureMiddleware(lambda request: JsonResponse({}, status=201))
+
+            request = RequestFactory().post(
+                '/users/signup/', data=json.dumps({'username': 'bob', 'password': 'pw'}), content_type='application/json'
+            )
+            middleware(request)
+            time.sleep(0.2)
+            middleware.writer.close()
+
+            with open(glob.glob(os.path.join(directory, '*.jsonl'))[0], encoding='utf-8') as f:
+                record = json.loads(f.readline())
+
+        self.assertEqual(record['method'], 'POST')
+        self.assertEqual(record['status'], 201)
+        self.assertEqual(record['user_class'], 'anonymous')
+        self.assertEqual(record['body']['password'], '***')
+
+
+class CsvStreamTest(TestCase):
+    # COPY용 CSV 스트림 테스트
+
+    def test_null_and_empty_string_distinguished(self):
+        # None은 빈 값(NULL), 빈 문자열은 따옴표로 감싸야 하고, 나누어 읽어도 같은 결과여야 함
+        rows = [(1, '', None, True), (2, 'a"b', None, False)]
+        expected = '1,"",,t\n2,"a""b",,f\n'
+        self.assertEqual(CsvStream(rows).read(), expected)
+
+        stream = CsvStream(rows)
+        chunks = []
+        while True:
+            chunk = stream.read(5)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        self.assertEqual(''.join(chunks), expected)
+
+
+@override_settings(ADMISSION_CONTROL={'test': {'INITIAL_LIMIT': 2, 'ADMIT_LEASE_SECONDS': 10}})
+class AdmissionControlTest(TestCase):
+    # 대기열 입장 제어 테스트
+
+    def setUp(self):
+        redis_client.delete(*admission._keys('test').values())
+        # limit(2)만큼 처리 중인 요청을 채우고 번호표 5장을 발급
+        self.request_ids = [admission.enter('test', 'user')[1] for _ in range(2)]
+        self.tickets = [admission.enter('test', f"user{i}")[1] for i in range(5)]
+
+    def _admitted(self):
+        # 이미 사용한 번호표는 None
+        statuses = [admission.get_status('test', f"user{i}", ticket) for i, ticket in enumerate(self.tickets)]
+        return [ticket for ticket, status in zip(self.tickets, statuses) if status and status['admitted']]
+
+    def test_polling_does_not_admit_beyond_limit(self):
+        # 상태 조회를 반복해도 처리 중인 요청과 입장 허가된 번호표의 합이 limit를 넘으면 안 됨
+        for _ in range(100):
+            self.assertEqual(self._admitted(), [])
+
+        admission.release('test', self.request_ids[0])
+        for _ in range(100):
+            self.assertEqual(self._admitted(), self.tickets[:1])
+
+        # 입장 허가된 번호표가 다시 요청하기 전에는 새 요청이 끼어들 수 없음
+        admitted, ticket, _, _ = admission.enter('test', 'newcomer')
+        self.assertFalse(admitted)
+        self.assertEqual(ticket, self.tickets[-1] + 1)
+
+        self.assertTrue(admission.enter('test', 'user0', self.tickets[0])[0])
+        self.assertEqual(self._admitted(), [])
+
+    def test_methods_limit_admission(self):
+        # 지정한 메서드만 입장 제어하고, 조회 요청은 자리가 없어도 번호표 없이 처리해야 함
+        factory = RequestFactory()
+        self.assertEqual(admission_view(factory.get('/')).status_code, 200)
+        response = admission_view(factory.post('/'))
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.data['ticket'], self.tickets[-1] + 1)
+
+    def test_unused_admission_expires(self):
+        # 입장 허가 후 다시 요청하지 않은 번호표는 ADMIT_LEASE_SECONDS 뒤 자리를 돌려줌
+        admission.release('test', self.request_ids[0])
+        self.assertEqual(self._admitted(), self.tickets[:1])
+
+        later = time.time() + 11
+        with mock.patch('common.admission.time.time', return_value=later):
+            self.assertIsNone(admission.get_status('test', 'user0', self.tickets[0]))
+            self.assertTrue(admission.get_status('test', 'user1', self.tickets[1])['admitted'])
+            self.assertFalse(admission.enter('test', 'user0', self.tickets[0])[0])
+
+
+class ConditionalOnVersionTest(TestCase):
+    # 버전 기반 조건부 조회 테스트
+
+    def setUp(self):
+        redis_client.delete(f"{VERSION_KEY_PREFIX}test:conditional")
+        self.factory = RequestFactory()
+
+    def test_etag(self):
+        etag = versioned_view(self.factory.get('/')).headers['ETag']
+        self.assertEqual(versioned_view(self.factory.get('/', HTTP_IF_NONE_MATCH=etag)).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_versions('test:conditional')
+        self.assertEqual(versioned_view(self.factory.get('/', HTTP_IF_NONE_MATCH=etag)).status_code, 200)
+
+    def test_if_modified_since_ignored(self):
+        # Last-Modified와 같은 초에 버전이 바뀌어도 304가 되면 안 되므로 If-Modified-Since는 비교하지 않음
+        last_modified = versioned_view(self.factory.get('/')).headers['Last-Modified']
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_versions('test:conditional')
+
+        response = versioned_view(self.factory.get('/', HTTP_IF_MODIFIED_SINCE=last_modified))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Last-Modified'], last_modified)
+
+
+class QueryBudgetTest(QueryBudgetTestMixin, TestCase):
+    # 엔드포인트 쿼리 예산 선언 테스트
+
+    def test_all_endpoints_declare_budget(self):
+        # 앱 API의 모든 URL에 쿼리 예산이 선언되어 있어야 함
+        for app in ('users', 'examslots', 'reservation', 'common'):
+            self.assertEqual(list(iter_undeclared(import_module(f"{app}.urls").urlpatterns)), [], app)
+
+    def test_throttle_rejections(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=User.objects.create_superuser(username='budgetadmin', password='password1234!'))
+        response, _ = self.request_within_budget('get', reverse('throttle_rejections'))
+        self.assertEqual(response.status_code, 200)
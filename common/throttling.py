@@ -0,0 +1,139 @@
+import logging
+import time
+from django.conf import settings
+from rest_framework.throttling import BaseThrottle
+from .distributed_lock import redis_client
+
+logger = logging.getLogger(__name__)
+
+REJECTION_COUNTER_KEY = "throttle:rejected"
+
+PERIODS = {'s': 1, 'sec': 1, 'm': 60, 'min': 60, 'h': 3600, 'hour': 3600, 'd': 86400, 'day': 86400}
+
+# 토큰 버킷 확인/차감과 거부 횟수 기록을 한 번의 호출로 처리합니다.
+# KEYS[1]: 버킷 키, KEYS[2]: 거부 횟수 해시
+# ARGV[1]: 버킷 용량, ARGV[2]: 초당 충전량, ARGV[3]: 현재 시각(초), ARGV[4]: 거부 횟수 필드
+_TOKEN_BUCKET_SCRIPT = redis_client.register_script("""
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    wait = (1 - tokens) / rate
+    redis.call('HINCRBY', KEYS[2], ARGV[4], 1)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(wait)}
+""")
+
+
+def parse_bucket_rate(rate):
+    """
+    버킷 설정을 (용량, 초당 충전량)으로 변환합니다.
+    - '20/min': 용량 20, 1분에 20개 충전
+    - {'rate': '20/min', 'capacity': 40}: 충전 속도는 같고 최대 40개까지 몰아서 사용 가능
+    """
+    capacity = None
+    if isinstance(rate, dict):
+        capacity = rate.get('capacity')
+        rate = rate['rate']
+    num, period = rate.split('/')
+    num = int(num)
+    refill_rate = num / PERIODS[period]
+    return (capacity or num), refill_rate
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Redis 토큰 버킷 기반 throttle
+
+    REST_FRAMEWORK['TOKEN_BUCKET_RATES'][scope]로 설정하며, 설정이 없으면 제한하지 않습니다.
+    확인마다 Lua 스크립트를 한 번만 호출하고, Redis 장애 시에는 요청을 허용합니다.
+    """
+    scope = None
+    kind = None
+
+    def __init__(self):
+        self.wait_seconds = None
+
+    def get_rate(self):
+        rates = settings.REST_FRAMEWORK.get('TOKEN_BUCKET_RATES', {})
+        return rates.get(self.rate_key())
+
+    def rate_key(self):
+        return self.scope
+
+    def get_ident_key(self, request):
+        raise NotImplementedError('.get_ident_key() must be overridden')
+
+    def allow_request(self, request, view):
+        rate = self.get_rate()
+        if rate is None:
+            return True
+
+        ident = self.get_ident_key(request)
+        if ident is None:
+            return True
+
+        capacity, refill_rate = parse_bucket_rate(rate)
+        try:
+            allowed, wait = _TOKEN_BUCKET_SCRIPT(
+                keys=[f"throttle:{self.scope}:{self.kind}:{ident}", REJECTION_COUNTER_KEY],
+                args=[capacity, refill_rate, time.time(), f"{self.scope}:{self.kind}"]
+            )
+        except Exception as e:
+            logger.error(f"Error checking throttle {self.scope}: {str(e)}")
+            return True
+
+        self.wait_seconds = float(wait)
+        return bool(allowed)
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class UserTokenBucketThrottle(TokenBucketThrottle):
+    """로그인 사용자 단위 제한 (비로그인 요청은 IP 기준)"""
+    kind = 'user'
+
+    def get_ident_key(self, request):
+        if request.user and request.user.is_authenticated:
+            return request.user.pk
+        return self.get_ident(request)
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    """IP 단위 제한 (REST_FRAMEWORK['TOKEN_BUCKET_RATES']['<scope>_ip']로 설정)"""
+    kind = 'ip'
+
+    def rate_key(self):
+        return f"{self.scope}_ip"
+
+    def get_ident_key(self, request):
+        return self.get_ident(request)
+
+
+def token_bucket_throttles(scope):
+    """
+    뷰에 적용할 사용자/IP 토큰 버킷 throttle 클래스를 생성합니다.
+
+    @throttle_classes(token_bucket_throttles('reservation_create'))
+    """
+    return [
+        type(f"{cls.__name__}_{scope}", (cls,), {'scope': scope})
+        for cls in (UserTokenBucketThrottle, IPTokenBucketThrottle)
+    ]
+
+
+def get_rejection_counts():
+    counts = redis_client.hgetall(REJECTION_COUNTER_KEY)
+    return {key.decode(): int(value) for key, value in counts.items()}
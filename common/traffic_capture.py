@@ -0,0 +1,216 @@
+import atexit
+import glob
+import hashlib
+import hmac
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG = {
+    'ENABLED': False,
+    'SAMPLE_RATE': 0.01,
+    'DIRECTORY': 'captures',
+    'PATH_PREFIXES': ['/examslots/', '/reservation/', '/users/'],
+    'MAX_BYTES': 100 * 1024 * 1024,
+    'BACKUP_COUNT': 10,
+    'QUEUE_SIZE': 10000,
+    'FLUSH_INTERVAL': 1.0,
+    'MAX_BODY_BYTES': 4096,
+}
+
+# 값을 저장하지 않는 필드
+MASKED_FIELDS = {'password', 'token', 'key'}
+# 원래 값 대신 가명(해시)을 저장하는 필드
+PSEUDONYM_FIELDS = {'username'}
+MASKED_QUERY_PARAMS = {'token'}
+
+
+def get_config():
+    return {**DEFAULT_CONFIG, **getattr(settings, 'TRAFFIC_CAPTURE', {})}
+
+
+def pseudonym(value):
+    """원래 값을 알 수 없지만 같은 값은 같은 결과가 나오는 가명을 만듭니다."""
+    digest = hmac.new(settings.SECRET_KEY.encode(), str(value).encode(), hashlib.sha256).hexdigest()
+    return digest[:12]
+
+
+def anonymize(value):
+    if isinstance(value, dict):
+        result = {}
+        for key, item in value.items():
+            if key in MASKED_FIELDS:
+                result[key] = '***'
+            elif key in PSEUDONYM_FIELDS and item is not None:
+                result[key] = f"anon_{pseudonym(item)}"
+            else:
+                result[key] = anonymize(item)
+        return result
+    if isinstance(value, list):
+        return [anonymize(item) for item in value]
+    return value
+
+
+class CaptureWriter:
+    """
+    요청 기록을 백그라운드 스레드에서 JSONL 파일로 씁니다.
+
+    요청 처리 스레드는 큐에 넣기만 하며, 큐가 가득 차면 기록을 버립니다. (요청을 막지 않음)
+    파일은 프로세스별로 만들고, MAX_BYTES를 넘으면 시각을 붙여 보관한 뒤 새 파일을 엽니다.
+    """
+
+    def __init__(self, directory, max_bytes, backup_count, queue_size, flush_interval):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self.file = None
+        self.path = None
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self._run, name='traffic-capture', daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def put(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _open(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self.path = os.path.join(self.directory, f"capture-{os.getpid()}.jsonl")
+        self.file = open(self.path, 'a', encoding='utf-8', buffering=64 * 1024)
+
+    def _rotate(self):
+        self.file.close()
+        os.replace(self.path, os.path.join(self.directory, f"capture-{os.getpid()}-{time.strftime('%Y%m%d%H%M%S')}.jsonl"))
+        backups = sorted(glob.glob(os.path.join(self.directory, f"capture-{os.getpid()}-*.jsonl")))
+        for path in backups[:max(0, len(backups) - self.backup_count)]:
+            os.remove(path)
+        self._open()
+
+    def _run(self):
+        last_flush = time.monotonic()
+        while True:
+            try:
+                record = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                record = None
+
+            try:
+                with self.lock:
+                    if record is not None:
+                        self._write(record)
+                        if self.file.tell() >= self.max_bytes:
+                            self._rotate()
+                    if self.file is not None and time.monotonic() - last_flush >= self.flush_interval:
+                        self.file.flush()
+                        last_flush = time.monotonic()
+            except OSError as e:
+                logger.error(f"Error writing traffic capture: {str(e)}")
+
+    def _write(self, record):
+        if self.file is None:
+            self._open()
+        self.file.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def close(self):
+        # 종료 시 큐에 남은 기록을 최대한 기록합니다.
+        with self.lock:
+            try:
+                while True:
+                    self._write(self.queue.get_nowait())
+            except queue.Empty:
+                pass
+            except OSError as e:
+                logger.error(f"Error writing traffic capture: {str(e)}")
+            if self.file is not None:
+                self.file.flush()
+
+
+class TrafficCaptureMiddleware:
+    """
+    API 요청 샘플링 기록 미들웨어 (TRAFFIC_CAPTURE['ENABLED']가 True일 때만 동작)
+
+    기록 항목: 시각, 메서드, 경로, 쿼리 파라미터, 익명화된 본문, 사용자 구분(anonymous/user/admin),
+    사용자 가명, 응답 상태 코드, 처리 시간(ms)
+    Authorization 헤더와 비밀번호/토큰 값은 기록하지 않습니다.
+    """
+
+    def __init__(self, get_response):
+        config = get_config()
+        if not config['ENABLED']:
+            raise MiddlewareNotUsed()
+
+        self.get_response = get_response
+        self.sample_rate = config['SAMPLE_RATE']
+        self.path_prefixes = tuple(config['PATH_PREFIXES'])
+        self.max_body_bytes = config['MAX_BODY_BYTES']
+        self.writer = CaptureWriter(
+            str(config['DIRECTORY']), config['MAX_BYTES'], config['BACKUP_COUNT'],
+            config['QUEUE_SIZE'], config['FLUSH_INTERVAL']
+        )
+
+    def __call__(self, request):
+        if not request.path.startswith(self.path_prefixes) or random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        # 뷰에서 본문을 읽은 뒤에는 다시 읽을 수 없으므로 먼저 읽어 둡니다. (큰 업로드는 읽지 않음)
+        try:
+            length = int(request.headers.get('Content-Length') or 0)
+        except ValueError:
+            length = 0
+        body = request.body if 0 < length <= self.max_body_bytes else None
+        started_at = time.time()
+        start = time.perf_counter()
+        response = self.get_response(request)
+        duration_ms = (time.perf_counter() - start) * 1000
+
+        try:
+            self.writer.put(self._build_record(request, body, length, response, started_at, duration_ms))
+        except Exception as e:
+            logger.error(f"Error capturing request {request.path}: {str(e)}")
+        return response
+
+    def _build_record(self, request, body, length, response, started_at, duration_ms):
+        user = getattr(request, 'user', None)
+        if user is None or not user.is_authenticated:
+            user_class, user_ref = 'anonymous', None
+        else:
+            user_class, user_ref = ('admin' if user.is_staff else 'user'), pseudonym(user.pk)
+
+        return {
+            'ts': started_at,
+            'method': request.method,
+            'path': request.path,
+            'query': {
+                key: ('***' if key in MASKED_QUERY_PARAMS else value)
+                for key, value in request.GET.items()
+            },
+            'body': self._parse_body(request, body, length),
+            'user_class': user_class,
+            'user_ref': user_ref,
+            'status': response.status_code,
+            'duration_ms': round(duration_ms, 3),
+        }
+
+    def _parse_body(self, request, body, length):
+        if not length:
+            return None
+        if body is None or not request.content_type.startswith('application/json'):
+            return {'_omitted': request.content_type, '_bytes': length}
+        try:
+            return anonymize(json.loads(body))
+        except ValueError:
+            return {'_omitted': 'invalid json', '_bytes': length}
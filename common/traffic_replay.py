@@ -0,0 +1,116 @@
+import glob
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .bench import Client, percentile
+
+NUMERIC_SEGMENT = re.compile(r'/\d+(?=/|$)')
+
+
+def load_capture(paths):
+    """캡처 파일(JSONL, glob 패턴 허용)을 읽어 시각 순으로 정렬한 기록 목록을 반환합니다."""
+    records = []
+    for pattern in paths:
+        for path in sorted(glob.glob(pattern)) or [pattern]:
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        records.append(json.loads(line))
+    records.sort(key=lambda record: record['ts'])
+    return records
+
+
+def path_template(path):
+    """/reservation/admin/12/confirm/ -> /reservation/admin/{id}/confirm/"""
+    return NUMERIC_SEGMENT.sub('/{id}', path)
+
+
+class TokenMapper:
+    """
+    캡처의 사용자 가명을 벤치마크 사용자 토큰에 대응시킵니다.
+    같은 가명은 항상 같은 벤치마크 사용자로 재생됩니다.
+    """
+
+    def __init__(self, seed_data):
+        self.user_tokens = seed_data['user_tokens']
+        self.admin_token = seed_data['admin_token']
+        self.assigned = {}
+        self.lock = threading.Lock()
+
+    def token_for(self, record):
+        if record['user_class'] == 'anonymous':
+            return None
+        if record['user_class'] == 'admin':
+            return self.admin_token
+        with self.lock:
+            if record['user_ref'] not in self.assigned:
+                self.assigned[record['user_ref']] = self.user_tokens[len(self.assigned) % len(self.user_tokens)]
+            return self.assigned[record['user_ref']]
+
+
+def replay(base_url, records, token_mapper, speed=1.0, concurrency=64, timeout=30):
+    """
+    기록을 원래 간격(speed배 빠르게)으로 재생합니다. speed가 0이면 간격 없이 최대한 빠르게 보냅니다.
+    (기록, 상태 코드, 지연 시간) 목록을 반환합니다.
+    """
+    if not records:
+        return []
+
+    local = threading.local()
+    results = []
+    results_lock = threading.Lock()
+
+    def send(record):
+        if not hasattr(local, 'client'):
+            local.client = Client(base_url, timeout)
+        # 크기가 커서 기록하지 않은 본문은 재생하지 않습니다.
+        body = None if isinstance(record['body'], dict) and '_omitted' in record['body'] else record['body']
+        status, elapsed, _ = local.client.request(
+            record['method'], record['path'], token_mapper.token_for(record),
+            body=body, query=record['query'] or None
+        )
+        with results_lock:
+            results.append((record, status, elapsed * 1000))
+
+    origin = records[0]['ts']
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for record in records:
+            if speed > 0:
+                delay = (record['ts'] - origin) / speed - (time.monotonic() - start)
+                if delay > 0:
+                    time.sleep(delay)
+            executor.submit(send, record)
+    return results
+
+
+def compare_latencies(results):
+    """
+    엔드포인트(메서드 + 경로 템플릿)별로 원래 지연 시간과 재생 지연 시간의 분포를 비교합니다.
+    원래 지연 시간은 서버 처리 시간이고, 재생 지연 시간은 클라이언트에서 측정한 응답 시간입니다.
+    """
+    groups = {}
+    for record, status, elapsed_ms in results:
+        key = f"{record['method']} {path_template(record['path'])}"
+        group = groups.setdefault(key, {'original': [], 'replay': [], 'status_match': 0})
+        group['original'].append(record['duration_ms'])
+        group['replay'].append(elapsed_ms)
+        if status == record['status']:
+            group['status_match'] += 1
+
+    report = {}
+    for key, group in sorted(groups.items()):
+        count = len(group['replay'])
+        report[key] = {
+            'requests': count,
+            'status_match_rate': round(group['status_match'] / count, 4),
+            **{
+                f"{name}_{label}_ms": round(percentile(group[name], p), 3)
+                for name in ('original', 'replay')
+                for label, p in (('p50', 50), ('p95', 95), ('p99', 99))
+            },
+        }
+    return report
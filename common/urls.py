@@ -0,0 +1,6 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('throttle/rejections/', views.throttle_rejection_view, name='throttle_rejections'),
+]
@@ -0,0 +1,107 @@
+import functools
+import logging
+import time
+from django.db import transaction
+from django.utils.http import http_date, parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+from .distributed_lock import redis_client
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY_PREFIX = "version:"
+
+
+def _bump(keys):
+    now = time.time()
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for key in keys:
+            pipe.hsetnx(f"{VERSION_KEY_PREFIX}{key}", 'v', int(now * 1000))
+            pipe.hincrby(f"{VERSION_KEY_PREFIX}{key}", 'v', 1)
+            pipe.hset(f"{VERSION_KEY_PREFIX}{key}", 'ts', int(now))
+        pipe.execute()
+    except Exception as e:
+        logger.error(f"Error bumping versions {keys}: {str(e)}")
+
+
+def bump_versions(*keys):
+    """
+    데이터 버전을 올립니다. (예: 'slots:2025-04-15', 'user:1')
+    트랜잭션 안에서 호출되면 커밋된 뒤에 반영됩니다.
+    """
+    keys = [key for key in keys if key]
+    if keys:
+        transaction.on_commit(lambda: _bump(keys))
+
+
+def get_version(key):
+    """
+    (버전, 마지막 변경 시각)을 반환합니다.
+    버전이 없으면 현재 시각 기반 값으로 초기화하여, Redis 데이터가 유실되더라도 이전 ETag와 겹치지 않도록 합니다.
+    """
+    now = time.time()
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.hsetnx(f"{VERSION_KEY_PREFIX}{key}", 'v', int(now * 1000))
+    pipe.hsetnx(f"{VERSION_KEY_PREFIX}{key}", 'ts', int(now))
+    pipe.hmget(f"{VERSION_KEY_PREFIX}{key}", 'v', 'ts')
+    version, ts = pipe.execute()[-1]
+    return int(version), int(ts)
+
+
+def slots_version_key(date):
+    return f"slots:{date.isoformat()}"
+
+
+CALENDAR_VERSION_KEY = "slots:calendar"
+
+
+def user_version_key(user_id):
+    return f"user:{user_id}"
+
+
+def conditional_on_version(version_key_func, etag_suffix_func=None):
+    """
+    버전 카운터 기반 조건부 GET 데코레이터
+
+    version_key_func(request)가 반환한 키의 버전으로 ETag/Last-Modified를 만들고,
+    클라이언트가 보낸 If-None-Match와 일치하면 뷰를 실행하지 않고 304를 반환합니다.
+    Last-Modified는 참고용이며 If-Modified-Since만 보낸 요청은 항상 다시 조회합니다.
+    etag_suffix_func(request)는 같은 버전이라도 응답이 달라지는 조건(예: 현재 날짜)을 ETag에 포함할 때 사용합니다.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return func(request, *args, **kwargs)
+
+            key = version_key_func(request)
+            if key is None:
+                return func(request, *args, **kwargs)
+
+            try:
+                version, modified = get_version(key)
+            except Exception as e:
+                logger.error(f"Error reading version {key}: {str(e)}")
+                return func(request, *args, **kwargs)
+
+            suffix = etag_suffix_func(request) if etag_suffix_func else ''
+            etag = f'W/"{key}:{version}{":" + suffix if suffix else ""}"'
+
+            # If-Modified-Since는 초 단위라 같은 초 안에 버전이 바뀌면 이전 응답을 304로 돌려줄 수 있으므로 ETag로만 비교합니다.
+            if_none_match = request.headers.get('If-None-Match')
+            not_modified = bool(if_none_match) and (etag in parse_etags(if_none_match) or if_none_match.strip() == '*')
+
+            if not_modified:
+                response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            else:
+                response = func(request, *args, **kwargs)
+                if response.status_code != status.HTTP_200_OK:
+                    return response
+
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(modified)
+            return response
+
+        return wrapper
+    return decorator
@@ -1,3 +1,31 @@
-from django.shortcuts import render
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from drf_yasg.utils import swagger_auto_schema
+from .serializers import ErrorResponseSerializer, ThrottleRejectionResponseSerializer
+from .throttling import get_rejection_counts
+from .query_budget import query_budget
 
-# Create your views here.
+@swagger_auto_schema(
+    method='get',
+    operation_summary="요청 제한 거부 횟수 조회 API",
+    operation_description="관리자가 throttle scope별 누적 거부 횟수를 조회합니다. (예: reservation_create:user)",
+    responses={
+        200: ThrottleRejectionResponseSerializer,
+        403: ErrorResponseSerializer,
+        500: ErrorResponseSerializer
+    }
+)
+@query_budget(0)
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def throttle_rejection_view(request):
+    """
+    요청 제한 거부 횟수 조회 관리자 API
+    """
+    try:
+        return Response(ThrottleRejectionResponseSerializer({'rejections': get_rejection_counts()}).data)
+    except Exception as e:
+        return Response(ErrorResponseSerializer({'error': f'거부 횟수 조회 중 오류가 발생했습니다: {str(e)}'}).data,
+                         status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -13,4 +13,13 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'exam_scheduler.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from examslots.live import STREAM_PATH, availability_stream
+
+
+async def application(scope, receive, send):
+    # 예약 가능 인원 SSE 스트림은 연결을 오래 유지하므로 Django 요청 처리와 분리하여 비동기로 처리합니다.
+    if scope['type'] == 'http' and scope['path'] == STREAM_PATH:
+        return await availability_stream(scope, receive, send)
+    return await django_application(scope, receive, send)
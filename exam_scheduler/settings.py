@@ -43,6 +43,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'common.traffic_capture.TrafficCaptureMiddleware',
 ]
 
 ROOT_URLCONF = 'exam_scheduler.urls'
@@ -82,6 +83,16 @@ DATABASES = {
     }
 }
 
+# 로컬 벤치마크/개발용 SQLite 대체 설정 (DB_ENGINE=sqlite)
+# PostgreSQL 전용 인덱스(GIN 등)는 생성되지 않습니다. (common/sqlite/base.py)
+if os.getenv('DB_ENGINE') == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'common.sqlite',
+            'NAME': os.getenv('DB_NAME') or BASE_DIR / 'db.sqlite3',
+        }
+    }
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -145,9 +156,82 @@ SESSION_CACHE_ALIAS = "default"
 REDIS_LOCK_TIMEOUT = 30
 REDIS_LOCK_BLOCKING_TIMEOUT = 10
 
+# 토큰 인증 캐시 설정 (LOCAL_MAXSIZE가 0이면 프로세스 내부 캐시를 사용하지 않음)
+AUTH_TOKEN_CACHE = {
+    'TIMEOUT': 300,
+    'LOCAL_MAXSIZE': 0,
+    'LOCAL_TIMEOUT': 5,
+}
+
+# 토큰 저장소 설정 ('db': authtoken 테이블, 'redis': 만료 시간이 있는 Redis 토큰)
+AUTH_TOKEN_STORE = {
+    'BACKEND': os.getenv('AUTH_TOKEN_STORE', 'db'),
+    'TIMEOUT': 60 * 60 * 24,
+    'SLIDING': True,
+}
+
+# True이면 예약 신청을 Redis Stream에 등록하고 번호표를 반환합니다. (process_reservation_queue 워커 필요)
+RESERVATION_ASYNC_MODE = os.getenv('RESERVATION_ASYNC_MODE', 'false').lower() == 'true'
+
+# 예약 API 입장 제어(대기열) 설정 (common.admission)
+# 동시 처리 요청 수 limit는 DB 쿼리 평균 지연 시간이 TARGET_DB_LATENCY_MS를 넘지 않도록 조정됩니다.
+ADMISSION_CONTROL = {
+    'reservation': {
+        'INITIAL_LIMIT': 50,
+        'MIN_LIMIT': 5,
+        'MAX_LIMIT': 500,
+        'TARGET_DB_LATENCY_MS': 20,
+        'LEASE_SECONDS': 30,
+        'TICKET_TTL': 600,
+        # 입장이 허가된 번호표로 다시 요청해야 하는 시간 (그동안 자리를 차지함)
+        'ADMIT_LEASE_SECONDS': 10,
+    },
+}
+
+# 예약 가능 시간대 조회 캐시 설정 (TIMEOUT이 0이면 캐시를 사용하지 않음)
+# STALE_TIMEOUT: 만료 후 이전 값을 응답하며 백그라운드에서 갱신하는 기간
+# LOCK_TIMEOUT: 다른 프로세스의 재계산을 기다리는 최대 시간
+AVAILABILITY_CACHE = {
+    'TIMEOUT': 2,
+    'STALE_TIMEOUT': 30,
+    'LOCK_TIMEOUT': 5,
+}
+
+# 달력용 날짜별 요약 갱신 주기(초): 예약으로 인원이 바뀐 날짜를 모아서 다시 계산 (refresh_daily_summaries)
+DAILY_SUMMARY = {
+    'REFRESH_INTERVAL': 5,
+}
+
+# 시간대 예약 인원 관리 방식 (examslots.capacity)
+# row: exam_slots.current_count를 직접 갱신, ledger: 변경분을 원장에 추가하고 COMPACT_INTERVAL초마다 합침
+# striped: 시간대 인원을 구간으로 나누어 갱신, STRIPE_ADJUST_INTERVAL초마다 경합 횟수에 따라 구간 수 조정
+SLOT_CAPACITY = {
+    'BACKEND': os.getenv('SLOT_CAPACITY_BACKEND', 'row'),
+    'COMPACT_INTERVAL': 10,
+    'MAX_STRIPES': 16,
+    'STRIPE_CONTENTION_THRESHOLD': 20,
+    'STRIPE_ADJUST_INTERVAL': 60,
+}
+
+# 시험 종류별 시간대 설정 (examslots.granularity)
+# SLOT_MINUTES: 시간대 단위(분, 1440을 나눌 수 있어야 함), MAX_CAPACITY: 새로 생성하는 시간대의 최대 인원
+# 예: 'speaking': {'SLOT_MINUTES': 30}, 'listening': {'SLOT_MINUTES': 15}
+EXAM_TYPES = {
+    'default': {'SLOT_MINUTES': 60, 'MAX_CAPACITY': 50000},
+}
+
+# API 요청 샘플링 기록 설정 (common.traffic_capture, replay_requests 명령으로 재생)
+TRAFFIC_CAPTURE = {
+    'ENABLED': os.getenv('TRAFFIC_CAPTURE', 'false').lower() == 'true',
+    'SAMPLE_RATE': float(os.getenv('TRAFFIC_CAPTURE_SAMPLE_RATE', '0.01')),
+    'DIRECTORY': BASE_DIR / 'captures',
+    'MAX_BYTES': 100 * 1024 * 1024,
+    'BACKUP_COUNT': 10,
+}
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'users.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -156,6 +240,15 @@ REST_FRAMEWORK = {
         'rest_framework.renderers.JSONRenderer',
     ],
     'EXCEPTION_HANDLER': 'rest_framework.views.exception_handler',
+    # Redis 토큰 버킷 throttle 설정 (common.throttling)
+    # '<scope>': 사용자 단위, '<scope>_ip': IP 단위
+    # 값은 '요청 수/기간' 또는 {'rate': '요청 수/기간', 'capacity': 최대 버스트}
+    'TOKEN_BUCKET_RATES': {
+        'reservation_create': {'rate': '10/min', 'capacity': 5},
+        'reservation_create_ip': {'rate': '120/min', 'capacity': 60},
+        'availability': {'rate': '60/min', 'capacity': 20},
+        'availability_ip': {'rate': '600/min', 'capacity': 200},
+    },
 }
 
 SWAGGER_SETTINGS = {
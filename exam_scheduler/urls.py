@@ -20,6 +20,7 @@ urlpatterns = [
     path('users/', include('users.urls')),
     path('examslots/', include('examslots.urls')),
     path('reservation/', include('reservation.urls')),
+    path('common/', include('common.urls')),
     path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
     path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
 ]
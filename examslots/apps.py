@@ -1,6 +1,7 @@
 from django.apps import AppConfig
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 
 
 class ExamslotsConfig(AppConfig):
@@ -24,4 +25,32 @@ class ExamslotsConfig(AppConfig):
                 name='Add next day slots',
                 replace_existing=True
             )
+
+            from django.conf import settings
+            from .models import DailySummary
+            scheduler.add_job(
+                DailySummary.refresh_dirty,
+                trigger=IntervalTrigger(seconds=settings.DAILY_SUMMARY['REFRESH_INTERVAL']),
+                id='refresh_daily_summaries',
+                name='Refresh daily summaries',
+                replace_existing=True
+            )
+
+            from .capacity import adjust_stripes, compact_ledger, get_config
+            if get_config()['BACKEND'] == 'ledger':
+                scheduler.add_job(
+                    compact_ledger,
+                    trigger=IntervalTrigger(seconds=get_config()['COMPACT_INTERVAL']),
+                    id='compact_capacity_ledger',
+                    name='Compact capacity ledger',
+                    replace_existing=True
+                )
+            elif get_config()['BACKEND'] == 'striped':
+                scheduler.add_job(
+                    adjust_stripes,
+                    trigger=IntervalTrigger(seconds=get_config()['STRIPE_ADJUST_INTERVAL']),
+                    id='adjust_capacity_stripes',
+                    name='Adjust capacity stripes',
+                    replace_existing=True
+                )
             scheduler.start()
\ No newline at end of file
@@ -0,0 +1,358 @@
+import logging
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import connection, models, transaction
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from common.distributed_lock import redis_client
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG = {
+    'BACKEND': 'row',
+    'COMPACT_INTERVAL': 10,
+    'MAX_STRIPES': 16,
+    'STRIPE_CONTENTION_THRESHOLD': 20,
+    'STRIPE_ADJUST_INTERVAL': 60,
+}
+
+# pg_advisory_xact_lock(bigint) 키의 상위 32비트 namespace (키 = namespace << 32 | 시간대 id)
+LEDGER_LOCK_NAMESPACE = 7301
+# 시간대별 경합 횟수 (모든 구간이 잠겨 있거나 자리가 없어 재분배한 횟수)
+STRIPE_CONTENTION_KEY = "capacity:stripe_contention"
+
+
+def get_config():
+    return {**DEFAULT_CONFIG, **getattr(settings, 'SLOT_CAPACITY', {})}
+
+
+def _over_capacity_error(slot_ids, count):
+    from .models import ExamSlot
+    slot = ExamSlot.objects.with_usage().filter(
+        id__in=slot_ids, used_count__gt=models.F('max_capacity') - count
+    ).order_by('id').first()
+    if slot is None:
+        return ValidationError("예약에 해당하는 시간대가 없습니다.")
+    return ValidationError(f"슬롯 {slot.id}의 최대 인원 수를 초과할 수 없습니다.")
+
+
+class RowCapacity:
+    """
+    시간대 행의 current_count를 직접 갱신합니다. (기본값)
+    같은 시간대를 예약하는 트랜잭션은 커밋될 때까지 그 행의 잠금을 기다립니다.
+
+    모든 방식의 apply_each({시간대 id: +/- 인원})는 시간대마다 다른 인원을 한 번에 반영하며,
+    최대 인원을 검사하지 않으므로 호출하는 쪽에서 lock()으로 잠그고 확인해야 합니다.
+    """
+    name = 'row'
+
+    def annotate(self, queryset):
+        return queryset.annotate(used_count=models.F('current_count'))
+
+    def lock(self, slot_ids):
+        from .models import ExamSlot
+        # 여러 시간대를 잠글 때 교착 상태가 생기지 않도록 id 순서로 잠급니다.
+        list(ExamSlot.objects.select_for_update().filter(id__in=slot_ids).order_by('id').values_list('id', flat=True))
+
+    def apply(self, slot_ids, count):
+        from .models import ExamSlot
+        self.lock(slot_ids)
+
+        slots = ExamSlot.objects.filter(id__in=slot_ids)
+        if count > 0:
+            slots = slots.filter(current_count__lte=models.F('max_capacity') - count)
+        if slots.update(current_count=models.F('current_count') + count) != len(slot_ids):
+            raise _over_capacity_error(slot_ids, count)
+
+    def release(self, totals):
+        self.lock(sorted(totals))
+        self.apply_each({slot_id: -amount for slot_id, amount in totals.items()})
+
+    def apply_each(self, counts):
+        from .models import ExamSlot
+        # 시간대마다 변경할 인원이 다르므로 CASE 식으로 한 번에 갱신합니다.
+        ExamSlot.objects.filter(id__in=sorted(counts)).update(current_count=models.F('current_count') + models.Case(
+            *[models.When(id=slot_id, then=models.Value(count)) for slot_id, count in counts.items()],
+            default=models.Value(0), output_field=models.IntegerField()
+        ))
+
+
+class LedgerCapacity:
+    """
+    예약/해제할 때 시간대 행을 갱신하지 않고 원장(exam_slot_capacity_ledger)에 변경분 행을 추가합니다.
+
+    사용 인원 = current_count(주기적으로 합쳐진 누적값) + 아직 합쳐지지 않은 변경분의 합
+    예약 시 최대 인원 검사와 변경분 추가는 하나의 INSERT ... SELECT 문으로 실행되며,
+    같은 시간대의 동시 예약은 PostgreSQL advisory lock으로 순서를 정합니다. (시간대 행은 잠그지 않음)
+    해제는 최대 인원을 넘을 수 없으므로 잠금 없이 추가합니다.
+    """
+    name = 'ledger'
+
+    def annotate(self, queryset):
+        from .models import SlotCapacityDelta
+        pending = SlotCapacityDelta.objects.filter(slot_id=models.OuterRef('pk')).values('slot_id').annotate(
+            total=models.Sum('delta')
+        ).values('total')
+        return queryset.annotate(
+            used_count=models.F('current_count') + Coalesce(models.Subquery(pending), 0)
+        )
+
+    def lock(self, slot_ids):
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    # 시간대 id는 bigint일 수 있으므로 (namespace, id) 두 integer 인자 대신 하나의 bigint 키로 잠급니다.
+                    "SELECT pg_advisory_xact_lock((%s::bigint << 32) | id) FROM unnest(%s::bigint[]) AS id",
+                    [LEDGER_LOCK_NAMESPACE, sorted(slot_ids)]
+                )
+
+    def apply(self, slot_ids, count):
+        from .models import ExamSlot, SlotCapacityDelta
+        if count <= 0:
+            SlotCapacityDelta.objects.bulk_create([SlotCapacityDelta(slot_id=slot_id, delta=count) for slot_id in slot_ids])
+            return
+
+        self.lock(slot_ids)
+        quote = connection.ops.quote_name
+        slot_table = quote(ExamSlot._meta.db_table)
+        ledger_table = quote(SlotCapacityDelta._meta.db_table)
+        id_params = ', '.join(['%s'] * len(slot_ids))
+        with connection.cursor() as cursor:
+            cursor.execute(f"""
+                INSERT INTO {ledger_table} (slot_id, delta, created_at)
+                SELECT s.id, %s, %s FROM {slot_table} AS s
+                WHERE s.id IN ({id_params})
+                  AND NOT EXISTS (
+                      SELECT 1 FROM {slot_table} AS c
+                      WHERE c.id IN ({id_params})
+                        AND c.current_count + %s + COALESCE(
+                            (SELECT SUM(l.delta) FROM {ledger_table} AS l WHERE l.slot_id = c.id), 0
+                        ) > c.max_capacity
+                  )
+            """, [count, timezone.now(), *slot_ids, *slot_ids, count])
+            inserted = cursor.rowcount
+
+        if inserted != len(slot_ids):
+            raise _over_capacity_error(slot_ids, count)
+
+    def release(self, totals):
+        self.apply_each({slot_id: -amount for slot_id, amount in totals.items()})
+
+    def apply_each(self, counts):
+        from .models import SlotCapacityDelta
+        SlotCapacityDelta.objects.bulk_create([
+            SlotCapacityDelta(slot_id=slot_id, delta=count) for slot_id, count in sorted(counts.items())
+        ])
+
+
+def _split(total, parts):
+    """total을 parts개로 최대한 고르게 나눕니다. (앞쪽이 1씩 더 큼)"""
+    quotient, remainder = divmod(total, parts)
+    return [quotient + (1 if i < remainder else 0) for i in range(parts)]
+
+
+def _record_contention(slot_id):
+    try:
+        redis_client.hincrby(STRIPE_CONTENTION_KEY, slot_id, 1)
+    except Exception as e:
+        logger.error(f"Error recording stripe contention for slot {slot_id}: {str(e)}")
+
+
+class StripedCapacity:
+    """
+    시간대의 인원을 여러 구간(stripe) 행으로 나누어 관리합니다.
+    각 구간은 max_capacity의 일부를 가지며, 시간대의 사용 인원은 current_count + 구간 사용 인원의 합입니다.
+
+    - 예약/해제는 잠겨 있지 않고 자리가 있는 구간 하나를 무작위로 골라 갱신합니다. (SKIP LOCKED)
+    - 그런 구간이 없으면 모든 구간을 잠그고 인원을 고르게 재분배하며, 경합 횟수를 기록합니다.
+    - 구간이 없는 시간대는 처음 갱신할 때 구간 1개를 만들어 current_count를 옮깁니다.
+    - 구간 수는 경합 횟수에 따라 adjust_stripes가 늘리거나 줄입니다.
+    """
+    name = 'striped'
+
+    def annotate(self, queryset):
+        from .models import SlotCapacityStripe
+        striped = SlotCapacityStripe.objects.filter(slot_id=models.OuterRef('pk')).values('slot_id').annotate(
+            total=models.Sum('current_count')
+        ).values('total')
+        return queryset.annotate(
+            used_count=models.F('current_count') + Coalesce(models.Subquery(striped), 0)
+        )
+
+    def lock(self, slot_ids):
+        from .models import ExamSlot, SlotCapacityStripe
+        # 구간이 아직 없는 시간대는 ensure_stripes가 시간대 행을 잠그고 구간을 만듭니다.
+        list(ExamSlot.objects.select_for_update().filter(id__in=slot_ids).order_by('id').values_list('id', flat=True))
+        list(SlotCapacityStripe.objects.select_for_update().filter(slot_id__in=slot_ids).order_by('slot_id', 'index').values_list('id', flat=True))
+
+    def apply(self, slot_ids, count):
+        self.apply_each({slot_id: count for slot_id in slot_ids})
+
+    def release(self, totals):
+        self.apply_each({slot_id: -amount for slot_id, amount in totals.items()})
+
+    def apply_each(self, counts):
+        from .models import SlotCapacityStripe
+        slot_ids = sorted(counts)
+        striped = set(SlotCapacityStripe.objects.filter(slot_id__in=slot_ids).values_list('slot_id', flat=True))
+        if len(striped) < len(slot_ids):
+            ensure_stripes([slot_id for slot_id in slot_ids if slot_id not in striped])
+
+        for slot_id in slot_ids:
+            if not self._take(slot_id, counts[slot_id]):
+                _record_contention(slot_id)
+                self._rebalance(slot_id, counts[slot_id])
+
+    def _take(self, slot_id, count):
+        from .models import SlotCapacityStripe
+        stripes = SlotCapacityStripe.objects.select_for_update(skip_locked=True).filter(slot_id=slot_id)
+        if count > 0:
+            stripes = stripes.filter(current_count__lte=models.F('max_capacity') - count)
+        else:
+            stripes = stripes.filter(current_count__gte=-count)
+        stripe_id = stripes.order_by('?').values_list('id', flat=True).first()
+        if stripe_id is None:
+            return False
+        SlotCapacityStripe.objects.filter(id=stripe_id).update(current_count=models.F('current_count') + count)
+        return True
+
+    def _rebalance(self, slot_id, count):
+        from .models import SlotCapacityStripe
+        stripes = list(SlotCapacityStripe.objects.select_for_update().filter(slot_id=slot_id).order_by('index'))
+        if not stripes:
+            raise ValidationError("예약 처리 중 오류가 발생했습니다.")
+
+        used = sum(stripe.current_count for stripe in stripes) + count
+        total = sum(stripe.max_capacity for stripe in stripes)
+        if used > total:
+            raise _over_capacity_error([slot_id], count)
+
+        for stripe, capacity, current in zip(stripes, _split(total, len(stripes)), _split(used, len(stripes))):
+            stripe.max_capacity, stripe.current_count = capacity, current
+        SlotCapacityStripe.objects.bulk_update(stripes, ['max_capacity', 'current_count'])
+
+
+def ensure_stripes(slot_ids):
+    """구간이 없는 시간대에 구간 1개를 만들고 current_count를 옮깁니다."""
+    from .models import ExamSlot, SlotCapacityStripe
+    with transaction.atomic():
+        slots = list(ExamSlot.objects.select_for_update().filter(id__in=slot_ids).order_by('id'))
+        striped = set(SlotCapacityStripe.objects.filter(slot_id__in=slot_ids).values_list('slot_id', flat=True))
+        slots = [slot for slot in slots if slot.id not in striped]
+        SlotCapacityStripe.objects.bulk_create([
+            SlotCapacityStripe(slot=slot, index=0, max_capacity=slot.max_capacity, current_count=slot.current_count)
+            for slot in slots
+        ])
+        ExamSlot.objects.filter(id__in=[slot.id for slot in slots]).update(current_count=0)
+
+
+def set_stripe_count(slot_id, stripes):
+    """
+    시간대의 구간 수를 바꾸고 인원을 고르게 재분배합니다.
+    stripes가 0이면 구간을 없애고 인원을 current_count로 되돌립니다.
+    """
+    from .models import ExamSlot, SlotCapacityStripe
+    with transaction.atomic():
+        slot = ExamSlot.objects.select_for_update().get(id=slot_id)
+        existing = list(SlotCapacityStripe.objects.select_for_update().filter(slot_id=slot_id).order_by('index'))
+        used = slot.current_count + sum(stripe.current_count for stripe in existing)
+
+        if stripes <= 0:
+            SlotCapacityStripe.objects.filter(slot_id=slot_id).delete()
+            ExamSlot.objects.filter(id=slot_id).update(current_count=used)
+            return
+
+        # 남는 구간 행은 그대로 갱신해야 잠금을 기다리던 예약이 다시 찾을 수 있습니다.
+        kept = existing[:stripes]
+        added = [SlotCapacityStripe(slot_id=slot_id, index=index) for index in range(len(kept), stripes)]
+        for stripe, capacity, current in zip(kept + added, _split(slot.max_capacity, stripes), _split(used, stripes)):
+            stripe.max_capacity, stripe.current_count = capacity, current
+        SlotCapacityStripe.objects.filter(slot_id=slot_id, index__gte=stripes).delete()
+        SlotCapacityStripe.objects.bulk_update(kept, ['max_capacity', 'current_count'])
+        SlotCapacityStripe.objects.bulk_create(added)
+        ExamSlot.objects.filter(id=slot_id).update(current_count=0)
+
+
+def rescale_stripes(slot_ids):
+    """max_capacity가 바뀐 시간대들의 구간 인원을 구간 수는 그대로 두고 다시 나눕니다."""
+    from .models import SlotCapacityStripe
+    current = SlotCapacityStripe.objects.filter(slot_id__in=slot_ids).values('slot_id').annotate(
+        stripes=models.Count('id')
+    ).values_list('slot_id', 'stripes')
+    for slot_id, stripes in current:
+        set_stripe_count(slot_id, stripes)
+
+
+def adjust_stripes():
+    """
+    마지막 실행 이후의 경합 횟수에 따라 구간 수를 조정하고 {시간대 id: 새 구간 수}를 반환합니다.
+    - 경합이 STRIPE_CONTENTION_THRESHOLD 이상이면 구간 수를 2배로 (최대 MAX_STRIPES)
+    - 경합이 없었던 시간대는 구간 수를 절반으로 (최소 1)
+    """
+    from .models import SlotCapacityStripe
+    config = get_config()
+    pipe = redis_client.pipeline()
+    pipe.hgetall(STRIPE_CONTENTION_KEY)
+    pipe.delete(STRIPE_CONTENTION_KEY)
+    contention = {int(slot_id): int(value) for slot_id, value in pipe.execute()[0].items()}
+
+    current = list(
+        SlotCapacityStripe.objects.values('slot_id').annotate(stripes=models.Count('id')).values_list('slot_id', 'stripes')
+    )
+    changes = {}
+    for slot_id, stripes in current:
+        if contention.get(slot_id, 0) >= config['STRIPE_CONTENTION_THRESHOLD']:
+            target = min(stripes * 2, config['MAX_STRIPES'])
+        elif contention.get(slot_id, 0) == 0:
+            target = max(stripes // 2, 1)
+        else:
+            continue
+        if target != stripes:
+            set_stripe_count(slot_id, target)
+            changes[slot_id] = target
+    return changes
+
+
+BACKENDS = {backend.name: backend for backend in (RowCapacity(), LedgerCapacity(), StripedCapacity())}
+
+
+def get_backend():
+    name = get_config()['BACKEND']
+    if name not in BACKENDS:
+        raise ValueError(f"알 수 없는 시간대 인원 관리 방식입니다: {name} (가능: {', '.join(BACKENDS)})")
+    return BACKENDS[name]
+
+
+def compact_ledger():
+    """
+    원장의 변경분을 시간대의 current_count에 합치고 삭제합니다. 갱신한 시간대 수를 반환합니다.
+    PostgreSQL에서는 삭제와 합산을 한 문장으로 실행하므로, 실행 중에 추가된 변경분을 잃지 않습니다.
+    """
+    from .models import ExamSlot, SlotCapacityDelta
+    quote = connection.ops.quote_name
+    slot_table = quote(ExamSlot._meta.db_table)
+    ledger_table = quote(SlotCapacityDelta._meta.db_table)
+
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(f"""
+                WITH moved AS (
+                    DELETE FROM {ledger_table} RETURNING slot_id, delta
+                )
+                UPDATE {slot_table} AS s
+                SET current_count = s.current_count + m.total
+                FROM (SELECT slot_id, SUM(delta) AS total FROM moved GROUP BY slot_id) AS m
+                WHERE s.id = m.slot_id
+            """)
+            return cursor.rowcount
+
+    with transaction.atomic():
+        last_id = SlotCapacityDelta.objects.aggregate(last_id=models.Max('id'))['last_id']
+        if last_id is None:
+            return 0
+        deltas = SlotCapacityDelta.objects.filter(id__lte=last_id)
+        totals = deltas.values('slot_id').annotate(total=models.Sum('delta'))
+        for row in totals:
+            ExamSlot.objects.filter(id=row['slot_id']).update(current_count=models.F('current_count') + row['total'])
+        deltas.delete()
+        return len(totals)
@@ -1,22 +1,17 @@
-from datetime import timedelta
-from .models import ExamSlot
+from datetime import datetime, timedelta
+from django.db.models import Max
+from .models import ExamSlot, DailySummary
+from common.versioning import bump_versions, slots_version_key
 
 
 def add_next_day_slots():
-    last_slot = ExamSlot.objects.order_by('-date', '-hour').first()
+    last_date = ExamSlot.objects.aggregate(last_date=Max('date'))['last_date']
     
-    if last_slot:
-        current_date = last_slot.date
-        next_date = current_date + timedelta(days=1)
+    if last_date:
+        next_date = last_date + timedelta(days=1)
+        start_time = datetime.combine(next_date, datetime.min.time())
         
-        slots_to_create = []
-        for hour in range(24):
-            slots_to_create.append(
-                ExamSlot(
-                    date=next_date,
-                    hour=hour
-                )
-            )
-        
-        if slots_to_create:
-            ExamSlot.objects.bulk_create(slots_to_create)
\ No newline at end of file
+        # 모든 시험 종류의 다음 날 시간대를 시간대 단위에 맞춰 한 번에 생성합니다.
+        if ExamSlot.generate_slots(start_time, start_time + timedelta(days=1)):
+            DailySummary.refresh([next_date])
+            bump_versions(slots_version_key(next_date))
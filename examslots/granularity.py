@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+DEFAULT_EXAM_TYPE = 'default'
+DEFAULT_EXAM_TYPES = {
+    DEFAULT_EXAM_TYPE: {'SLOT_MINUTES': 60, 'MAX_CAPACITY': 50000},
+}
+MINUTES_PER_DAY = 24 * 60
+
+
+def get_exam_types():
+    """
+    {시험 종류: {'SLOT_MINUTES': 시간대 단위(분), 'MAX_CAPACITY': 시간대 최대 인원}}을 반환합니다.
+    시간대 단위는 하루(1440분)를 나눌 수 있어야 합니다.
+    """
+    exam_types = {}
+    for name, config in getattr(settings, 'EXAM_TYPES', DEFAULT_EXAM_TYPES).items():
+        config = {**DEFAULT_EXAM_TYPES[DEFAULT_EXAM_TYPE], **config}
+        if config['SLOT_MINUTES'] <= 0 or MINUTES_PER_DAY % config['SLOT_MINUTES']:
+            raise ImproperlyConfigured(f"{name}의 시간대 단위는 1440분을 나눌 수 있어야 합니다: {config['SLOT_MINUTES']}")
+        exam_types[name] = config
+    return exam_types
+
+
+def is_exam_type(exam_type):
+    return exam_type in get_exam_types()
+
+
+def slot_minutes(exam_type):
+    exam_types = get_exam_types()
+    if exam_type not in exam_types:
+        raise ValueError(f"알 수 없는 시험 종류입니다: {exam_type} (가능: {', '.join(exam_types)})")
+    return exam_types[exam_type]['SLOT_MINUTES']
+
+
+def minute_of_day(value):
+    return value.hour * 60 + value.minute
+
+
+def is_aligned(value, minutes):
+    """value가 시간대 시작 시각(단위의 배수)인지 확인합니다."""
+    return value.second == 0 and value.microsecond == 0 and minute_of_day(value) % minutes == 0
+
+
+def first_index(value, minutes):
+    """value 이후(포함)에 시작하는 첫 시간대의 번호 (하루 안에서 0부터)"""
+    return -(-minute_of_day(value) // minutes)
+
+
+def slot_start(date, index, minutes):
+    return datetime.combine(date, datetime.min.time()) + timedelta(minutes=index * minutes)
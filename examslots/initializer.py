@@ -1,25 +1,18 @@
 from datetime import timedelta
 from django.utils import timezone
-from .models import ExamSlot
+from .models import ExamSlot, DailySummary
+from common.versioning import bump_versions, slots_version_key
 
 def initialize_exam_slots():
     ExamSlot.objects.all().delete()
+    DailySummary.objects.all().delete()
     
-    now = timezone.now()
-    next_hour = now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
-    three_months_later = next_hour + timedelta(days=90)
+    # 이미 시작된 시간대는 제외하고, 시험 종류별 다음 시간대부터 3개월 동안 생성합니다.
+    now = timezone.now().replace(second=0, microsecond=0) + timedelta(minutes=1)
+    three_months_later = now + timedelta(days=90)
     
-    slots_to_create = []
-
-    current_time = next_hour
-    while current_time < three_months_later:
-        slots_to_create.append(
-            ExamSlot(
-                date=current_time.date(),
-                hour=current_time.hour
-            )
-        )
-        current_time += timedelta(hours=1)
+    dates = ExamSlot.generate_slots(now, three_months_later)
     
-    if slots_to_create:
-        ExamSlot.objects.bulk_create(slots_to_create) 
\ No newline at end of file
+    if dates:
+        DailySummary.refresh(dates)
+        bump_versions(*{slots_version_key(date) for date in dates})
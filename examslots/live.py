@@ -0,0 +1,257 @@
+import asyncio
+import json
+import logging
+from datetime import datetime
+from urllib.parse import parse_qs
+import redis.asyncio as aioredis
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from rest_framework import exceptions
+from common.distributed_lock import redis_client
+
+logger = logging.getLogger(__name__)
+
+STREAM_PATH = '/examslots/available/stream/'
+CHANNEL_PREFIX = "examslots:availability:"
+MAX_DATES = 14
+HEARTBEAT_SECONDS = 15
+
+
+def _channel(date):
+    return f"{CHANNEL_PREFIX}{date.isoformat()}"
+
+
+def publish_slot_changes(slots):
+    """
+    시간대의 남은 인원 변경을 날짜별 채널에 발행합니다. (남은 인원은 시험장별)
+    구독자 수와 관계없이 한 번의 변경은 날짜당 한 개의 메시지이며, 트랜잭션이 커밋된 뒤에 발행됩니다.
+    """
+    changes = {}
+    for slot in slots:
+        changes.setdefault(slot.date, {})[(slot.venue_id, slot.exam_type, slot.hour, slot.minute)] = slot.remaining_capacity
+    if not changes:
+        return
+
+    def publish():
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for date, times in changes.items():
+                pipe.publish(_channel(date), json.dumps({
+                    'date': date.isoformat(),
+                    'slots': [
+                        {'venue': venue, 'exam_type': exam_type, 'hour': hour, 'minute': minute, 'remaining_capacity': remaining}
+                        for (venue, exam_type, hour, minute), remaining in sorted(times.items())
+                    ],
+                }))
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"Error publishing availability changes: {str(e)}")
+
+    transaction.on_commit(publish)
+
+
+class Subscriber:
+    """
+    한 SSE 연결의 대기 중인 변경 사항
+
+    클라이언트가 느리면 같은 시간대의 변경은 최신 값 하나로 합쳐집니다.
+    """
+
+    def __init__(self, dates):
+        self.channels = {_channel(date) for date in dates}
+        self.pending = {}
+        self.event = asyncio.Event()
+
+    def push(self, message):
+        for slot in message['slots']:
+            self.pending[(message['date'], slot['venue'], slot['exam_type'], slot['hour'], slot['minute'])] = slot['remaining_capacity']
+        self.event.set()
+
+    async def drain(self, timeout):
+        try:
+            await asyncio.wait_for(self.event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        self.event.clear()
+        pending, self.pending = self.pending, {}
+        return [
+            {'date': date, 'venue': venue, 'exam_type': exam_type, 'hour': hour, 'minute': minute, 'remaining_capacity': remaining}
+            for (date, venue, exam_type, hour, minute), remaining in sorted(pending.items())
+        ]
+
+
+class AvailabilityHub:
+    """
+    프로세스당 하나의 Redis pub/sub 연결로 날짜 채널을 구독하고 SSE 연결들에 나누어 전달합니다.
+    마지막 구독자가 떠난 채널은 구독을 해제합니다.
+    """
+
+    def __init__(self):
+        self.subscribers = {}
+        self.pubsub = None
+        self.listener = None
+        self.lock = asyncio.Lock()
+
+    async def subscribe(self, subscriber):
+        async with self.lock:
+            if self.pubsub is None:
+                client = aioredis.Redis.from_url(settings.CACHES['default']['LOCATION'])
+                self.pubsub = client.pubsub(ignore_subscribe_messages=True)
+
+            new_channels = [channel for channel in subscriber.channels if channel not in self.subscribers]
+            for channel in subscriber.channels:
+                self.subscribers.setdefault(channel, set()).add(subscriber)
+            if new_channels:
+                await self.pubsub.subscribe(*new_channels)
+
+            if self.listener is None or self.listener.done():
+                self.listener = asyncio.create_task(self._listen())
+
+    async def unsubscribe(self, subscriber):
+        async with self.lock:
+            empty_channels = []
+            for channel in subscriber.channels:
+                subscribers = self.subscribers.get(channel)
+                if subscribers is None:
+                    continue
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self.subscribers[channel]
+                    empty_channels.append(channel)
+            if empty_channels:
+                await self.pubsub.unsubscribe(*empty_channels)
+
+    async def _listen(self):
+        while self.subscribers:
+            try:
+                message = await self.pubsub.get_message(timeout=1.0)
+            except Exception as e:
+                logger.error(f"Error reading availability channel: {str(e)}")
+                await asyncio.sleep(1)
+                continue
+            if message is None or message['type'] != 'message':
+                continue
+
+            channel = message['channel'].decode()
+            data = json.loads(message['data'])
+            for subscriber in self.subscribers.get(channel, ()):
+                subscriber.push(data)
+
+
+hub = AvailabilityHub()
+
+
+@sync_to_async
+def _authenticate(token):
+    from users.authentication import CachedTokenAuthentication
+    try:
+        user, _ = CachedTokenAuthentication().authenticate_credentials(token)
+    except exceptions.AuthenticationFailed:
+        return None
+    return user
+
+
+@sync_to_async
+def _snapshot(dates):
+    from .models import ExamSlot
+    return [
+        {
+            'date': slot.date.isoformat(), 'venue': slot.venue_id, 'exam_type': slot.exam_type,
+            'hour': slot.hour, 'minute': slot.minute, 'remaining_capacity': slot.remaining_capacity
+        }
+        for slot in ExamSlot.objects.with_usage().filter(date__in=dates).order_by('date', 'venue_id', 'exam_type', 'slot_index')
+    ]
+
+
+def _get_token(scope, query):
+    # EventSource는 헤더를 지정할 수 없으므로 token 쿼리 파라미터도 허용합니다.
+    for name, value in scope.get('headers', []):
+        if name == b'authorization':
+            parts = value.decode().split()
+            if len(parts) == 2 and parts[0] == 'Token':
+                return parts[1]
+    return query.get('token', [None])[0]
+
+
+def _parse_dates(query):
+    values = [value for raw in query.get('date', []) for value in raw.split(',') if value]
+    if not values or len(values) > MAX_DATES:
+        return None
+    try:
+        return sorted({datetime.strptime(value, '%Y-%m-%d').date() for value in values})
+    except ValueError:
+        return None
+
+
+async def _send_error(send, status_code, message):
+    await send({
+        'type': 'http.response.start',
+        'status': status_code,
+        'headers': [(b'content-type', b'application/json')],
+    })
+    await send({'type': 'http.response.body', 'body': json.dumps({'error': message}).encode()})
+
+
+def _event(name, data):
+    return f"event: {name}\ndata: {json.dumps(data)}\n\n".encode()
+
+
+async def availability_stream(scope, receive, send):
+    """
+    예약 가능 인원 실시간 구독 API (Server-Sent Events)
+
+    GET /examslots/available/stream/?date=2025-04-15,2025-04-16&token=<토큰>
+    - 연결 직후 해당 날짜들의 전체 시간대를 snapshot 이벤트로 보냅니다.
+    - 이후 남은 인원이 바뀔 때마다 변경된 시간대만 availability 이벤트로 보냅니다.
+    - 남은 인원은 시험장(venue)별 값입니다.
+    """
+    query = parse_qs(scope.get('query_string', b'').decode())
+
+    token = _get_token(scope, query)
+    user = await _authenticate(token) if token else None
+    if user is None:
+        await _send_error(send, 401, '자격 인증데이터(authentication credentials)가 제공되지 않았습니다.')
+        return
+
+    dates = _parse_dates(query)
+    if dates is None:
+        await _send_error(send, 400, f'날짜를 1개 이상 {MAX_DATES}개 이하로 입력해주세요. (YYYY-MM-DD)')
+        return
+
+    subscriber = Subscriber(dates)
+    # 구독을 먼저 시작한 뒤 snapshot을 조회해야 그 사이의 변경을 놓치지 않습니다.
+    await hub.subscribe(subscriber)
+
+    disconnected = asyncio.Event()
+
+    async def watch_disconnect():
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                disconnected.set()
+                subscriber.event.set()
+                return
+
+    watcher = asyncio.create_task(watch_disconnect())
+    try:
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [
+                (b'content-type', b'text/event-stream'),
+                (b'cache-control', b'no-cache'),
+                (b'x-accel-buffering', b'no'),
+            ],
+        })
+        await send({'type': 'http.response.body', 'body': _event('snapshot', await _snapshot(dates)), 'more_body': True})
+
+        while not disconnected.is_set():
+            slots = await subscriber.drain(HEARTBEAT_SECONDS)
+            if disconnected.is_set():
+                break
+            body = _event('availability', slots) if slots else b": heartbeat\n\n"
+            await send({'type': 'http.response.body', 'body': body, 'more_body': True})
+    finally:
+        watcher.cancel()
+        await hub.unsubscribe(subscriber)
@@ -0,0 +1,42 @@
+import time
+from django.core.management.base import BaseCommand
+from examslots.capacity import adjust_stripes, set_stripe_count
+from examslots.models import SlotCapacityStripe
+
+
+class Command(BaseCommand):
+    help = '시간대 인원 구간 수를 경합 횟수에 따라 조정하거나 직접 지정합니다. (SLOT_CAPACITY BACKEND=striped)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--slot', type=int, help='구간 수를 직접 지정할 시간대 ID')
+        parser.add_argument('--stripes', type=int, help='--slot과 함께 사용, 지정할 구간 수 (0이면 구간 없앰)')
+        parser.add_argument('--reset', action='store_true', help='모든 시간대의 구간을 없애고 인원을 current_count로 되돌림')
+        parser.add_argument('--interval', type=float, help='지정하면 종료할 때까지 interval초마다 자동 조정')
+
+    def handle(self, *args, **options):
+        if options['reset']:
+            slot_ids = list(SlotCapacityStripe.objects.values_list('slot_id', flat=True).distinct())
+            for slot_id in slot_ids:
+                set_stripe_count(slot_id, 0)
+            self.stdout.write(self.style.SUCCESS(f"시간대 {len(slot_ids)}개의 구간을 없앴습니다."))
+            return
+
+        if options['slot'] is not None:
+            set_stripe_count(options['slot'], options['stripes'] or 0)
+            self.stdout.write(self.style.SUCCESS(f"시간대 {options['slot']}의 구간 수를 {options['stripes'] or 0}개로 바꿨습니다."))
+            return
+
+        if options['interval'] is None:
+            changes = adjust_stripes()
+            for slot_id, stripes in changes.items():
+                self.stdout.write(f"시간대 {slot_id}: 구간 {stripes}개")
+            self.stdout.write(self.style.SUCCESS(f"시간대 {len(changes)}개의 구간 수를 조정했습니다."))
+            return
+
+        self.stdout.write(self.style.SUCCESS("구간 수 자동 조정을 시작했습니다."))
+        try:
+            while True:
+                adjust_stripes()
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,23 @@
+import time
+from django.core.management.base import BaseCommand
+from examslots.capacity import compact_ledger
+
+
+class Command(BaseCommand):
+    help = '시간대 인원 변경분 원장을 시간대의 current_count에 합칩니다. (SLOT_CAPACITY BACKEND=ledger)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, help='지정하면 종료할 때까지 interval초마다 반복')
+
+    def handle(self, *args, **options):
+        if options['interval'] is None:
+            self.stdout.write(self.style.SUCCESS(f"시간대 {compact_ledger()}개의 인원을 갱신했습니다."))
+            return
+
+        self.stdout.write(self.style.SUCCESS("원장 합치기를 시작했습니다."))
+        try:
+            while True:
+                compact_ledger()
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,23 @@
+import time
+from django.core.management.base import BaseCommand
+from examslots.models import DailySummary
+
+
+class Command(BaseCommand):
+    help = '예약으로 인원이 바뀐 날짜의 달력 요약을 다시 계산합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, help='지정하면 종료할 때까지 interval초마다 반복')
+
+    def handle(self, *args, **options):
+        if options['interval'] is None:
+            self.stdout.write(self.style.SUCCESS(f"날짜 {DailySummary.refresh_dirty()}개의 요약을 갱신했습니다."))
+            return
+
+        self.stdout.write(self.style.SUCCESS("달력 요약 갱신을 시작했습니다."))
+        try:
+            while True:
+                DailySummary.refresh_dirty()
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
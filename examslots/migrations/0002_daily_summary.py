@@ -0,0 +1,52 @@
+# Generated by Django 5.2 on 2026-10-19 18:21
+
+from django.db import migrations, models
+
+
+def backfill_summaries(apps, schema_editor):
+    ExamSlot = apps.get_model('examslots', 'ExamSlot')
+    DailySummary = apps.get_model('examslots', 'DailySummary')
+
+    slots_by_date = {}
+    for slot in ExamSlot.objects.values('date', 'hour', 'max_capacity', 'current_count').iterator():
+        slots_by_date.setdefault(slot['date'], []).append(slot)
+
+    summaries = []
+    for date, slots in slots_by_date.items():
+        remaining = [(slot['max_capacity'] - slot['current_count'], slot['hour']) for slot in slots]
+        min_remaining, min_remaining_hour = min(remaining)
+        summaries.append(DailySummary(
+            date=date,
+            total_remaining=sum(value for value, _ in remaining),
+            min_remaining=min_remaining,
+            min_remaining_hour=min_remaining_hour,
+            full_hours=sum(1 for value, _ in remaining if value <= 0),
+        ))
+    DailySummary.objects.bulk_create(summaries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('examslots', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('total_remaining', models.IntegerField(default=0)),
+                ('min_remaining', models.IntegerField(default=0)),
+                ('min_remaining_hour', models.IntegerField(null=True)),
+                ('full_hours', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'exam_slot_daily_summaries',
+                'ordering': ['date'],
+            },
+        ),
+        migrations.RunPython(backfill_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2 on 2026-10-19 18:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('examslots', '0002_daily_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlotCapacityDelta',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('delta', models.IntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('slot', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='capacity_deltas', to='examslots.examslot')),
+            ],
+            options={
+                'db_table': 'exam_slot_capacity_ledger',
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2 on 2026-10-19 19:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('examslots', '0003_capacity_ledger'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlotCapacityStripe',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('index', models.IntegerField()),
+                ('max_capacity', models.IntegerField(default=0)),
+                ('current_count', models.IntegerField(default=0)),
+                ('slot', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='capacity_stripes', to='examslots.examslot')),
+            ],
+            options={
+                'db_table': 'exam_slot_capacity_stripes',
+                'unique_together': {('slot', 'index')},
+            },
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2 on 2026-10-19 18:52
+
+import django.core.validators
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('examslots', '0004_capacity_stripes'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='examslot',
+            options={'ordering': ['date', 'hour', 'minute']},
+        ),
+        migrations.AlterUniqueTogether(
+            name='examslot',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='examslot',
+            name='exam_type',
+            field=models.CharField(db_default='default', default='default', max_length=30),
+        ),
+        migrations.AddField(
+            model_name='examslot',
+            name='minute',
+            field=models.IntegerField(db_default=0, default=0, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(59)]),
+        ),
+        migrations.AddField(
+            model_name='examslot',
+            name='slot_minutes',
+            field=models.IntegerField(db_default=60, default=60, help_text='시간대 단위(분)'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='examslot',
+            unique_together={('exam_type', 'date', 'hour', 'minute')},
+        ),
+        migrations.AddField(
+            model_name='examslot',
+            name='slot_index',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('hour'), '*', models.Value(60)), '+', models.F('minute')), '/', models.F('slot_minutes')), output_field=models.IntegerField()),
+        ),
+        migrations.AddIndex(
+            model_name='examslot',
+            index=models.Index(fields=['exam_type', 'date', 'slot_index'], name='exam_slots_type_index_idx'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2 on 2026-10-19 19:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+DEFAULT_VENUE_ID = 1
+
+
+def create_default_venue(apps, schema_editor):
+    # 기존 시간대와 예약은 모두 기본 시험장(id=1)에 속합니다.
+    Venue = apps.get_model('examslots', 'Venue')
+    Venue.objects.get_or_create(id=DEFAULT_VENUE_ID, defaults={'code': 'default', 'name': '기본 시험장'})
+    if schema_editor.connection.vendor == 'postgresql':
+        # id를 직접 지정했으므로 다음 시험장이 같은 id를 받지 않도록 시퀀스를 맞춥니다.
+        schema_editor.execute(
+            "SELECT setval(pg_get_serial_sequence('exam_venues', 'id'), (SELECT MAX(id) FROM exam_venues))"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('examslots', '0005_slot_granularity'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Venue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(max_length=30, unique=True)),
+                ('name', models.CharField(max_length=100)),
+                ('slot_capacity', models.IntegerField(blank=True, help_text='시간대 최대 인원 (비어 있으면 시험 종류의 MAX_CAPACITY)', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'exam_venues',
+                'ordering': ['id'],
+            },
+        ),
+        migrations.RunPython(create_default_venue, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='examslot',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='examslot',
+            name='venue',
+            field=models.ForeignKey(db_default=1, default=1, on_delete=django.db.models.deletion.PROTECT, related_name='slots', to='examslots.venue'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='examslot',
+            unique_together={('venue', 'exam_type', 'date', 'hour', 'minute')},
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.2 on 2026-10-19 19:35
+
+from django.db import migrations, models
+
+
+def rebuild_summaries(apps, schema_editor):
+    # 기존 요약은 시험 종류를 합산한 값이므로 시험 종류별로 다시 계산합니다.
+    ExamSlot = apps.get_model('examslots', 'ExamSlot')
+    DailySummary = apps.get_model('examslots', 'DailySummary')
+    SlotCapacityDelta = apps.get_model('examslots', 'SlotCapacityDelta')
+    SlotCapacityStripe = apps.get_model('examslots', 'SlotCapacityStripe')
+
+    pending = dict(SlotCapacityDelta.objects.values('slot_id').annotate(total=models.Sum('delta')).values_list('slot_id', 'total'))
+    striped = dict(SlotCapacityStripe.objects.values('slot_id').annotate(total=models.Sum('current_count')).values_list('slot_id', 'total'))
+
+    # (시험 종류, 날짜) -> {(시, 분): [최대 인원 합, 사용 인원 합]}
+    slots_by_key = {}
+    for slot in ExamSlot.objects.values('id', 'exam_type', 'date', 'hour', 'minute', 'max_capacity', 'current_count').iterator():
+        used = slot['current_count'] + pending.get(slot['id'], 0) + striped.get(slot['id'], 0)
+        totals = slots_by_key.setdefault((slot['exam_type'], slot['date']), {}).setdefault((slot['hour'], slot['minute']), [0, 0])
+        totals[0] += slot['max_capacity']
+        totals[1] += used
+
+    summaries = []
+    for (exam_type, date), slots in slots_by_key.items():
+        remaining = [(capacity - used, hour) for (hour, _), (capacity, used) in slots.items()]
+        min_remaining, min_remaining_hour = min(remaining)
+        summaries.append(DailySummary(
+            exam_type=exam_type,
+            date=date,
+            total_remaining=sum(value for value, _ in remaining),
+            min_remaining=min_remaining,
+            min_remaining_hour=min_remaining_hour,
+            full_hours=sum(1 for value, _ in remaining if value <= 0),
+        ))
+    DailySummary.objects.all().delete()
+    DailySummary.objects.bulk_create(summaries, batch_size=1000)
+
+
+def drop_other_exam_types(apps, schema_editor):
+    # 날짜만으로 unique하게 되돌릴 수 있도록 기본 시험 종류의 요약만 남깁니다.
+    DailySummary = apps.get_model('examslots', 'DailySummary')
+    DailySummary.objects.exclude(exam_type='default').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('examslots', '0006_venues'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailysummary',
+            name='exam_type',
+            field=models.CharField(default='default', max_length=30),
+        ),
+        migrations.AlterField(
+            model_name='dailysummary',
+            name='date',
+            field=models.DateField(),
+        ),
+        migrations.AlterUniqueTogether(
+            name='dailysummary',
+            unique_together={('exam_type', 'date')},
+        ),
+        migrations.RunPython(rebuild_summaries, drop_other_exam_types),
+    ]
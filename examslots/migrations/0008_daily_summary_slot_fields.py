@@ -0,0 +1,77 @@
+# Generated by Django 5.2 on 2026-10-19 21:10
+
+import datetime
+from django.db import migrations, models
+
+
+def rebuild_summaries(apps, schema_editor):
+    # 기존 요약은 가장 적게 남은 시간대를 시(hour)로만 저장했으므로 시간대 단위로 다시 계산합니다.
+    ExamSlot = apps.get_model('examslots', 'ExamSlot')
+    DailySummary = apps.get_model('examslots', 'DailySummary')
+    SlotCapacityDelta = apps.get_model('examslots', 'SlotCapacityDelta')
+    SlotCapacityStripe = apps.get_model('examslots', 'SlotCapacityStripe')
+
+    pending = dict(SlotCapacityDelta.objects.values('slot_id').annotate(total=models.Sum('delta')).values_list('slot_id', 'total'))
+    striped = dict(SlotCapacityStripe.objects.values('slot_id').annotate(total=models.Sum('current_count')).values_list('slot_id', 'total'))
+
+    # (시험 종류, 날짜) -> {시작 시각: [최대 인원 합, 사용 인원 합]}
+    slots_by_key = {}
+    for slot in ExamSlot.objects.values('id', 'exam_type', 'date', 'hour', 'minute', 'max_capacity', 'current_count').iterator():
+        used = slot['current_count'] + pending.get(slot['id'], 0) + striped.get(slot['id'], 0)
+        start = datetime.time(slot['hour'], slot['minute'])
+        totals = slots_by_key.setdefault((slot['exam_type'], slot['date']), {}).setdefault(start, [0, 0])
+        totals[0] += slot['max_capacity']
+        totals[1] += used
+
+    summaries = []
+    for (exam_type, date), slots in slots_by_key.items():
+        remaining = [(capacity - used, start) for start, (capacity, used) in slots.items()]
+        min_remaining, min_remaining_time = min(remaining)
+        summaries.append(DailySummary(
+            exam_type=exam_type,
+            date=date,
+            total_remaining=sum(value for value, _ in remaining),
+            min_remaining=min_remaining,
+            min_remaining_time=min_remaining_time,
+            full_slots=sum(1 for value, _ in remaining if value <= 0),
+        ))
+    DailySummary.objects.all().delete()
+    DailySummary.objects.bulk_create(summaries, batch_size=1000)
+
+
+def restore_min_remaining_hour(apps, schema_editor):
+    DailySummary = apps.get_model('examslots', 'DailySummary')
+    summaries = list(DailySummary.objects.exclude(min_remaining_time=None))
+    for summary in summaries:
+        summary.min_remaining_hour = summary.min_remaining_time.hour
+    DailySummary.objects.bulk_update(summaries, ['min_remaining_hour'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('examslots', '0007_daily_summary_exam_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailysummary',
+            name='min_remaining_time',
+            field=models.TimeField(help_text='남은 인원이 가장 적은 시간대의 시작 시각', null=True),
+        ),
+        migrations.RenameField(
+            model_name='dailysummary',
+            old_name='full_hours',
+            new_name='full_slots',
+        ),
+        migrations.AlterField(
+            model_name='dailysummary',
+            name='full_slots',
+            field=models.IntegerField(default=0, help_text='남은 인원이 없는 시간대 수 (시험 종류의 시간대 단위)'),
+        ),
+        migrations.RunPython(rebuild_summaries, restore_min_remaining_hour),
+        migrations.RemoveField(
+            model_name='dailysummary',
+            name='min_remaining_hour',
+        ),
+    ]
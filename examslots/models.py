@@ -1,115 +1,505 @@
 from django.db import models
-from django.db import transaction
+from django.db import connection, transaction
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator, MaxValueValidator
-from datetime import timedelta
+from django.db.models.functions import Cast, Floor, Least
+from django.utils import timezone
+from datetime import datetime, time, timedelta
+import logging
+from common.distributed_lock import redis_client
+from common.versioning import bump_versions, slots_version_key, CALENDAR_VERSION_KEY
+from .live import publish_slot_changes
+from . import capacity, granularity
+
+
+logger = logging.getLogger(__name__)
+
+# 요약을 다시 계산해야 하는 날짜(YYYY-MM-DD) 집합
+SUMMARY_DIRTY_KEY = "examslots:summary:dirty"
+
+DEFAULT_VENUE_ID = 1
+# 시간대 최대 인원의 상한 (PostgreSQL integer 컬럼 최댓값)
+MAX_SLOT_CAPACITY = 2147483647
+
+
+class Venue(models.Model):
+    """
+    시험장
+
+    시간대 행은 시험장마다 따로 있으므로 시험장이 다른 예약은 같은 행을 잠그지 않습니다.
+    기본 시험장(id=1)은 마이그레이션에서 생성됩니다.
+    """
+    code = models.CharField(max_length=30, unique=True)
+    name = models.CharField(max_length=100)
+    slot_capacity = models.IntegerField(null=True, blank=True, help_text="시간대 최대 인원 (비어 있으면 시험 종류의 MAX_CAPACITY)")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'exam_venues'
+        app_label = 'examslots'
+        ordering = ['id']
+
+    def __str__(self):
+        return f"Venue: {self.code}"
+
+
+class ExamSlotQuerySet(models.QuerySet):
+    def with_usage(self):
+        """사용 인원(used_count)을 함께 조회합니다. (SLOT_CAPACITY['BACKEND']에 따라 원장 변경분 포함)"""
+        return capacity.get_backend().annotate(self)
+
+    def available(self):
+        """남은 자리가 있는 시간대만 조회합니다."""
+        return self.with_usage().filter(used_count__lt=models.F('max_capacity'))
+
+    def in_range(self, start_time, end_time, exam_type=None):
+        """
+        start_time 이상 end_time 미만에 시작하는 시간대를 조회합니다. (여러 날에 걸친 범위도 한 번에 조회)
+        시험 종류별 시간대 단위로 경계의 시간대 번호(slot_index)를 계산하며, exam_type을 생략하면 모든 종류를 조회합니다.
+        """
+        return self.filter(range_condition(start_time, end_time, exam_type))
+
+
+def range_condition(start_time, end_time, exam_type=None):
+    """in_range의 조건(Q)입니다. 여러 범위를 OR로 묶어 한 번에 조회할 때 사용합니다."""
+    exam_types = [exam_type] if exam_type else list(granularity.get_exam_types())
+    start_date, end_date = start_time.date(), end_time.date()
+    condition = models.Q(pk__in=[])
+    for name in exam_types:
+        minutes = granularity.slot_minutes(name)
+        start_index = granularity.first_index(start_time, minutes)
+        end_index = granularity.first_index(end_time, minutes)
+        if start_date == end_date:
+            condition |= models.Q(exam_type=name, date=start_date, slot_index__gte=start_index, slot_index__lt=end_index)
+        else:
+            condition |= models.Q(exam_type=name) & (
+                models.Q(date=start_date, slot_index__gte=start_index)
+                | models.Q(date__gt=start_date, date__lt=end_date)
+                | models.Q(date=end_date, slot_index__lt=end_index)
+            )
+    return condition
+
+
+def time_of_day_condition(start_time, end_time=None, exam_type=None):
+    """
+    날짜와 관계없이 하루 중 start_time 이상 end_time 미만에 시작하는 시간대의 조건(Q)입니다. (end_time을 생략하면 하루 끝까지)
+    range_condition과 같이 시험 종류별 시간대 단위로 경계의 시간대 번호(slot_index)를 계산합니다.
+    """
+    exam_types = [exam_type] if exam_type else list(granularity.get_exam_types())
+    condition = models.Q(pk__in=[])
+    for name in exam_types:
+        minutes = granularity.slot_minutes(name)
+        index_condition = models.Q(exam_type=name, slot_index__gte=granularity.first_index(start_time, minutes))
+        if end_time is not None:
+            index_condition &= models.Q(slot_index__lt=granularity.first_index(end_time, minutes))
+        condition |= index_condition
+    return condition
+
 
 class ExamSlot(models.Model):
+    """
+    시험 시간대
+
+    시험 종류(exam_type)마다 시간대 단위(slot_minutes, EXAM_TYPES 설정)가 다르며,
+    slot_index는 하루 안에서 몇 번째 시간대인지를 나타냅니다. (hour, minute에서 DB가 계산)
+    같은 시간대라도 시험장(venue)마다 행과 인원이 따로 있습니다.
+    """
+    venue = models.ForeignKey(Venue, on_delete=models.PROTECT, related_name='slots',
+                              default=DEFAULT_VENUE_ID, db_default=DEFAULT_VENUE_ID)
+    exam_type = models.CharField(max_length=30, default=granularity.DEFAULT_EXAM_TYPE, db_default=granularity.DEFAULT_EXAM_TYPE)
     date = models.DateField()
     hour = models.IntegerField(validators=[MinValueValidator(0), MaxValueValidator(23)])
+    minute = models.IntegerField(default=0, db_default=0, validators=[MinValueValidator(0), MaxValueValidator(59)])
+    slot_minutes = models.IntegerField(default=60, db_default=60, help_text="시간대 단위(분)")
+    slot_index = models.GeneratedField(
+        expression=(models.F('hour') * 60 + models.F('minute')) / models.F('slot_minutes'),
+        output_field=models.IntegerField(),
+        db_persist=True
+    )
     max_capacity = models.IntegerField(default=50000)
     current_count = models.IntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ExamSlotQuerySet.as_manager()
+
     class Meta:
         db_table = 'exam_slots'
         app_label = 'examslots'
-        ordering = ['date', 'hour']
-        unique_together = ('date', 'hour')
+        ordering = ['date', 'hour', 'minute']
+        # 시험장별 시간대 조회와 잠금은 시험장으로 시작하는 unique 인덱스를 사용합니다.
+        unique_together = ('venue', 'exam_type', 'date', 'hour', 'minute')
+        indexes = [
+            # 시험 종류별 시간대 번호 범위 조회 (in_range, 시험장 합산)
+            models.Index(fields=['exam_type', 'date', 'slot_index'], name='exam_slots_type_index_idx'),
+        ]
 
     def __str__(self):
-        return f"Exam Slot: {self.date} - {self.hour}"
+        return f"Exam Slot: {self.venue_id} {self.exam_type} {self.date} - {self.time_label}"
 
     def clean(self):
         if self.hour < 0 or self.hour > 23:
             raise ValidationError("시간은 0에서 23 사이여야 합니다.")
+        if self.minute < 0 or self.minute > 59:
+            raise ValidationError("분은 0에서 59 사이여야 합니다.")
+        if (self.hour * 60 + self.minute) % self.slot_minutes:
+            raise ValidationError(f"시작 시각이 시간대 단위({self.slot_minutes}분)에 맞지 않습니다.")
 
     def save(self, *args, **kwargs):
         self.clean()
         super().save(*args, **kwargs)
 
+    @property
+    def remaining_capacity(self):
+        # with_usage()로 조회하지 않은 경우에는 current_count만 반영됩니다.
+        return self.max_capacity - getattr(self, 'used_count', self.current_count)
+
+    @property
+    def start_time(self):
+        return granularity.slot_start(self.date, self.slot_index, self.slot_minutes)
+
+    @property
+    def time_label(self):
+        return f"{self.hour}시" if self.minute == 0 else f"{self.hour}시 {self.minute}분"
+
     @classmethod
-    def check_and_get_available_slots(cls, start_time, end_time, count):
-        available_slots = cls.get_available_slots(start_time, end_time)
-        
-        if not available_slots:
+    def check_and_get_available_slots(cls, start_time, end_time, count, exam_type=granularity.DEFAULT_EXAM_TYPE, venue=None):
+        """
+        count명을 수용할 수 있는 시험장 하나를 골라 그 시험장의 시간대 목록을 반환합니다.
+        venue(시험장 id)를 지정하면 그 시험장만 확인합니다.
+        """
+        slots = cls.objects.with_usage().in_range(start_time, end_time, exam_type)
+        if venue is not None:
+            slots = slots.filter(venue_id=venue)
+        return cls.choose_venue(list(slots.order_by('venue_id', 'date', 'slot_index')), count)
+
+    @staticmethod
+    def choose_venue(slots, count):
+        """
+        여러 시험장의 시간대 목록에서 범위의 시간대를 모두 가진 시험장 중
+        가장 적게 남은 시간대의 인원이 가장 많은 시험장을 고르고, 그 시험장의 시간대 목록을 반환합니다.
+        count명을 수용할 수 있는 시험장이 없으면 ValidationError를 발생시킵니다.
+        """
+        slots_by_venue = {}
+        for slot in slots:
+            slots_by_venue.setdefault(slot.venue_id, []).append(slot)
+        if not any(slot.remaining_capacity > 0 for slot in slots):
             raise ValidationError("해당 시간대에 예약 가능한 자리가 없습니다.")
-            
-        for slot in available_slots:
-            available_count = slot.max_capacity - slot.current_count
-            if available_count < count:
-                raise ValidationError(f"{slot.date} {slot.hour}시에 {count}명을 수용할 수 없습니다. (가용 인원: {available_count}명)")
-                
-        return available_slots
+
+        covered = max(len(venue_slots) for venue_slots in slots_by_venue.values())
+        candidates = sorted(
+            (venue_slots for venue_slots in slots_by_venue.values() if len(venue_slots) == covered),
+            key=lambda venue_slots: (-min(slot.remaining_capacity for slot in venue_slots), venue_slots[0].venue_id)
+        )
+        best = candidates[0]
+        limiting = min(best, key=lambda slot: slot.remaining_capacity)
+        if limiting.remaining_capacity < count:
+            raise ValidationError(f"{limiting.date} {limiting.time_label}에 {count}명을 수용할 수 없습니다. (가용 인원: {limiting.remaining_capacity}명)")
+
+        return sorted(best, key=lambda slot: (slot.date, slot.slot_index))
+
+    @classmethod
+    def get_available_slots(cls, start_time, end_time, exam_type=granularity.DEFAULT_EXAM_TYPE, venue=None):
+        # 여러 날에 걸친 범위도 시간대 번호 범위로 한 번에 조회합니다.
+        slots = cls.objects.available().in_range(start_time, end_time, exam_type)
+        if venue is not None:
+            slots = slots.filter(venue_id=venue)
+        return list(slots.order_by('date', 'slot_index', 'venue_id'))
 
     @classmethod
-    def get_available_slots(cls, start_time, end_time):
-        if start_time.date() == end_time.date():
-            return cls.objects.filter(
-                date=start_time.date(),
-                hour__gte=start_time.hour,
-                hour__lt=end_time.hour,
-                current_count__lt=models.F('max_capacity')
-            ).order_by('hour')
-        
+    def generate_slots(cls, start_time, end_time, venues=None):
+        """
+        모든 시험장과 시험 종류에 대해 start_time 이상 end_time 미만에 시작하는 시간대 중 없는 것을 추가하고,
+        시간대가 추가된 날짜 집합을 반환합니다. venues를 지정하면 그 시험장들만 생성합니다.
+        시험장에 slot_capacity가 있으면 시험 종류의 MAX_CAPACITY 대신 사용합니다.
+        PostgreSQL에서는 generate_series로 한 번의 INSERT ... SELECT 문으로 생성합니다.
+        """
+        exam_types = granularity.get_exam_types()
+        if venues is None:
+            venues = list(Venue.objects.all())
+        now = timezone.now()
+        # 종류마다 단위가 다르므로 첫 시간대 시작 시각을 각각 맞춥니다.
+        rows = []
+        for venue in venues:
+            for name, config in exam_types.items():
+                minutes = config['SLOT_MINUTES']
+                first = granularity.slot_start(start_time.date(), granularity.first_index(start_time, minutes), minutes)
+                max_capacity = config['MAX_CAPACITY'] if venue.slot_capacity is None else venue.slot_capacity
+                if first < end_time:
+                    rows.append((venue.id, name, minutes, max_capacity, first))
+        if not rows:
+            return set()
+
+        if connection.vendor == 'postgresql':
+            table = connection.ops.quote_name(cls._meta.db_table)
+            values_sql = ', '.join(['(%s::integer, %s::varchar, %s::integer, %s::integer, %s::timestamp)'] * len(rows))
+            with connection.cursor() as cursor:
+                cursor.execute(f"""
+                    INSERT INTO {table} (venue_id, exam_type, slot_minutes, date, hour, minute, max_capacity, current_count, created_at, updated_at)
+                    SELECT t.venue_id, t.exam_type, t.slot_minutes, s.start::date,
+                           EXTRACT(HOUR FROM s.start)::integer, EXTRACT(MINUTE FROM s.start)::integer,
+                           t.max_capacity, 0, %s, %s
+                    FROM (VALUES {values_sql}) AS t(venue_id, exam_type, slot_minutes, max_capacity, first_start)
+                    CROSS JOIN LATERAL generate_series(
+                        t.first_start, %s::timestamp - interval '1 microsecond', make_interval(mins => t.slot_minutes)
+                    ) AS s(start)
+                    ON CONFLICT (venue_id, exam_type, date, hour, minute) DO NOTHING
+                    RETURNING date
+                """, [now, now, *[value for row in rows for value in row], end_time])
+                return {row[0] for row in cursor.fetchall()}
+
         slots = []
-        current_date = start_time.date()
-        end_date = end_time.date()
-        
-        while current_date <= end_date:
-            if current_date == start_time.date():
-                slots.extend(cls.objects.filter(
-                    date=current_date,
-                    hour__gte=start_time.hour,
-                    current_count__lt=models.F('max_capacity')
-                ).order_by('hour'))
-            elif current_date == end_date:
-                slots.extend(cls.objects.filter(
-                    date=current_date,
-                    hour__lt=end_time.hour,
-                    current_count__lt=models.F('max_capacity')
-                ).order_by('hour'))
-            else:
-                slots.extend(cls.objects.filter(
-                    date=current_date,
-                    current_count__lt=models.F('max_capacity')
-                ).order_by('hour'))
-            
-            current_date += timedelta(days=1)
-        
-        return slots
+        for venue_id, name, minutes, max_capacity, first in rows:
+            current = first
+            while current < end_time:
+                slots.append(cls(
+                    venue_id=venue_id, exam_type=name, slot_minutes=minutes, date=current.date(),
+                    hour=current.hour, minute=current.minute, max_capacity=max_capacity
+                ))
+                current += timedelta(minutes=minutes)
+        cls.objects.bulk_create(slots, batch_size=2000, ignore_conflicts=True)
+        return {slot.date for slot in slots}
     
     @classmethod
     def update_slots(cls, slots, count):
-        updated_slots = []
+        """
+        시간대들의 예약 인원을 count만큼 늘리거나 줄입니다. (방식은 examslots.capacity 참고)
+        하나라도 최대 인원을 넘으면 아무것도 바꾸지 않고 ValidationError를 발생시킵니다.
+        """
+        slot_ids = sorted({slot.id for slot in slots})
+        if not slot_ids:
+            return True
 
         try:
-            for slot in slots:
-                slot.refresh_from_db() 
-
-                if count > 0:
-                    if slot.current_count + count > slot.max_capacity:
-                        raise ValidationError(f"슬롯 {slot.id}의 최대 인원 수를 초과할 수 없습니다.")
-                
-                slot.current_count += count
-                slot.save(update_fields=['current_count'])
-                
-                updated_slots.append(slot)
+            with transaction.atomic():
+                capacity.get_backend().apply(slot_ids, count)
+        except ValidationError:
+            raise
+        except Exception:
+            raise ValidationError("예약 처리 중 오류가 발생했습니다.")
+
+        cls._capacity_changed(slot_ids)
+        return True
+
+    @classmethod
+    def release_slots(cls, totals):
+        """
+        시간대별로 다른 인원을 한 번에 해제합니다. totals는 {시간대 id: 해제할 인원}입니다.
+        (여러 예약을 한꺼번에 취소할 때 사용)
+        """
+        totals = {slot_id: amount for slot_id, amount in totals.items() if amount}
+        if not totals:
             return True
-                
-        except ValidationError as e:
-            if updated_slots:
-                for slot in updated_slots:
-                    slot.refresh_from_db()
-                    slot.current_count -= count
-                    slot.save(update_fields=['current_count'])
-            raise ValidationError(str(e))
-            
-        except Exception as e:
-            if updated_slots:
-                for slot in updated_slots:
-                        slot.refresh_from_db()
-                        slot.current_count -= count
-                        slot.save(update_fields=['current_count'])
-            raise ValidationError("예약 처리 중 오류가 발생했습니다.")
\ No newline at end of file
+
+        try:
+            with transaction.atomic():
+                capacity.get_backend().release(totals)
+        except Exception:
+            raise ValidationError("예약 처리 중 오류가 발생했습니다.")
+
+        cls._capacity_changed(sorted(totals))
+        return True
+
+    @classmethod
+    def apply_slot_changes(cls, totals):
+        """
+        시간대별로 다른 인원 변경분({시간대 id: +/- 인원})을 한 번에 반영합니다. (여러 예약을 한꺼번에 처리할 때 사용)
+        최대 인원은 검사하지 않으므로, 호출하는 트랜잭션에서 capacity.get_backend().lock()으로 잠근 뒤 확인해야 합니다.
+        """
+        totals = {slot_id: amount for slot_id, amount in totals.items() if amount}
+        if not totals:
+            return True
+
+        capacity.get_backend().apply_each(totals)
+        cls._capacity_changed(sorted(totals))
+        return True
+
+    @classmethod
+    def adjust_capacity(cls, slots, max_capacity=None, scale=None):
+        """
+        시간대들의 최대 인원을 max_capacity로 바꾸거나 scale배(소수점 버림, 최대 MAX_SLOT_CAPACITY)로 조정합니다.
+        사용 인원 검사와 변경은 하나의 UPDATE 문으로 실행하며, 사용 인원보다 작아지는 시간대는 바꾸지 않습니다.
+        (변경한 시간대 수, 바꾸지 못한 시간대 목록)을 반환합니다.
+        """
+        if max_capacity is not None:
+            requested = models.Value(max_capacity)
+        else:
+            # 배율을 곱한 값이 컬럼 범위를 넘지 않도록 상한으로 자릅니다.
+            requested = Cast(Least(Floor(models.ExpressionWrapper(
+                models.F('max_capacity') * models.Value(scale), output_field=models.FloatField()
+            )), models.Value(float(MAX_SLOT_CAPACITY))), models.IntegerField())
+
+        backend = capacity.get_backend()
+        with transaction.atomic():
+            slot_ids = list(slots.order_by('id').values_list('id', flat=True))
+            # 변경 중에 예약이 사용 인원을 늘리지 못하도록 인원 관리 방식의 잠금을 먼저 잡습니다.
+            backend.lock(slot_ids)
+            candidates = backend.annotate(cls.objects.filter(id__in=slot_ids)).annotate(requested_capacity=requested)
+
+            rejected = list(candidates.filter(used_count__gt=models.F('requested_capacity')).order_by('date', 'hour', 'venue_id').values(
+                'id', 'venue_id', 'date', 'hour', 'max_capacity', 'used_count', 'requested_capacity'
+            ))
+            updated = cls.objects.filter(
+                id__in=models.Subquery(candidates.filter(used_count__lte=models.F('requested_capacity')).values('id'))
+            ).update(max_capacity=requested, updated_at=timezone.now())
+
+            rejected_ids = {slot['id'] for slot in rejected}
+            updated_ids = [slot_id for slot_id in slot_ids if slot_id not in rejected_ids]
+            capacity.rescale_stripes(updated_ids)
+            cls._capacity_changed(updated_ids)
+
+        return updated, rejected
+
+    @classmethod
+    def _capacity_changed(cls, slot_ids):
+        # 날짜별 요약, 조회 버전, 실시간 구독을 갱신합니다.
+        # 요약은 날짜마다 한 행이므로 예약 요청에서는 갱신 대상 날짜만 표시하고, 주기 작업이 모아서 다시 계산합니다.
+        updated_slots = list(cls.objects.with_usage().filter(id__in=slot_ids))
+        DailySummary.mark_dirty({slot.date for slot in updated_slots})
+        bump_versions(*{slots_version_key(slot.date) for slot in updated_slots})
+        publish_slot_changes(updated_slots)
+
+
+class DailySummary(models.Model):
+    """
+    시험 종류별 날짜별 예약 가능 인원 요약 (달력 조회용)
+    시간대 인원이 바뀐 날짜는 DAILY_SUMMARY['REFRESH_INTERVAL']초마다 모아서 다시 계산하고 (refresh_dirty),
+    시간대가 생성될 때는 해당 날짜를 바로 다시 계산합니다.
+    """
+    exam_type = models.CharField(max_length=30, default=granularity.DEFAULT_EXAM_TYPE)
+    date = models.DateField()
+    total_remaining = models.IntegerField(default=0)
+    min_remaining = models.IntegerField(default=0)
+    min_remaining_time = models.TimeField(null=True, help_text="남은 인원이 가장 적은 시간대의 시작 시각")
+    full_slots = models.IntegerField(default=0, help_text="남은 인원이 없는 시간대 수 (시험 종류의 시간대 단위)")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'exam_slot_daily_summaries'
+        app_label = 'examslots'
+        ordering = ['date']
+        unique_together = ('exam_type', 'date')
+
+    def __str__(self):
+        return f"Daily Summary: {self.exam_type} {self.date}"
+
+    @classmethod
+    def build(cls, exam_type, date, slots):
+        # slots는 시험장별 인원을 시간대(시, 분)별로 합산한 값입니다.
+        remaining = [(slot['capacity'] - slot['used'], time(slot['hour'], slot['minute'])) for slot in slots]
+        min_remaining, min_remaining_time = min(remaining)
+        return cls(
+            exam_type=exam_type,
+            date=date,
+            total_remaining=sum(value for value, _ in remaining),
+            min_remaining=min_remaining,
+            min_remaining_time=min_remaining_time,
+            full_slots=sum(1 for value, _ in remaining if value <= 0),
+        )
+
+    @classmethod
+    def refresh(cls, dates):
+        """
+        주어진 날짜들의 요약을 시험 종류별로 시간대 데이터에서 다시 계산하여 저장합니다. (시험장 인원은 시간대별로 합산)
+        같은 날짜를 동시에 갱신할 때 먼저 읽은 값이 나중에 덮어쓰지 않도록, 요약 행을 잠근 뒤에 시간대를 읽습니다.
+        """
+        if not dates:
+            return
+
+        with transaction.atomic():
+            locked = list(cls.objects.select_for_update().filter(date__in=dates).order_by('exam_type', 'date').values_list(
+                'id', 'exam_type', 'date'
+            ))
+
+            slots_by_key = {}
+            for slot in ExamSlot.objects.with_usage().filter(date__in=dates).values('exam_type', 'date', 'hour', 'minute').annotate(
+                capacity=models.Sum('max_capacity'), used=models.Sum('used_count')
+            ).order_by():
+                slots_by_key.setdefault((slot['exam_type'], slot['date']), []).append(slot)
+
+            cls.objects.bulk_create(
+                [cls.build(exam_type, date, slots) for (exam_type, date), slots in slots_by_key.items()],
+                update_conflicts=True,
+                unique_fields=['exam_type', 'date'],
+                update_fields=['total_remaining', 'min_remaining', 'min_remaining_time', 'full_slots', 'updated_at']
+            )
+            # 시간대가 없어진 (시험 종류, 날짜)의 요약은 삭제
+            stale = [summary_id for summary_id, exam_type, date in locked if (exam_type, date) not in slots_by_key]
+            if stale:
+                cls.objects.filter(id__in=stale).delete()
+        bump_versions(CALENDAR_VERSION_KEY)
+
+    @classmethod
+    def mark_dirty(cls, dates):
+        """
+        현재 트랜잭션이 커밋된 뒤에 날짜들을 요약 갱신 대상으로 표시합니다. (Redis 집합에 추가)
+        예약 요청은 요약 테이블을 조회하거나 잠그지 않으며, refresh_dirty가 주기적으로 모아서 다시 계산합니다.
+        Redis에 기록하지 못하면 바로 다시 계산합니다.
+        """
+        values = {date.isoformat() for date in dates}
+        if not values:
+            return
+
+        def mark():
+            try:
+                redis_client.sadd(SUMMARY_DIRTY_KEY, *values)
+            except Exception as e:
+                logger.error(f"Error marking daily summaries dirty: {str(e)}")
+                cls.refresh(dates)
+
+        transaction.on_commit(mark)
+
+    @classmethod
+    def refresh_dirty(cls, batch_size=500):
+        """
+        갱신 대상으로 표시된 날짜를 최대 batch_size개 꺼내 한 번에 다시 계산하고, 계산한 날짜 수를 반환합니다.
+        계산 중에 커밋된 변경은 날짜를 다시 표시하므로 다음 실행에서 반영됩니다.
+        """
+        values = redis_client.spop(SUMMARY_DIRTY_KEY, batch_size)
+        if not values:
+            return 0
+
+        try:
+            cls.refresh({datetime.strptime(value.decode(), '%Y-%m-%d').date() for value in values})
+        except Exception:
+            # 실패한 날짜는 다음 실행에서 다시 계산합니다.
+            redis_client.sadd(SUMMARY_DIRTY_KEY, *values)
+            raise
+        return len(values)
+
+
+class SlotCapacityDelta(models.Model):
+    """
+    시간대 예약 인원 변경분 원장 (SLOT_CAPACITY['BACKEND']가 'ledger'인 경우 사용)
+    compact_capacity_ledger가 주기적으로 시간대의 current_count에 합친 뒤 삭제합니다.
+    """
+    slot = models.ForeignKey(ExamSlot, on_delete=models.CASCADE, related_name='capacity_deltas')
+    delta = models.IntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'exam_slot_capacity_ledger'
+        app_label = 'examslots'
+
+    def __str__(self):
+        return f"Capacity Delta: {self.slot_id} {self.delta:+d}"
+
+
+class SlotCapacityStripe(models.Model):
+    """
+    시간대 인원 구간 (SLOT_CAPACITY['BACKEND']가 'striped'인 경우 사용)
+    한 시간대의 구간들의 max_capacity 합은 시간대의 max_capacity와 같습니다.
+    """
+    slot = models.ForeignKey(ExamSlot, on_delete=models.CASCADE, related_name='capacity_stripes')
+    index = models.IntegerField()
+    max_capacity = models.IntegerField(default=0)
+    current_count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'exam_slot_capacity_stripes'
+        app_label = 'examslots'
+        unique_together = ('slot', 'index')
+
+    def __str__(self):
+        return f"Capacity Stripe: {self.slot_id} #{self.index}"
@@ -1,21 +1,100 @@
+from datetime import time
 from rest_framework import serializers
-from .models import ExamSlot
+from .models import ExamSlot, DailySummary, Venue, MAX_SLOT_CAPACITY
+from .granularity import is_exam_type
+
+# 최대 인원 배율 상한
+MAX_CAPACITY_SCALE = 100
 
 class ExamSlotSerializer(serializers.ModelSerializer):
     remaining_capacity = serializers.SerializerMethodField()
 
     class Meta:
         model = ExamSlot
-        fields = ['date', 'hour', 'remaining_capacity']
+        fields = ['date', 'hour', 'minute', 'remaining_capacity']
 
     def get_remaining_capacity(self, obj):
-        return obj.max_capacity - obj.current_count 
+        return obj.remaining_capacity
 
 class AvailableSlotSerializer(serializers.Serializer):
     date = serializers.DateField()
     hour = serializers.IntegerField()
-    remaining_capacity = serializers.IntegerField()
+    minute = serializers.IntegerField(help_text='시작 분 (시간대 단위가 1시간보다 작은 시험 종류)')
+    remaining_capacity = serializers.IntegerField(help_text='남은 인원 (시험장을 지정하지 않으면 모든 시험장의 합계)')
 
 class AvailableSlotListResponseSerializer(serializers.Serializer):
     message = serializers.CharField()
-    available_slots = AvailableSlotSerializer(many=True)
\ No newline at end of file
+    available_slots = AvailableSlotSerializer(many=True)
+
+class DailySummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DailySummary
+        fields = ['date', 'total_remaining', 'min_remaining', 'min_remaining_time', 'full_slots']
+
+class CalendarResponseSerializer(serializers.Serializer):
+    message = serializers.CharField()
+    days = DailySummarySerializer(many=True)
+
+class CapacityAdjustSerializer(serializers.Serializer):
+    start_date = serializers.DateField(help_text='대상 시작 날짜 (YYYY-MM-DD)')
+    end_date = serializers.DateField(help_text='대상 종료 날짜 (YYYY-MM-DD, 포함)')
+    start_time = serializers.TimeField(default=time(0, 0), help_text='대상 시작 시각 (HH:MM, 이 시각 이후에 시작하는 시간대 포함)')
+    end_time = serializers.TimeField(required=False, help_text='대상 종료 시각 (HH:MM, 이 시각부터 시작하는 시간대 제외), 생략 시 하루 끝까지')
+    weekdays = serializers.ListField(
+        child=serializers.IntegerField(min_value=1, max_value=7),
+        required=False,
+        allow_empty=False,
+        help_text='대상 요일 (1: 월요일 ~ 7: 일요일), 생략 시 모든 요일'
+    )
+    exam_type = serializers.CharField(required=False, help_text='대상 시험 종류, 생략 시 모든 종류')
+    venue = serializers.PrimaryKeyRelatedField(queryset=Venue.objects.all(), required=False, help_text='대상 시험장 ID, 생략 시 모든 시험장')
+    max_capacity = serializers.IntegerField(min_value=0, max_value=MAX_SLOT_CAPACITY, required=False, help_text='바꿀 최대 인원')
+    scale = serializers.FloatField(min_value=0, max_value=MAX_CAPACITY_SCALE, required=False, help_text='현재 최대 인원에 곱할 배율 (소수점 버림)')
+
+    def validate(self, data):
+        if data.get('exam_type') and not is_exam_type(data['exam_type']):
+            raise serializers.ValidationError({
+                'exam_type': '알 수 없는 시험 종류입니다.'
+            })
+
+        if (data.get('max_capacity') is None) == (data.get('scale') is None):
+            raise serializers.ValidationError({
+                'max_capacity': 'max_capacity와 scale 중 하나만 입력해주세요.'
+            })
+
+        if data['start_date'] > data['end_date']:
+            raise serializers.ValidationError({
+                'end_date': '종료 날짜는 시작 날짜와 같거나 이후여야 합니다.'
+            })
+
+        if data.get('end_time') is not None and data['start_time'] >= data['end_time']:
+            raise serializers.ValidationError({
+                'end_time': '종료 시각은 시작 시각보다 이후여야 합니다.'
+            })
+
+        return data
+
+class CapacityRejectedSlotSerializer(serializers.Serializer):
+    id = serializers.IntegerField(help_text='시간대 ID')
+    venue = serializers.IntegerField(source='venue_id', help_text='시험장 ID')
+    date = serializers.DateField()
+    hour = serializers.IntegerField()
+    max_capacity = serializers.IntegerField(help_text='현재 최대 인원')
+    used_count = serializers.IntegerField(help_text='사용 인원')
+    requested_capacity = serializers.IntegerField(help_text='요청한 최대 인원')
+
+class CapacityAdjustResponseSerializer(serializers.Serializer):
+    message = serializers.CharField()
+    updated = serializers.IntegerField(help_text='최대 인원을 바꾼 시간대 수')
+    rejected = CapacityRejectedSlotSerializer(many=True, help_text='사용 인원보다 작아져서 바꾸지 못한 시간대')
+
+
+class VenueSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Venue
+        fields = ['id', 'code', 'name', 'slot_capacity']
+        read_only_fields = ['id']
+
+class VenueListResponseSerializer(serializers.Serializer):
+    message = serializers.CharField()
+    venues = VenueSerializer(many=True)
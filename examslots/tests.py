@@ -1,3 +1,746 @@
-from django.test import TestCase
+import asyncio
+import datetime
+import json
+from unittest import mock
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from users.models import User
+from users.token_store import issue_token
+from reservation.models import Reservation
+from common.distributed_lock import redis_client
+from common.throttling import REJECTION_COUNTER_KEY
+from common.versioning import VERSION_KEY_PREFIX
+from common.query_budget import QueryBudgetTestMixin
+from common.single_flight import CACHE_KEY_PREFIX
+from .models import ExamSlot, DailySummary, SlotCapacityDelta, SlotCapacityStripe, Venue, DEFAULT_VENUE_ID, MAX_SLOT_CAPACITY, SUMMARY_DIRTY_KEY
+from . import capacity
+from .capacity import STRIPE_CONTENTION_KEY, adjust_stripes, compact_ledger, set_stripe_count
+from .live import STREAM_PATH, AvailabilityHub, Subscriber, availability_stream
+from .daily_updater import add_next_day_slots
 
-# Create your tests here.
+
+class AvailabilityThrottleTest(TestCase):
+    # 예약 가능 시간대 조회 API의 토큰 버킷 throttle 테스트
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='throttleuser', password='password1234!')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.date = (timezone.now().date() + datetime.timedelta(days=5)).strftime('%Y-%m-%d')
+        for key in redis_client.keys("throttle:availability*"):
+            redis_client.delete(key)
+        redis_client.delete(REJECTION_COUNTER_KEY)
+
+    def test_bucket_exhaustion_returns_retry_after(self):
+        # 버킷을 모두 사용하면 429와 Retry-After 헤더를 반환해야 함
+        rest_framework = {**settings.REST_FRAMEWORK, 'TOKEN_BUCKET_RATES': {'availability': {'rate': '1/min', 'capacity': 2}}}
+        with override_settings(REST_FRAMEWORK=rest_framework):
+            url = reverse('get_available_slots')
+            self.assertEqual(self.client.get(url, {'date': self.date}).status_code, 200)
+            self.assertEqual(self.client.get(url, {'date': self.date}).status_code, 200)
+
+            response = self.client.get(url, {'date': self.date})
+            self.assertEqual(response.status_code, 429)
+            self.assertIn('Retry-After', response.headers)
+
+        self.assertEqual(int(redis_client.hget(REJECTION_COUNTER_KEY, 'availability:user')), 1)
+
+
+class AvailabilityConditionalGetTest(TestCase):
+    # 예약 가능 시간대 조회 API의 ETag 기반 조건부 조회 테스트
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='etaguser', password='password1234!')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.date = timezone.now().date() + datetime.timedelta(days=5)
+        self.slot = ExamSlot.objects.create(date=self.date, hour=10)
+        for key in redis_client.keys(f"{VERSION_KEY_PREFIX}slots:*"):
+            redis_client.delete(key)
+        self.url = reverse('get_available_slots')
+
+    def test_not_modified_until_slots_change(self):
+        # 시간대 변경 전에는 304, 변경 후에는 새 ETag로 200을 반환해야 함
+        response = self.client.get(self.url, {'date': self.date.strftime('%Y-%m-%d')})
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers['ETag']
+
+        response = self.client.get(self.url, {'date': self.date.strftime('%Y-%m-%d')}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ExamSlot.update_slots([self.slot], 1000)
+
+        response = self.client.get(self.url, {'date': self.date.strftime('%Y-%m-%d')}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+
+class AvailabilitySubscriberTest(TestCase):
+    # SSE 구독자의 변경 사항 병합 테스트
+
+    def test_pending_changes_are_coalesced(self):
+        # 전달 전에 같은 시간대가 여러 번 바뀌면 최신 값 하나만 전달되어야 함
+        date = timezone.now().date() + datetime.timedelta(days=5)
+        subscriber = Subscriber([date])
+        subscriber.push({'date': date.isoformat(), 'slots': [
+            {'venue': 1, 'exam_type': 'default', 'hour': 9, 'minute': 0, 'remaining_capacity': 10},
+            {'venue': 1, 'exam_type': 'default', 'hour': 10, 'minute': 0, 'remaining_capacity': 5},
+        ]})
+        subscriber.push({'date': date.isoformat(), 'slots': [{'venue': 1, 'exam_type': 'default', 'hour': 9, 'minute': 0, 'remaining_capacity': 7}]})
+
+        slots = asyncio.run(subscriber.drain(1))
+        self.assertEqual(slots, [
+            {'date': date.isoformat(), 'venue': 1, 'exam_type': 'default', 'hour': 9, 'minute': 0, 'remaining_capacity': 7},
+            {'date': date.isoformat(), 'venue': 1, 'exam_type': 'default', 'hour': 10, 'minute': 0, 'remaining_capacity': 5},
+        ])
+        self.assertIsNone(asyncio.run(subscriber.drain(0.01)))
+
+
+class AvailabilityStreamTest(TestCase):
+    # 예약 가능 인원 실시간 구독(SSE) ASGI 앱 테스트
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='streamuser', password='password1234!')
+        self.token = issue_token(self.user)
+        self.date = timezone.now().date() + datetime.timedelta(days=5)
+        self.slot = ExamSlot.objects.create(date=self.date, hour=9, max_capacity=10)
+
+    def _scope(self, query):
+        return {'type': 'http', 'method': 'GET', 'path': STREAM_PATH, 'query_string': query.encode(), 'headers': []}
+
+    def _reserve(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            ExamSlot.update_slots([self.slot], 3)
+
+    def _stream(self, scope, on_message):
+        # on_message가 True를 반환하면 연결을 끊습니다. 보낸 ASGI 메시지 목록을 반환합니다.
+        messages = []
+
+        async def run():
+            disconnect = asyncio.Event()
+
+            async def receive():
+                await disconnect.wait()
+                return {'type': 'http.disconnect'}
+
+            async def send(message):
+                messages.append(message)
+                if await on_message(message):
+                    disconnect.set()
+
+            await asyncio.wait_for(availability_stream(scope, receive, send), 10)
+
+        # 연결마다 새 이벤트 루프를 쓰므로 구독 허브도 새로 만듭니다.
+        self.hub = AvailabilityHub()
+        with mock.patch('examslots.live.hub', self.hub):
+            async_to_sync(run)()
+        return messages
+
+    def test_unauthenticated_request_rejected(self):
+        async def on_message(message):
+            return False
+        messages = self._stream(self._scope(f'date={self.date.isoformat()}&token=invalid'), on_message)
+        self.assertEqual(messages[0]['status'], 401)
+        self.assertIn('error', json.loads(messages[1]['body']))
+
+    def test_snapshot_then_published_change(self):
+        reserve = sync_to_async(self._reserve)
+
+        async def on_message(message):
+            body = message.get('body', b'')
+            if body.startswith(b'event: snapshot'):
+                await reserve()
+            return body.startswith(b'event: availability')
+
+        messages = self._stream(self._scope(f'date={self.date.isoformat()}&token={self.token}'), on_message)
+
+        self.assertEqual(messages[0]['status'], 200)
+        self.assertIn((b'content-type', b'text/event-stream'), messages[0]['headers'])
+        events = [message['body'].decode() for message in messages[1:] if not message['body'].startswith(b':')]
+        slot = {'date': self.date.isoformat(), 'venue': DEFAULT_VENUE_ID, 'exam_type': 'default', 'hour': 9, 'minute': 0}
+        self.assertEqual(events, [
+            f"event: snapshot\ndata: {json.dumps([{**slot, 'remaining_capacity': 10}])}\n\n",
+            f"event: availability\ndata: {json.dumps([{**slot, 'remaining_capacity': 7}])}\n\n",
+        ])
+        # 연결이 끊기면 날짜 채널 구독을 해제해야 함
+        self.assertEqual(self.hub.subscribers, {})
+
+
+class CalendarTest(TestCase):
+    # 날짜별 요약 갱신 및 달력 조회 API 테스트
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='calendaruser', password='password1234!')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.date = timezone.now().date() + datetime.timedelta(days=5)
+        self.slots = [ExamSlot.objects.create(date=self.date, hour=hour, max_capacity=10) for hour in (9, 10)]
+        DailySummary.refresh([self.date])
+        redis_client.delete(SUMMARY_DIRTY_KEY)
+        for key in redis_client.keys("throttle:availability*"):
+            redis_client.delete(key)
+
+    def test_summary_follows_slot_updates(self):
+        # 시간대 인원이 바뀌면 커밋 후 날짜만 표시되고, 주기 작업이 모아서 요약을 다시 계산해야 함
+        with self.captureOnCommitCallbacks(execute=True):
+            ExamSlot.update_slots([self.slots[0]], 10)
+            ExamSlot.update_slots([self.slots[1]], 4)
+        self.assertEqual(redis_client.smembers(SUMMARY_DIRTY_KEY), {self.date.isoformat().encode()})
+        self.assertEqual(DailySummary.objects.get(date=self.date).total_remaining, 20)
+
+        self.assertEqual(DailySummary.refresh_dirty(), 1)
+        self.assertEqual(DailySummary.refresh_dirty(), 0)
+
+        response = self.client.get(reverse('calendar'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['days'], [{
+            'date': self.date.isoformat(),
+            'total_remaining': 6,
+            'min_remaining': 0,
+            'min_remaining_time': '09:00:00',
+            'full_slots': 1,
+        }])
+
+
+@override_settings(AVAILABILITY_CACHE={'TIMEOUT': 0, 'STALE_TIMEOUT': 0, 'LOCK_TIMEOUT': 5})
+class AvailabilityQueryBudgetTest(QueryBudgetTestMixin, TestCase):
+    # 시간대 조회 API 쿼리 예산 테스트 (시간대가 있는 날짜 수가 늘어나도 쿼리 수가 일정해야 함)
+    SIZES = [1, 10, 60]
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='budgetuser', password='password1234!')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.start_date = timezone.now().date() + datetime.timedelta(days=5)
+        for key in redis_client.keys("throttle:availability*"):
+            redis_client.delete(key)
+
+    def _seed(self, days):
+        dates = [self.start_date + datetime.timedelta(days=day) for day in range(days)]
+        ExamSlot.objects.bulk_create(
+            [ExamSlot(date=date, hour=hour, current_count=hour) for date in dates for hour in range(24)],
+            ignore_conflicts=True
+        )
+        DailySummary.refresh(dates)
+
+    def test_available_slots(self):
+        def setup(size):
+            self._seed(size)
+            return f"{reverse('get_available_slots')}?date={self.start_date.isoformat()}"
+        self.assertQueriesConstant('get', self.SIZES, setup)
+
+    def test_calendar(self):
+        def setup(size):
+            self._seed(size)
+            return reverse('calendar')
+        self.assertQueriesConstant('get', self.SIZES, setup)
+
+    def test_admin_capacity(self):
+        # 대상 시간대가 늘어나도 최대 인원 변경 쿼리 수는 일정해야 함
+        self.client.force_authenticate(user=User.objects.create_superuser(username='budgetadmin'))
+
+        def setup(size):
+            self._seed(size)
+            return reverse('admin_capacity')
+        self.assertQueriesConstant('patch', self.SIZES, setup, {
+            'start_date': self.start_date.isoformat(),
+            'end_date': (self.start_date + datetime.timedelta(days=60)).isoformat(),
+            'max_capacity': 10,
+        })
+
+    def test_venues(self):
+        # 시험장 추가 시 시간대는 한 번의 INSERT 문으로 생성되어야 함 (오늘 하루만 있으므로 SQLite에서도 한 번)
+        ExamSlot.objects.create(date=timezone.now().date(), hour=0)
+        self.request_within_budget('get', reverse('venues'))
+
+        self.client.force_authenticate(user=User.objects.create_superuser(username='venueadmin'))
+        response, _ = self.request_within_budget('post', reverse('venues'), {'code': 'busan', 'name': '부산 시험장'})
+        self.assertEqual(response.status_code, 201)
+
+
+class CapacityAdjustTest(TestCase):
+    # 시간대 최대 인원 일괄 변경 테스트
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username='capacityadmin', password='password1234!')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+        # 월요일부터 7일간, 시간대별 사용 인원은 시간과 같음
+        today = timezone.now().date()
+        self.start_date = today + datetime.timedelta(days=7 - today.weekday())
+        self.dates = [self.start_date + datetime.timedelta(days=day) for day in range(7)]
+        ExamSlot.objects.bulk_create([
+            ExamSlot(date=date, hour=hour, max_capacity=100, current_count=hour) for date in self.dates for hour in range(24)
+        ])
+        DailySummary.refresh(self.dates)
+
+    def _adjust(self, **data):
+        data.setdefault('start_date', self.dates[0].isoformat())
+        data.setdefault('end_date', self.dates[-1].isoformat())
+        return self.client.patch(reverse('admin_capacity'), data, format='json')
+
+    def _capacities(self, date):
+        return list(ExamSlot.objects.filter(date=date).order_by('hour').values_list('max_capacity', flat=True))
+
+    def test_set_rejects_slots_below_usage(self):
+        # 사용 인원보다 작아지는 시간대만 제외하고 바꿔야 함
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self._adjust(start_time='09:00', end_time='18:00', max_capacity=12)
+        DailySummary.refresh_dirty()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['updated'], 7 * 4)
+        self.assertEqual(len(response.data['rejected']), 7 * 5)
+        self.assertEqual(response.data['rejected'][0]['hour'], 13)
+        self.assertEqual(response.data['rejected'][0]['requested_capacity'], 12)
+        self.assertEqual(self._capacities(self.dates[0])[8:19], [100] + [12] * 4 + [100] * 6)
+        self.assertEqual(DailySummary.objects.get(date=self.dates[0]).min_remaining, 0)
+
+    def test_scale_by_weekday(self):
+        # 주말만 배율로 조정해야 함
+        response = self._adjust(weekdays=[6, 7], scale=1.5)
+
+        self.assertEqual(response.data['updated'], 48)
+        self.assertEqual(set(self._capacities(self.dates[5]) + self._capacities(self.dates[6])), {150})
+        self.assertEqual(set(self._capacities(self.dates[4])), {100})
+
+    @override_settings(SLOT_CAPACITY={'BACKEND': 'striped'})
+    def test_rescale_stripes(self):
+        # 구간이 있는 시간대는 구간 인원 합이 새 최대 인원과 같아야 함
+        slot = ExamSlot.objects.get(date=self.dates[0], hour=9)
+        set_stripe_count(slot.id, 4)
+
+        self._adjust(end_date=self.dates[0].isoformat(), start_time='09:00', end_time='10:00', max_capacity=30)
+
+        stripes = list(SlotCapacityStripe.objects.filter(slot=slot).values_list('max_capacity', 'current_count'))
+        self.assertEqual(sum(capacity for capacity, _ in stripes), 30)
+        self.assertEqual(sum(count for _, count in stripes), 9)
+        self.assertTrue(all(count <= capacity for capacity, count in stripes))
+
+    def test_scale_capped_at_column_limit(self):
+        # 배율을 곱한 값이 정수 컬럼 범위를 넘으면 상한으로 맞춰야 함
+        ExamSlot.objects.filter(date=self.dates[0], hour=9).update(max_capacity=MAX_SLOT_CAPACITY - 1)
+        response = self._adjust(end_date=self.dates[0].isoformat(), start_time='09:00', end_time='11:00', scale=2)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._capacities(self.dates[0])[9:11], [MAX_SLOT_CAPACITY, 200])
+
+    def test_invalid_request(self):
+        self.assertEqual(self._adjust(max_capacity=10, scale=2).status_code, 400)
+        self.assertEqual(self._adjust(start_time='10:00', end_time='09:00', max_capacity=10).status_code, 400)
+        # 정수 컬럼 범위를 넘는 값은 500이 아닌 400이어야 함
+        self.assertEqual(self._adjust(max_capacity=MAX_SLOT_CAPACITY + 1).status_code, 400)
+        self.assertEqual(self._adjust(scale=1e300).status_code, 400)
+
+
+@override_settings(EXAM_TYPES={
+    'default': {'SLOT_MINUTES': 60},
+    'speaking': {'SLOT_MINUTES': 30, 'MAX_CAPACITY': 100},
+})
+class SlotGranularityTest(TestCase):
+    # 시험 종류별 시간대 단위 테스트
+
+    def setUp(self):
+        self.date = timezone.now().date() + datetime.timedelta(days=5)
+        self.day_start = datetime.datetime.combine(self.date, datetime.time(0, 0))
+        ExamSlot.generate_slots(self.day_start, self.day_start + datetime.timedelta(days=2))
+
+    def _time(self, hour, minute=0, days=0):
+        return self.day_start + datetime.timedelta(days=days, hours=hour, minutes=minute)
+
+    def test_generate_slots_by_exam_type(self):
+        # 종류별 단위로 생성되고, 다시 생성해도 중복되지 않아야 함
+        ExamSlot.generate_slots(self.day_start, self.day_start + datetime.timedelta(days=1))
+
+        self.assertEqual(ExamSlot.objects.filter(date=self.date, exam_type='default').count(), 24)
+        self.assertEqual(ExamSlot.objects.filter(date=self.date, exam_type='speaking').count(), 48)
+        slot = ExamSlot.objects.get(date=self.date, exam_type='speaking', hour=10, minute=30)
+        self.assertEqual((slot.slot_index, slot.slot_minutes, slot.max_capacity), (21, 30, 100))
+
+    def test_next_day_slots(self):
+        add_next_day_slots()
+        next_date = self.date + datetime.timedelta(days=2)
+        self.assertEqual(ExamSlot.objects.filter(date=next_date, exam_type='speaking').count(), 48)
+
+    def test_available_slots_by_index(self):
+        # 시간대 번호 범위로 조회하며, 여러 날에 걸친 범위도 한 번에 조회해야 함
+        slots = ExamSlot.get_available_slots(self._time(10, 30), self._time(12), 'speaking')
+        self.assertEqual([slot.slot_index for slot in slots], [21, 22, 23])
+
+        slots = ExamSlot.get_available_slots(self._time(23, 30), self._time(0, 30, days=1), 'speaking')
+        self.assertEqual([(slot.date, slot.time_label) for slot in slots], [
+            (self.date, '23시 30분'), (self.date + datetime.timedelta(days=1), '0시'),
+        ])
+
+    def test_adjust_capacity_by_time(self):
+        # 시각 범위는 시험 종류별 시간대 번호로 바꿔 적용되어야 함 (10:30~11:30: 말하기 2개, 기본 1개)
+        client = APIClient()
+        client.force_authenticate(user=User.objects.create_superuser(username='granularityadmin', password='password1234!'))
+        response = client.patch(reverse('admin_capacity'), {
+            'start_date': self.date.isoformat(),
+            'end_date': self.date.isoformat(),
+            'start_time': '10:30',
+            'end_time': '11:30',
+            'max_capacity': 7,
+        }, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['updated'], 3)
+        self.assertEqual(sorted(ExamSlot.objects.filter(max_capacity=7).values_list('exam_type', 'hour', 'minute')), [
+            ('default', 11, 0), ('speaking', 10, 30), ('speaking', 11, 0),
+        ])
+
+    def test_calendar_by_exam_type(self):
+        # 날짜별 요약은 시험 종류마다 따로 계산되고, 달력은 요청한 종류의 요약만 반환해야 함
+        DailySummary.refresh([self.date])
+        speaking = ExamSlot.objects.get(date=self.date, exam_type='speaking', hour=10, minute=30)
+        with self.captureOnCommitCallbacks(execute=True):
+            ExamSlot.update_slots([speaking], 100)
+        DailySummary.refresh_dirty()
+
+        client = APIClient()
+        client.force_authenticate(user=User.objects.create_user(username='calendartypeuser', password='password1234!'))
+        for key in redis_client.keys("throttle:availability*"):
+            redis_client.delete(key)
+
+        def day(response):
+            self.assertEqual(response.status_code, 200)
+            return next(day for day in response.data['days'] if day['date'] == self.date.isoformat())
+
+        default_response = client.get(reverse('calendar'))
+        speaking_response = client.get(reverse('calendar'), {'exam_type': 'speaking'})
+        default_capacity = sum(ExamSlot.objects.filter(date=self.date, exam_type='default').values_list('max_capacity', flat=True))
+        self.assertEqual(day(default_response)['total_remaining'], default_capacity)
+        self.assertEqual(day(default_response)['full_slots'], 0)
+        self.assertEqual(day(speaking_response), {
+            'date': self.date.isoformat(),
+            'total_remaining': 47 * 100,
+            'min_remaining': 0,
+            'min_remaining_time': '10:30:00',
+            'full_slots': 1,
+        })
+        # 같은 달력 버전을 공유하므로 ETag는 시험 종류별로 달라야 함
+        self.assertNotEqual(default_response['ETag'], speaking_response['ETag'])
+        self.assertEqual(client.get(reverse('calendar'), {'exam_type': 'unknown'}).status_code, 400)
+
+    def test_reservation_with_half_hour_slots(self):
+        user = User.objects.create_user(username='speakinguser', password='password1234!')
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        def reserve(exam_type, start, end):
+            return client.post(reverse('reservation'), {
+                'exam_type': exam_type,
+                'start_time': start.strftime('%Y-%m-%d %H:%M'),
+                'end_time': end.strftime('%Y-%m-%d %H:%M'),
+                'count': 1,
+            }, format='json')
+
+        response = reserve('speaking', self._time(10, 30), self._time(11, 30))
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data['exam_type'], 'speaking')
+        self.assertEqual(Reservation.objects.get(id=response.data['id']).exam_slots.count(), 2)
+
+        # 시간대 단위에 맞지 않는 시각과 알 수 없는 종류는 거부해야 함
+        self.assertEqual(reserve('speaking', self._time(10, 15), self._time(11, 30)).status_code, 400)
+        self.assertEqual(reserve('default', self._time(10, 30), self._time(11, 30)).status_code, 400)
+        self.assertEqual(reserve('writing', self._time(10), self._time(11)).status_code, 400)
+
+
+class VenueTest(TestCase):
+    # 시험장별 시간대와 시험장 배정 테스트
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username='venueadmin', password='password1234!')
+        self.user = User.objects.create_user(username='venueuser', password='password1234!')
+        self.client = APIClient()
+        self.date = timezone.now().date() + datetime.timedelta(days=5)
+        self.day_start = datetime.datetime.combine(self.date, datetime.time(0, 0))
+        ExamSlot.generate_slots(self.day_start, self.day_start + datetime.timedelta(days=1))
+        ExamSlot.objects.filter(venue_id=DEFAULT_VENUE_ID).update(max_capacity=50)
+        for key in redis_client.keys("throttle:*") + redis_client.keys(f"{CACHE_KEY_PREFIX}availability:*"):
+            redis_client.delete(key)
+
+        # 관리자가 시험장을 추가하면 기존 시간대의 마지막 날까지 시간대가 생성되어야 함
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.post(reverse('venues'), {'code': 'seoul', 'name': '서울 시험장', 'slot_capacity': 100}, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.venue = Venue.objects.get(id=response.data['id'])
+        self.client.force_authenticate(user=self.user)
+
+    def _reserve(self, start_hour, end_hour, count, venue=None):
+        data = {
+            'start_time': f"{self.date} {start_hour:02d}:00",
+            'end_time': f"{self.date} {end_hour:02d}:00",
+            'count': count,
+        }
+        if venue is not None:
+            data['venue'] = venue
+        return self.client.post(reverse('reservation'), data, format='json')
+
+    def test_create_venue(self):
+        self.assertEqual(ExamSlot.objects.filter(venue=self.venue, date=self.date).count(), 24)
+        self.assertEqual(ExamSlot.objects.get(venue=self.venue, date=self.date, hour=10).max_capacity, 100)
+
+        response = self.client.get(reverse('venues'))
+        self.assertEqual([venue['code'] for venue in response.data['venues']], ['default', 'seoul'])
+        self.assertEqual(self.client.post(reverse('venues'), {'code': 'busan', 'name': '부산 시험장'}, format='json').status_code, 403)
+
+    def test_availability_sums_venues(self):
+        # 시험장을 지정하지 않으면 시간대별 남은 인원의 합계를 반환해야 함
+        ExamSlot.objects.filter(venue=self.venue, date=self.date, hour=10).update(current_count=100)
+        url = reverse('get_available_slots')
+
+        slots = {slot['hour']: slot['remaining_capacity'] for slot in self.client.get(url, {'date': self.date.isoformat()}).data['available_slots']}
+        self.assertEqual((slots[9], slots[10]), (150, 50))
+
+        slots = {slot['hour']: slot['remaining_capacity'] for slot in self.client.get(url, {'date': self.date.isoformat(), 'venue': self.venue.id}).data['available_slots']}
+        self.assertEqual(slots[9], 100)
+        self.assertNotIn(10, slots)
+
+    def test_allocation(self):
+        # 남은 인원이 가장 많은 시험장을 배정해야 함
+        response = self._reserve(10, 12, 5)
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data['venue'], self.venue.id)
+        self.assertEqual(set(Reservation.objects.get(id=response.data['id']).exam_slots.values_list('venue_id', flat=True)), {self.venue.id})
+
+        # 범위 중 한 시간대라도 적게 남으면 다른 시험장을 배정해야 함
+        ExamSlot.objects.filter(venue=self.venue, date=self.date, hour=11).update(current_count=98)
+        response = self._reserve(10, 12, 5)
+        self.assertEqual(response.data['venue'], DEFAULT_VENUE_ID)
+
+        # 지정한 시험장에 자리가 없으면 다른 시험장이 있어도 거부해야 함
+        response = self._reserve(10, 12, 5, venue=self.venue.id)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('가용 인원: 2명', response.data['error'])
+
+    def test_bulk_cancel_by_venue(self):
+        # 시험장 휴무로 취소하면 그 시험장의 예약만 취소되어야 함
+        seoul = self._reserve(10, 11, 1, venue=self.venue.id).data['id']
+        default = self._reserve(10, 11, 1, venue=DEFAULT_VENUE_ID).data['id']
+
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.post(reverse('admin_reservation_bulk_cancel'), {
+            'start_time': f"{self.date} 00:00",
+            'end_time': f"{self.date + datetime.timedelta(days=1)} 00:00",
+            'venue': self.venue.id,
+        }, format='json')
+        b''.join(response.streaming_content)
+
+        self.assertEqual(Reservation.objects.get(id=seoul).status, 'cancelled')
+        self.assertEqual(Reservation.objects.get(id=default).status, 'pending')
+
+
+@override_settings(SLOT_CAPACITY={'BACKEND': 'ledger', 'COMPACT_INTERVAL': 10})
+class CapacityLedgerTest(TestCase):
+    # 원장 방식 시간대 인원 관리 테스트
+
+    def setUp(self):
+        self.date = timezone.now().date() + datetime.timedelta(days=5)
+        self.slots = [ExamSlot.objects.create(date=self.date, hour=hour, max_capacity=10) for hour in (9, 10)]
+
+    def _used(self):
+        return [slot.used_count for slot in ExamSlot.objects.with_usage().filter(date=self.date).order_by('hour')]
+
+    def test_reserve_appends_deltas_without_updating_slot(self):
+        # 예약 시 시간대 행은 그대로이고 변경분만 추가되어야 함
+        with self.captureOnCommitCallbacks(execute=True):
+            ExamSlot.update_slots(self.slots, 4)
+            ExamSlot.update_slots(self.slots[:1], 3)
+        DailySummary.refresh_dirty()
+
+        self.assertEqual(list(ExamSlot.objects.filter(date=self.date).values_list('current_count', flat=True)), [0, 0])
+        self.assertEqual(SlotCapacityDelta.objects.count(), 3)
+        self.assertEqual(self._used(), [7, 4])
+        self.assertEqual(DailySummary.objects.get(date=self.date).total_remaining, 9)
+
+    def test_lock_uses_bigint_keys(self):
+        # PostgreSQL에서는 bigint 시간대 id도 넘치지 않도록 namespace를 붙인 bigint 키로 잠가야 함
+        with mock.patch.object(capacity, 'connection') as fake_connection:
+            fake_connection.vendor = 'postgresql'
+            capacity.LedgerCapacity().lock([2 ** 40, 3])
+
+        sql, params = fake_connection.cursor.return_value.__enter__.return_value.execute.call_args.args
+        self.assertIn("pg_advisory_xact_lock((%s::bigint << 32) | id)", sql)
+        self.assertIn("unnest(%s::bigint[])", sql)
+        self.assertEqual(params, [capacity.LEDGER_LOCK_NAMESPACE, [3, 2 ** 40]])
+
+    def test_over_capacity_inserts_nothing(self):
+        # 한 시간대라도 최대 인원을 넘으면 모든 시간대에 변경분이 추가되지 않아야 함
+        ExamSlot.update_slots(self.slots[:1], 8)
+        with self.assertRaises(ValidationError):
+            ExamSlot.update_slots(self.slots, 3)
+
+        self.assertEqual(self._used(), [8, 0])
+        self.assertEqual(len(ExamSlot.get_available_slots(
+            datetime.datetime.combine(self.date, datetime.time(9)), datetime.datetime.combine(self.date, datetime.time(11))
+        )), 2)
+
+    def test_compaction_preserves_usage(self):
+        # 합친 뒤에는 원장이 비고 current_count에 누적값이 반영되어야 함
+        ExamSlot.update_slots(self.slots, 5)
+        ExamSlot.update_slots(self.slots[1:], -2)
+
+        self.assertEqual(compact_ledger(), 2)
+        self.assertFalse(SlotCapacityDelta.objects.exists())
+        self.assertEqual(list(ExamSlot.objects.filter(date=self.date).values_list('current_count', flat=True)), [5, 3])
+        self.assertEqual(self._used(), [5, 3])
+
+        # 가득 찬 시간대는 조회 결과에서 제외되어야 함
+        ExamSlot.update_slots(self.slots[:1], 5)
+        self.assertEqual([slot.hour for slot in ExamSlot.objects.available().filter(date=self.date)], [10])
+
+
+@override_settings(SLOT_CAPACITY={'BACKEND': 'striped', 'MAX_STRIPES': 8, 'STRIPE_CONTENTION_THRESHOLD': 2})
+class CapacityStripeTest(TestCase):
+    # 구간(stripe) 방식 시간대 인원 관리 테스트
+
+    def setUp(self):
+        self.date = timezone.now().date() + datetime.timedelta(days=5)
+        self.slot = ExamSlot.objects.create(date=self.date, hour=9, max_capacity=8, current_count=2)
+        redis_client.delete(STRIPE_CONTENTION_KEY)
+
+    def _used(self):
+        return ExamSlot.objects.with_usage().get(id=self.slot.id).used_count
+
+    def _stripes(self):
+        return list(SlotCapacityStripe.objects.filter(slot=self.slot).order_by('index').values_list('max_capacity', 'current_count'))
+
+    def test_first_update_moves_count_into_stripe(self):
+        # 구간이 없는 시간대는 처음 갱신할 때 구간 1개로 옮겨져야 함
+        ExamSlot.update_slots([self.slot], 1)
+
+        self.assertEqual(self._stripes(), [(8, 3)])
+        self.assertEqual(ExamSlot.objects.get(id=self.slot.id).current_count, 0)
+        self.assertEqual(self._used(), 3)
+
+    def test_stripe_count_change_keeps_usage(self):
+        # 구간 수를 바꿔도 전체 최대 인원과 사용 인원은 그대로여야 함
+        set_stripe_count(self.slot.id, 4)
+        self.assertEqual(self._stripes(), [(2, 1), (2, 1), (2, 0), (2, 0)])
+
+        set_stripe_count(self.slot.id, 0)
+        self.assertFalse(SlotCapacityStripe.objects.filter(slot=self.slot).exists())
+        self.assertEqual(ExamSlot.objects.get(id=self.slot.id).current_count, 2)
+
+    def test_rebalance_when_no_stripe_has_room(self):
+        # 한 구간에 자리가 부족하면 재분배하여 전체 남은 인원 안에서 예약되어야 함
+        set_stripe_count(self.slot.id, 4)
+        ExamSlot.update_slots([self.slot], 5)
+
+        self.assertEqual(self._used(), 7)
+        self.assertEqual(sum(capacity for capacity, _ in self._stripes()), 8)
+        self.assertEqual(int(redis_client.hget(STRIPE_CONTENTION_KEY, self.slot.id)), 1)
+
+        with self.assertRaises(ValidationError):
+            ExamSlot.update_slots([self.slot], 2)
+        ExamSlot.update_slots([self.slot], -7)
+        self.assertEqual(self._used(), 0)
+
+    def test_adjust_by_contention(self):
+        # 경합이 많으면 구간 수를 늘리고, 없으면 줄여야 함
+        set_stripe_count(self.slot.id, 2)
+        redis_client.hincrby(STRIPE_CONTENTION_KEY, self.slot.id, 3)
+        self.assertEqual(adjust_stripes(), {self.slot.id: 4})
+        self.assertEqual(adjust_stripes(), {self.slot.id: 2})
+        self.assertEqual(self._used(), 2)
+
+
+class CapacityBackendParityTest(TestCase):
+    # 인원 관리 방식(row/ledger/striped)마다 같은 변경이 같은 사용 인원으로 반영되는지 테스트
+    # (예약 API 테스트는 기본 방식으로 한 번만 실행하고, 방식별 차이는 여기서 확인)
+    BACKENDS = ('row', 'ledger', 'striped')
+
+    def setUp(self):
+        self.date = timezone.now().date() + datetime.timedelta(days=5)
+        self.slots = [ExamSlot.objects.create(date=self.date, hour=hour, max_capacity=10) for hour in (9, 10, 11)]
+        ExamSlot.objects.filter(id=self.slots[0].id).update(current_count=2)
+
+    def _used(self):
+        return [slot.used_count for slot in ExamSlot.objects.with_usage().filter(date=self.date).order_by('hour')]
+
+    def assertBackendsAgree(self, steps, expected):
+        # 방식마다 steps를 실행하고 사용 인원을 비교한 뒤 되돌립니다.
+        for backend in self.BACKENDS:
+            with self.subTest(backend=backend):
+                with override_settings(SLOT_CAPACITY={'BACKEND': backend}), transaction.atomic():
+                    steps()
+                    used = self._used()
+                    transaction.set_rollback(True)
+                self.assertEqual(used, expected)
+
+    def test_reserve_and_release(self):
+        def steps():
+            ExamSlot.update_slots(self.slots[:2], 3)
+            ExamSlot.update_slots(self.slots[1:], 2)
+            ExamSlot.release_slots({self.slots[0].id: 1, self.slots[1].id: 3, self.slots[2].id: 0})
+        self.assertBackendsAgree(steps, [4, 2, 2])
+
+    def test_apply_slot_changes(self):
+        # 일괄 처리처럼 잠금 후 시간대별로 다른 변경분(+/-)을 한 번에 반영
+        def steps():
+            ExamSlot.update_slots(self.slots, 3)
+            slot_ids = [slot.id for slot in self.slots]
+            capacity.get_backend().lock(slot_ids)
+            ExamSlot.apply_slot_changes({slot_ids[0]: -5, slot_ids[1]: 7, slot_ids[2]: 0})
+        self.assertBackendsAgree(steps, [0, 10, 3])
+
+    def test_over_capacity_changes_nothing(self):
+        def steps():
+            ExamSlot.update_slots(self.slots, 6)
+            with self.assertRaises(ValidationError):
+                ExamSlot.update_slots(self.slots, 3)
+        self.assertBackendsAgree(steps, [8, 6, 6])
+
+
+class SummaryContentionTest(TestCase):
+    # 같은 날짜의 다른 시간대 예약이 날짜별 요약 행을 두고 서로 기다리지 않는지 테스트
+
+    def setUp(self):
+        self.date = timezone.now().date() + datetime.timedelta(days=5)
+        self.slots = [ExamSlot.objects.create(date=self.date, hour=hour, max_capacity=10) for hour in (9, 10)]
+        DailySummary.refresh([self.date])
+        redis_client.delete(SUMMARY_DIRTY_KEY)
+
+    def _reserve(self, slot, count):
+        # 예약 트랜잭션 안에서 실행된 SQL과 커밋 후 실행될 콜백을 반환
+        with self.captureOnCommitCallbacks() as callbacks:
+            with CaptureQueriesContext(connection) as queries, transaction.atomic():
+                ExamSlot.update_slots([slot], count)
+        return [query['sql'] for query in queries], callbacks
+
+    def _assert_reserves_do_not_share_summary(self):
+        first, first_callbacks = self._reserve(self.slots[0], 3)
+        second, second_callbacks = self._reserve(self.slots[1], 4)
+
+        # 두 예약 모두 트랜잭션 안에서 요약 테이블을 읽거나 잠그지 않아야 함
+        for statement in first + second:
+            self.assertNotIn(DailySummary._meta.db_table, statement)
+        self.assertEqual(DailySummary.objects.get(date=self.date).total_remaining, 20)
+
+        # 커밋 후에도 예약 요청은 날짜만 표시하고 DB를 조회하지 않아야 함
+        with self.assertNumQueries(0):
+            for callback in second_callbacks + first_callbacks:
+                callback()
+        self.assertEqual(DailySummary.objects.get(date=self.date).total_remaining, 20)
+
+        # 주기 작업은 두 예약을 한 번에 반영해야 함
+        self.assertEqual(DailySummary.refresh_dirty(), 1)
+        self.assertEqual(DailySummary.objects.get(date=self.date).total_remaining, 13)
+
+    @override_settings(SLOT_CAPACITY={'BACKEND': 'ledger', 'COMPACT_INTERVAL': 10})
+    def test_ledger_reserves_on_same_date(self):
+        self._assert_reserves_do_not_share_summary()
+
+    @override_settings(SLOT_CAPACITY={'BACKEND': 'striped', 'MAX_STRIPES': 8, 'STRIPE_CONTENTION_THRESHOLD': 2})
+    def test_striped_reserves_on_same_date(self):
+        self._assert_reserves_do_not_share_summary()
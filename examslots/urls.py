@@ -3,4 +3,7 @@ from . import views
 
 urlpatterns = [
     path('available/', views.get_available_slots, name='get_available_slots'),
+    path('calendar/', views.calendar_view, name='calendar'),
+    path('admin/capacity/', views.admin_capacity_view, name='admin_capacity'),
+    path('venues/', views.venue_view, name='venues'),
 ] 
\ No newline at end of file
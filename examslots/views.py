@@ -1,21 +1,105 @@
 from django.shortcuts import render
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from datetime import datetime, timedelta
+from django.db import transaction
+from django.db.models import F, Max, Sum
 from django.utils import timezone
-from .models import ExamSlot
-from .serializers import AvailableSlotListResponseSerializer, ExamSlotSerializer
-from django.db import models
+from .models import ExamSlot, DailySummary, Venue, time_of_day_condition
+from .granularity import DEFAULT_EXAM_TYPE, is_exam_type
+from .serializers import (
+    AvailableSlotListResponseSerializer,
+    AvailableSlotSerializer,
+    DailySummarySerializer,
+    CalendarResponseSerializer,
+    CapacityAdjustSerializer,
+    CapacityAdjustResponseSerializer,
+    VenueSerializer,
+    VenueListResponseSerializer
+)
 from common.serializers import ErrorResponseSerializer
+from common.throttling import token_bucket_throttles
+from common.versioning import bump_versions, conditional_on_version, get_version, slots_version_key, CALENDAR_VERSION_KEY
+from common.single_flight import get_or_compute
+from common.query_budget import query_budget
+from django.conf import settings
+
+def _parse_date_param(request):
+    try:
+        return datetime.strptime(request.query_params.get('date', ''), '%Y-%m-%d').date()
+    except ValueError:
+        return None
+
+def _availability_version_key(request):
+    target_date = _parse_date_param(request)
+    return slots_version_key(target_date) if target_date else None
+
+def _parse_venue_param(request):
+    try:
+        return int(request.query_params['venue']) if request.query_params.get('venue') else None
+    except ValueError:
+        return None
+
+def _availability_etag_suffix(request):
+    # 조회 가능 범위와 당일 시간 필터는 현재 시각에 따라 달라지므로 ETag에 포함합니다.
+    # 시험 종류/시험장별 응답은 같은 날짜 버전을 공유하므로 종류와 시험장도 포함합니다.
+    current_datetime = timezone.now()
+    exam_type = request.query_params.get('exam_type', DEFAULT_EXAM_TYPE)
+    scope = f"{exam_type}-{request.query_params.get('venue') or 'all'}"
+    if _parse_date_param(request) == current_datetime.date() + timedelta(days=3):
+        return f"{scope}-{current_datetime.strftime('%Y%m%d%H')}"
+    return f"{scope}-{current_datetime.strftime('%Y%m%d')}"
+
+def _calendar_etag_suffix(request):
+    # 조회 기간은 날짜에 따라 달라지고, 시험 종류별 응답은 같은 달력 버전을 공유합니다.
+    exam_type = request.query_params.get('exam_type', DEFAULT_EXAM_TYPE)
+    return f"{exam_type}-{timezone.now().strftime('%Y%m%d')}"
+
+def _load_available_slots(target_date, exam_type, venue=None):
+    # 남은 자리가 있는 시험장들의 남은 인원을 시간대별로 합산합니다. (한 번의 GROUP BY 조회)
+    slots = ExamSlot.objects.available().filter(exam_type=exam_type, date=target_date)
+    if venue is not None:
+        slots = slots.filter(venue_id=venue)
+    return AvailableSlotSerializer(
+        slots.values('date', 'hour', 'minute', 'slot_index')
+        .annotate(remaining_capacity=Sum(F('max_capacity') - F('used_count')))
+        .order_by('slot_index'),
+        many=True
+    ).data
+
+def get_available_slot_rows(target_date, exam_type=DEFAULT_EXAM_TYPE, venue=None):
+    """
+    날짜의 남은 자리가 있는 시간대 목록을 반환합니다. (venue를 생략하면 모든 시험장의 합계)
+    캐시가 만료되는 순간 몰린 요청들은 한 번의 조회 결과를 함께 사용합니다.
+    """
+    config = settings.AVAILABILITY_CACHE
+    if not config['TIMEOUT']:
+        return _load_available_slots(target_date, exam_type, venue)
+
+    version_key = slots_version_key(target_date)
+    try:
+        version = get_version(version_key)[0]
+    except Exception:
+        version = None
+
+    return get_or_compute(
+        f"availability:{exam_type}:{venue or 'all'}:{target_date.isoformat()}",
+        lambda: _load_available_slots(target_date, exam_type, venue),
+        timeout=config['TIMEOUT'],
+        stale_timeout=config['STALE_TIMEOUT'],
+        lock_timeout=config['LOCK_TIMEOUT'],
+        version=version
+    )
 
 @swagger_auto_schema(
     method='get',
     operation_summary="예약 가능한 시간대 조회 API",
-    operation_description="특정 날짜의 예약 가능한 시간대와 남은 인원을 조회합니다. 현재 시간에서 3일 이상 이후의 날짜만 조회 가능합니다. 또한 3개월 이내의 날짜만 조회 가능합니다.",
+    operation_description="특정 날짜의 예약 가능한 시간대와 남은 인원을 조회합니다. 현재 시간에서 3일 이상 이후의 날짜만 조회 가능합니다. 또한 3개월 이내의 날짜만 조회 가능합니다. "
+                          "시험장을 지정하지 않으면 모든 시험장의 남은 인원 합계를 반환합니다.",
     manual_parameters=[
         openapi.Parameter(
             'date',
@@ -23,16 +107,34 @@ from common.serializers import ErrorResponseSerializer
             description="조회할 날짜 (YYYY-MM-DD 형식)",
             type=openapi.TYPE_STRING,
             required=True
+        ),
+        openapi.Parameter(
+            'exam_type',
+            openapi.IN_QUERY,
+            description="시험 종류 (생략 시 default)",
+            type=openapi.TYPE_STRING,
+            required=False
+        ),
+        openapi.Parameter(
+            'venue',
+            openapi.IN_QUERY,
+            description="시험장 ID (생략 시 모든 시험장 합계)",
+            type=openapi.TYPE_INTEGER,
+            required=False
         )
     ],
     responses={
         200: AvailableSlotListResponseSerializer,
         400: ErrorResponseSerializer,
-        401: ErrorResponseSerializer
+        401: ErrorResponseSerializer,
+        429: ErrorResponseSerializer
     }
 )
+@query_budget(1)
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@throttle_classes(token_bucket_throttles('availability'))
+@conditional_on_version(_availability_version_key, _availability_etag_suffix)
 def get_available_slots(request):
     """
     특정 날짜의 예약 가능한 시간대 조회 API
@@ -41,6 +143,7 @@ def get_available_slots(request):
     - 현재 시간에서 3일 이상 이후의 날짜만 조회 가능합니다.
     - 3개월 이내의 날짜만 조회 가능합니다.
     - 남은 자리가 0인 시간대는 제외됩니다.
+    - 시험장을 지정하지 않으면 시간대별로 모든 시험장의 남은 인원을 합산합니다.
     """
     date_str = request.query_params.get('date')
     if not date_str:
@@ -51,6 +154,14 @@ def get_available_slots(request):
     except ValueError:
         return Response(ErrorResponseSerializer({'error': '올바른 날짜 형식이 아닙니다. (YYYY-MM-DD)'}).data, status=status.HTTP_400_BAD_REQUEST)
     
+    exam_type = request.query_params.get('exam_type', DEFAULT_EXAM_TYPE)
+    if not is_exam_type(exam_type):
+        return Response(ErrorResponseSerializer({'error': '알 수 없는 시험 종류입니다.'}).data, status=status.HTTP_400_BAD_REQUEST)
+    
+    venue = _parse_venue_param(request)
+    if request.query_params.get('venue') and venue is None:
+        return Response(ErrorResponseSerializer({'error': '올바른 시험장 ID가 아닙니다.'}).data, status=status.HTTP_400_BAD_REQUEST)
+    
     current_datetime = timezone.now()
     current_date = current_datetime.date()
     current_hour = current_datetime.hour
@@ -66,15 +177,160 @@ def get_available_slots(request):
         return Response(ErrorResponseSerializer({'error': '3개월 이내의 날짜만 신청이 가능합니다.'}).data,
                          status=status.HTTP_400_BAD_REQUEST)
     
-    available_slots = ExamSlot.objects.filter(
-        date=target_date,
-        current_count__lt=models.F('max_capacity')
-    ).order_by('hour')
+    available_slots = get_available_slot_rows(target_date, exam_type, venue)
     
     if target_date == min_date:
-        available_slots = available_slots.filter(hour__gt=current_hour)
-    
-    serializer = ExamSlotSerializer(available_slots, many=True)
+        available_slots = [slot for slot in available_slots if slot['hour'] > current_hour]
     
     return Response(AvailableSlotListResponseSerializer({'message': '예약 가능한 시간대를 조회했습니다.', 
-                                                         'available_slots': serializer.data}).data)
+                                                         'available_slots': available_slots}).data)
+
+
+@swagger_auto_schema(
+    method='get',
+    operation_summary="예약 가능 인원 달력 조회 API",
+    operation_description="조회 가능한 전체 기간(3일 후 ~ 3개월 후)의 시험 종류별 날짜별 남은 인원 요약을 한 번에 조회합니다.",
+    manual_parameters=[
+        openapi.Parameter(
+            'exam_type',
+            openapi.IN_QUERY,
+            description="시험 종류 (생략 시 default)",
+            type=openapi.TYPE_STRING,
+            required=False
+        )
+    ],
+    responses={
+        200: CalendarResponseSerializer,
+        400: ErrorResponseSerializer,
+        401: ErrorResponseSerializer,
+        429: ErrorResponseSerializer
+    }
+)
+@query_budget(1)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@throttle_classes(token_bucket_throttles('availability'))
+@conditional_on_version(lambda request: CALENDAR_VERSION_KEY, _calendar_etag_suffix)
+def calendar_view(request):
+    """
+    예약 가능 인원 달력 조회 API
+    
+    - 로그인이 필요합니다.
+    - 시험 종류(생략 시 default)의 날짜별 전체 남은 인원, 가장 적게 남은 시간대와 인원, 마감된 시간대 수를 반환합니다.
+    - 날짜 단위 요약이므로 당일 이미 지난 시간대도 포함됩니다.
+    """
+    exam_type = request.query_params.get('exam_type', DEFAULT_EXAM_TYPE)
+    if not is_exam_type(exam_type):
+        return Response(ErrorResponseSerializer({'error': '알 수 없는 시험 종류입니다.'}).data, status=status.HTTP_400_BAD_REQUEST)
+    
+    current_date = timezone.now().date()
+    summaries = DailySummary.objects.filter(
+        exam_type=exam_type,
+        date__gte=current_date + timedelta(days=3),
+        date__lte=current_date + timedelta(days=90)
+    )
+    
+    return Response(CalendarResponseSerializer({'message': '날짜별 예약 가능 인원을 조회했습니다.',
+                                                'days': DailySummarySerializer(summaries, many=True).data}).data)
+
+
+@swagger_auto_schema(
+    method='patch',
+    operation_summary="관리자용 시간대 최대 인원 일괄 변경 API",
+    operation_description="날짜/시간 범위(요일 지정 가능)의 시간대 최대 인원을 한 번에 지정한 값(max_capacity)으로 바꾸거나 "
+                          "배율(scale)로 조정합니다. 사용 인원보다 작아지는 시간대는 바꾸지 않고 rejected로 반환합니다.",
+    request_body=CapacityAdjustSerializer,
+    responses={
+        200: CapacityAdjustResponseSerializer,
+        400: ErrorResponseSerializer,
+        403: ErrorResponseSerializer
+    }
+)
+@query_budget(10)
+@api_view(['PATCH'])
+@permission_classes([IsAdminUser])
+def admin_capacity_view(request):
+    """
+    시간대 최대 인원 일괄 변경 관리자 API
+
+    변경된 날짜의 요약과 예약 가능 시간대 조회 버전(캐시)을 함께 갱신합니다.
+    """
+    serializer = CapacityAdjustSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(ErrorResponseSerializer(serializer.errors).data, status=status.HTTP_400_BAD_REQUEST)
+
+    data = serializer.validated_data
+    # 시각 범위는 시험 종류별 시간대 단위로 시간대 번호(slot_index) 범위로 바꿔 조회합니다.
+    slots = ExamSlot.objects.filter(
+        time_of_day_condition(data['start_time'], data.get('end_time'), data.get('exam_type')),
+        date__gte=data['start_date'],
+        date__lte=data['end_date']
+    )
+    if data.get('weekdays'):
+        slots = slots.filter(date__iso_week_day__in=data['weekdays'])
+    if data.get('venue'):
+        slots = slots.filter(venue=data['venue'])
+
+    updated, rejected = ExamSlot.adjust_capacity(slots, max_capacity=data.get('max_capacity'), scale=data.get('scale'))
+    return Response(CapacityAdjustResponseSerializer({
+        'message': '시간대 최대 인원을 변경했습니다.',
+        'updated': updated,
+        'rejected': rejected,
+    }).data)
+
+
+@swagger_auto_schema(
+    method='get',
+    operation_summary="시험장 목록 조회 API",
+    operation_description="예약할 수 있는 시험장 목록을 조회합니다.",
+    responses={
+        200: VenueListResponseSerializer,
+        401: ErrorResponseSerializer
+    }
+)
+@swagger_auto_schema(
+    method='post',
+    operation_summary="관리자용 시험장 추가 API",
+    operation_description="시험장을 추가하고 현재 조회 가능한 기간의 시간대를 새 시험장에 생성합니다.",
+    request_body=VenueSerializer,
+    responses={
+        201: VenueSerializer,
+        400: ErrorResponseSerializer,
+        403: ErrorResponseSerializer
+    }
+)
+@query_budget(GET=1, POST=11)
+@api_view(['GET', 'POST'])
+@permission_classes([IsAuthenticated])
+def venue_view(request):
+    """
+    시험장 목록 조회 / 추가 API
+
+    - 목록 조회는 로그인한 사용자 모두 가능합니다.
+    - 추가는 관리자만 가능하며, 기존 시험장의 마지막 날짜까지 시간대를 함께 생성합니다.
+    """
+    if request.method == 'GET':
+        return Response(VenueListResponseSerializer({'message': '시험장 목록을 조회했습니다.',
+                                                     'venues': Venue.objects.all()}).data)
+
+    if not request.user.is_staff:
+        return Response(ErrorResponseSerializer({'error': '관리자만 시험장을 추가할 수 있습니다.'}).data,
+                         status=status.HTTP_403_FORBIDDEN)
+
+    serializer = VenueSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(ErrorResponseSerializer(serializer.errors).data, status=status.HTTP_400_BAD_REQUEST)
+
+    with transaction.atomic():
+        venue = serializer.save()
+        # 이미 시작된 시간대는 제외하고, 기존 시간대가 있는 마지막 날까지 생성합니다.
+        now = timezone.now().replace(second=0, microsecond=0) + timedelta(minutes=1)
+        last_date = ExamSlot.objects.aggregate(last_date=Max('date'))['last_date']
+        end_time = datetime.combine(last_date + timedelta(days=1), datetime.min.time()) if last_date else now + timedelta(days=90)
+
+        dates = ExamSlot.generate_slots(now, end_time, venues=[venue])
+        if dates:
+            DailySummary.refresh(dates)
+            bump_versions(*{slots_version_key(date) for date in dates})
+
+    return Response(VenueSerializer(venue).data, status=status.HTTP_201_CREATED)
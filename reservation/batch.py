@@ -0,0 +1,277 @@
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.utils import timezone
+from rest_framework import serializers
+from common.versioning import bump_versions, user_version_key
+from examslots import capacity
+from examslots.granularity import DEFAULT_EXAM_TYPE
+from examslots.models import ExamSlot, Venue, range_condition
+from .models import Reservation, ReservationEvent
+from .serializers import ReservationBatchOperationSerializer, ReservationDetailSerializer, validate_schedule
+
+User = get_user_model()
+
+
+def _first_message(detail):
+    # DRF ValidationError의 detail(dict/list)에서 첫 번째 메시지를 꺼냅니다.
+    if isinstance(detail, dict):
+        field, value = next(iter(detail.items()))
+        message = _first_message(value)
+        return message if field == 'non_field_errors' else f"{field}: {message}"
+    if isinstance(detail, list):
+        return _first_message(detail[0])
+    return str(detail)
+
+
+class BatchPlan:
+    """
+    일괄 처리 작업들을 메모리에서 순서대로 적용해 보는 상태
+
+    시간대의 used_count를 직접 바꾸어 가며 확인하므로, 앞의 작업이 해제한 인원은 뒤의 작업이 사용할 수 있습니다.
+    작업 하나가 실패하면 그 작업이 바꾼 상태는 없습니다.
+    """
+
+    def __init__(self, reservations, reservation_slots, slots, user_ids, venue_ids):
+        self.reservations = reservations
+        self.reservation_slots = reservation_slots
+        self.slots = slots
+        self.user_ids = user_ids
+        self.venue_ids = venue_ids
+        self.initial_usage = {slot_id: slot.used_count for slot_id, slot in slots.items()}
+        self.now = timezone.now()
+        self.created = []
+        self.updated = {}
+        self.events = []
+
+    def _use(self, slot_ids, count):
+        for slot_id in slot_ids:
+            self.slots[slot_id].used_count += count
+
+    def _allocate(self, start_time, end_time, count, exam_type, venue):
+        candidates = [
+            slot for slot in self.slots.values()
+            if slot.exam_type == exam_type and start_time <= slot.start_time < end_time
+            and (venue is None or slot.venue_id == venue)
+        ]
+        return [slot.id for slot in ExamSlot.choose_venue(candidates, count)]
+
+    def _get(self, reservation_id):
+        reservation = self.reservations.get(reservation_id)
+        if reservation is None:
+            raise ValidationError("예약을 찾을 수 없습니다.")
+        return reservation
+
+    def _touch(self, reservation, event_type):
+        reservation.updated_at = self.now
+        self.updated[reservation.id] = reservation
+        self.events.append((reservation, event_type))
+
+    def create(self, data, default_user_id):
+        user_id = data.get('user', default_user_id)
+        if user_id not in self.user_ids:
+            raise ValidationError("사용자를 찾을 수 없습니다.")
+        venue = data.get('venue')
+        if venue is not None and venue not in self.venue_ids:
+            raise ValidationError("시험장을 찾을 수 없습니다.")
+        exam_type = data.get('exam_type', DEFAULT_EXAM_TYPE)
+        validate_schedule(data['start_time'], data['end_time'], data['count'], exam_type)
+
+        slot_ids = self._allocate(data['start_time'], data['end_time'], data['count'], exam_type, venue)
+        reservation = Reservation(
+            user_id=user_id,
+            exam_type=exam_type,
+            venue_id=self.slots[slot_ids[0]].venue_id,
+            start_time=data['start_time'],
+            end_time=data['end_time'],
+            count=data['count'],
+            status='pending'
+        )
+        self.created.append((reservation, slot_ids))
+        self.events.append((reservation, 'created'))
+        return reservation
+
+    def modify(self, data):
+        reservation = self._get(data['reservation'])
+        if reservation.status == 'cancelled':
+            raise ValidationError("취소된 예약은 수정할 수 없습니다.")
+        validate_schedule(data.get('start_time'), data.get('end_time'), data.get('count'), reservation.exam_type)
+        start_time = data.get('start_time', reservation.start_time)
+        end_time = data.get('end_time', reservation.end_time)
+        count = data.get('count', reservation.count)
+        if start_time >= end_time:
+            raise ValidationError("예약 시작 시간이 종료 시간보다 크거나 같을 수 없습니다.")
+
+        # 확정된 예약은 기존 인원을 해제한 상태에서 새 시간대를 확인합니다. (Reservation.modify와 같음)
+        current_slot_ids = self.reservation_slots.get(reservation.id, [])
+        if reservation.status == 'accepted':
+            self._use(current_slot_ids, -reservation.count)
+        try:
+            slot_ids = self._allocate(start_time, end_time, count, reservation.exam_type, reservation.venue_id)
+        except ValidationError as e:
+            if reservation.status == 'accepted':
+                self._use(current_slot_ids, reservation.count)
+            raise ValidationError(f"예약 변경이 불가능합니다: {e.messages[0]}")
+        if reservation.status == 'accepted':
+            self._use(slot_ids, count)
+
+        reservation.start_time, reservation.end_time, reservation.count = start_time, end_time, count
+        self.reservation_slots[reservation.id] = slot_ids
+        self._touch(reservation, 'modified')
+        return reservation
+
+    def cancel(self, data):
+        reservation = self._get(data['reservation'])
+        if reservation.status == 'cancelled':
+            return reservation
+
+        if reservation.status == 'accepted':
+            self._use(self.reservation_slots.get(reservation.id, []), -reservation.count)
+        reservation.status = 'cancelled'
+        self.reservation_slots[reservation.id] = []
+        self._touch(reservation, 'cancelled')
+        return reservation
+
+    def confirm(self, data):
+        reservation = self._get(data['reservation'])
+        if reservation.status != 'pending':
+            raise ValidationError("대기 중인 예약만 확정할 수 있습니다.")
+        slot_ids = self.reservation_slots.get(reservation.id, [])
+        if not slot_ids:
+            raise ValidationError("예약에 해당하는 시간대가 없습니다.")
+        for slot_id in slot_ids:
+            if self.slots[slot_id].remaining_capacity < reservation.count:
+                raise ValidationError(f"슬롯 {slot_id}의 최대 인원 수를 초과할 수 없습니다.")
+
+        self._use(slot_ids, reservation.count)
+        reservation.status = 'accepted'
+        self._touch(reservation, 'confirmed')
+        return reservation
+
+    def usage_changes(self):
+        return {
+            slot_id: slot.used_count - self.initial_usage[slot_id]
+            for slot_id, slot in self.slots.items()
+            if slot.used_count != self.initial_usage[slot_id]
+        }
+
+    def save(self):
+        """메모리에서 적용한 결과를 작업 수와 관계없이 같은 수의 문장으로 저장합니다."""
+        through = Reservation.exam_slots.through
+        ExamSlot.apply_slot_changes(self.usage_changes())
+
+        created = Reservation.objects.bulk_create([reservation for reservation, _ in self.created])
+        Reservation.objects.bulk_update(list(self.updated.values()), ['start_time', 'end_time', 'count', 'status', 'updated_at'])
+
+        # 수정/취소된 예약은 연결 행을 지우고 현재 시간대로 다시 만듭니다.
+        through.objects.filter(reservation_id__in=list(self.updated)).delete()
+        through.objects.bulk_create(
+            [through(reservation_id=reservation.id, examslot_id=slot_id)
+             for reservation, (_, slot_ids) in zip(created, self.created) for slot_id in slot_ids]
+            + [through(reservation_id=reservation_id, examslot_id=slot_id)
+               for reservation_id in self.updated for slot_id in self.reservation_slots[reservation_id]]
+        )
+
+        ReservationEvent.objects.bulk_create([reservation.build_event(event_type) for reservation, event_type in self.events])
+        bump_versions(*{user_version_key(reservation.user_id) for reservation, _ in self.events})
+
+
+def _load(operations, default_user_id):
+    """
+    작업에 필요한 예약, 사용자, 시험장, 시간대를 작업 수와 관계없이 같은 수의 쿼리로 불러옵니다.
+    인원이 바뀔 수 있는 시간대(기존 예약의 시간대, 수정 범위)는 인원 관리 방식의 잠금을 잡은 뒤 사용 인원을 읽습니다.
+    """
+    reservation_ids = {data['reservation'] for data in operations if 'reservation' in data}
+    reservations = {
+        reservation.id: reservation
+        for reservation in Reservation.objects.select_for_update().filter(id__in=reservation_ids).order_by('id')
+    }
+    reservation_slots = {}
+    for reservation_id, slot_id in Reservation.exam_slots.through.objects.filter(
+        reservation_id__in=list(reservations)
+    ).order_by('reservation_id', 'examslot_id').values_list('reservation_id', 'examslot_id'):
+        reservation_slots.setdefault(reservation_id, []).append(slot_id)
+
+    user_ids = {data.get('user', default_user_id) for data in operations if data['op'] == 'create'}
+    user_ids = set(User.objects.filter(id__in=user_ids).values_list('id', flat=True)) if user_ids else set()
+    venue_ids = {data['venue'] for data in operations if data['op'] == 'create' and 'venue' in data}
+    venue_ids = set(Venue.objects.filter(id__in=venue_ids).values_list('id', flat=True)) if venue_ids else set()
+
+    locked = models.Q(id__in=[slot_id for slot_ids in reservation_slots.values() for slot_id in slot_ids])
+    condition = models.Q(pk__in=[])
+    for data in operations:
+        if data['op'] == 'create':
+            condition |= range_condition(data['start_time'], data['end_time'], data.get('exam_type', DEFAULT_EXAM_TYPE))
+        elif data['op'] == 'modify' and data['reservation'] in reservations:
+            reservation = reservations[data['reservation']]
+            start_time = data.get('start_time', reservation.start_time)
+            end_time = data.get('end_time', reservation.end_time)
+            if start_time < end_time:
+                locked |= range_condition(start_time, end_time, reservation.exam_type) & models.Q(venue_id=reservation.venue_id)
+
+    slots = {
+        slot.id: slot
+        for slot in ExamSlot.objects.filter(condition | locked).annotate(
+            needs_lock=models.ExpressionWrapper(locked, output_field=models.BooleanField())
+        ).order_by('id')
+    }
+    backend = capacity.get_backend()
+    backend.lock([slot.id for slot in slots.values() if slot.needs_lock])
+    usage = dict(backend.annotate(ExamSlot.objects.filter(id__in=list(slots))).values_list('id', 'used_count'))
+    for slot in slots.values():
+        slot.used_count = usage[slot.id]
+
+    return BatchPlan(reservations, reservation_slots, slots, user_ids, venue_ids)
+
+
+def run_batch(operations, default_user_id, atomic=True):
+    """
+    예약 생성/수정/취소/확정 작업 목록을 하나의 트랜잭션에서 순서대로 처리하고 작업별 결과 목록을 반환합니다.
+
+    - 모든 작업을 먼저 메모리에서 적용해 보고, 시간대 인원 변경은 시간대별로 합산하여 한 번에 반영합니다.
+    - atomic이면 하나라도 실패할 때 아무것도 반영하지 않고, 나머지 작업은 skipped로 표시합니다.
+    - atomic이 아니면 실패한 작업만 건너뛰고 나머지를 반영합니다.
+    """
+    results = []
+    valid = []
+    for index, operation in enumerate(operations):
+        serializer = ReservationBatchOperationSerializer(data=operation)
+        results.append({'index': index, 'op': operation.get('op')})
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            results[index].update(status='failed', error=_first_message(serializer.errors))
+
+    with transaction.atomic():
+        plan = _load([data for _, data in valid], default_user_id)
+        applied = []
+        # 생성된 예약은 저장한 뒤 id와 함께 직렬화합니다.
+        created = {}
+        for index, data in valid:
+            try:
+                if data['op'] == 'create':
+                    reservation = plan.create(data, default_user_id)
+                else:
+                    reservation = getattr(plan, data['op'])(data)
+            except ValidationError as e:
+                results[index].update(status='failed', error=e.messages[0])
+            except serializers.ValidationError as e:
+                results[index].update(status='failed', error=_first_message(e.detail))
+            else:
+                results[index]['status'] = 'succeeded'
+                if reservation.id is None:
+                    created[index] = reservation
+                else:
+                    results[index]['reservation'] = ReservationDetailSerializer(reservation).data
+                applied.append(index)
+
+        if atomic and len(applied) != len(results):
+            for index in applied:
+                results[index] = {'index': index, 'op': results[index]['op'], 'status': 'skipped'}
+            return results
+
+        plan.save()
+
+    for index, reservation in created.items():
+        results[index]['reservation'] = ReservationDetailSerializer(reservation).data
+    return results
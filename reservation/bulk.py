@@ -0,0 +1,102 @@
+import logging
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+from common.versioning import bump_versions, user_version_key
+from examslots.models import ExamSlot
+from .models import Reservation, ReservationEvent
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+def find_affected_reservations(start_time, end_time, venue=None):
+    """
+    범위 안의 시간대에 연결된 취소되지 않은 예약 id를 한 번의 쿼리로 조회합니다.
+    venue(시험장 id)를 지정하면 그 시험장의 시간대만 대상으로 합니다. (시험장 휴무)
+    """
+    slots = ExamSlot.objects.in_range(start_time, end_time)
+    if venue is not None:
+        slots = slots.filter(venue_id=venue)
+    return list(
+        Reservation.objects.filter(exam_slots__in=slots)
+        .exclude(status='cancelled')
+        .order_by('id')
+        .values_list('id', flat=True)
+        .distinct()
+    )
+
+
+def cancel_chunk(reservation_ids):
+    """
+    예약들을 하나의 트랜잭션에서 취소하고 (취소한 예약 목록, 인원을 해제한 시간대 수)를 반환합니다.
+
+    예약 수와 관계없이 같은 수의 문장으로 처리합니다.
+    - 확정 예약의 인원을 시간대별로 합산하여 한 번에 해제
+    - 예약-시간대 연결 행 삭제, 예약 상태 변경, outbox 이벤트 추가
+    """
+    through = Reservation.exam_slots.through
+    with transaction.atomic():
+        # 그 사이에 취소된 예약은 제외합니다.
+        reservations = list(
+            Reservation.objects.select_for_update().filter(id__in=reservation_ids).exclude(status='cancelled').order_by('id')
+        )
+        ids = [reservation.id for reservation in reservations]
+        accepted_ids = [reservation.id for reservation in reservations if reservation.status == 'accepted']
+
+        totals = dict(
+            through.objects.filter(reservation_id__in=accepted_ids)
+            .values('examslot_id')
+            .annotate(total=Sum('reservation__count'))
+            .values_list('examslot_id', 'total')
+        ) if accepted_ids else {}
+        ExamSlot.release_slots(totals)
+
+        through.objects.filter(reservation_id__in=ids).delete()
+        Reservation.objects.filter(id__in=ids).update(status='cancelled', updated_at=timezone.now())
+
+        for reservation in reservations:
+            reservation.status = 'cancelled'
+        ReservationEvent.objects.bulk_create([reservation.build_event('cancelled') for reservation in reservations])
+        bump_versions(*{user_version_key(reservation.user_id) for reservation in reservations})
+
+    return reservations, len(totals)
+
+
+def bulk_cancel(reservation_ids, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    예약들을 chunk_size개씩 나누어 취소하며 진행 상황을 dict로 하나씩 반환(yield)합니다.
+
+    - progress: 처리한 묶음마다 누적 취소 수와 이번 묶음에서 취소된 예약의 사용자 id (알림 발송용)
+    - error: 묶음 처리에 실패하면 그 묶음은 롤백되고 중단합니다. (이전 묶음은 이미 커밋됨)
+    - done: 전체 취소 수와 사용자 수
+    """
+    total = len(reservation_ids)
+    cancelled = 0
+    user_ids = set()
+
+    for offset in range(0, total, chunk_size):
+        try:
+            reservations, released_slots = cancel_chunk(reservation_ids[offset:offset + chunk_size])
+        except ValidationError as e:
+            yield {'type': 'error', 'error': ' '.join(e.messages), 'cancelled': cancelled, 'total': total}
+            return
+        except Exception as e:
+            logger.error(f"Error cancelling reservations {reservation_ids[offset]}~: {str(e)}")
+            yield {'type': 'error', 'error': '예약 취소 중 오류가 발생했습니다.', 'cancelled': cancelled, 'total': total}
+            return
+
+        chunk_user_ids = sorted({reservation.user_id for reservation in reservations})
+        cancelled += len(reservations)
+        user_ids.update(chunk_user_ids)
+        yield {
+            'type': 'progress',
+            'cancelled': cancelled,
+            'total': total,
+            'released_slots': released_slots,
+            'user_ids': chunk_user_ids,
+        }
+
+    yield {'type': 'done', 'cancelled': cancelled, 'total': total, 'users': len(user_ids)}
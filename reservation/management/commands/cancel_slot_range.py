@@ -0,0 +1,31 @@
+import json
+from datetime import datetime
+from django.core.management.base import BaseCommand, CommandError
+from reservation.bulk import DEFAULT_CHUNK_SIZE, bulk_cancel, find_affected_reservations
+
+
+def _parse_time(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d %H:%M')
+    except ValueError:
+        raise CommandError(f"시간 형식이 올바르지 않습니다 (YYYY-MM-DD HH:MM): {value}")
+
+
+class Command(BaseCommand):
+    help = '시간대 범위(start 이상 end 미만)에 연결된 모든 예약을 취소하고 진행 상황을 NDJSON으로 출력합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', required=True, help="범위 시작 (예: '2025-04-15 00:00')")
+        parser.add_argument('--end', required=True, help="범위 끝, 이 시각에 시작하는 시간대는 제외 (예: '2025-04-16 00:00')")
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='한 트랜잭션에서 취소할 예약 수')
+        parser.add_argument('--venue', type=int, help='취소할 시험장 ID (생략 시 모든 시험장)')
+
+    def handle(self, *args, **options):
+        start_time, end_time = _parse_time(options['start']), _parse_time(options['end'])
+        if start_time >= end_time:
+            raise CommandError("범위의 시작이 끝보다 앞서야 합니다.")
+
+        for item in bulk_cancel(find_affected_reservations(start_time, end_time, options['venue']), options['chunk_size']):
+            self.stdout.write(json.dumps(item, ensure_ascii=False))
+            if item['type'] == 'error':
+                raise CommandError(item['error'])
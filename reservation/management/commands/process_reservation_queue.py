@@ -0,0 +1,48 @@
+import signal
+import threading
+from django.core.management.base import BaseCommand
+from django.db import connection
+from reservation.queue import default_consumer_name, run_worker
+
+
+class Command(BaseCommand):
+    help = '비동기 예약 요청 스트림을 처리하는 워커를 실행합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=1, help='워커 스레드 수')
+        parser.add_argument('--batch-size', type=int, default=500, help='한 번에 가져올 요청 수')
+        parser.add_argument('--block-ms', type=int, default=1000, help='새 요청 대기 시간(ms)')
+        parser.add_argument('--claim-idle-ms', type=int, default=60000,
+                            help='이 시간(ms) 이상 ACK 되지 않은 다른 워커의 메시지를 가져옴')
+        parser.add_argument('--claim-interval', type=int, default=30, help='남은 메시지를 가져오는 주기(초)')
+
+    def handle(self, *args, **options):
+        stop_event = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+
+        def work(index):
+            try:
+                run_worker(
+                    default_consumer_name(index),
+                    batch_size=options['batch_size'],
+                    block_ms=options['block_ms'],
+                    claim_idle_ms=options['claim_idle_ms'],
+                    claim_interval=options['claim_interval'],
+                    stop_event=stop_event
+                )
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=work, args=(i,), daemon=True) for i in range(options['workers'])]
+        for thread in threads:
+            thread.start()
+        self.stdout.write(self.style.SUCCESS(f"예약 요청 워커 {len(threads)}개를 시작했습니다."))
+
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(timeout=1)
+        except KeyboardInterrupt:
+            stop_event.set()
+            for thread in threads:
+                thread.join()
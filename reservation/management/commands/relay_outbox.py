@@ -0,0 +1,37 @@
+import signal
+import threading
+from django.core.management.base import BaseCommand
+from reservation.outbox import purge_published, relay_batch, run_relay
+
+
+class Command(BaseCommand):
+    help = '예약 이벤트 outbox를 Redis Stream(reservation:events)으로 발행합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='한 번에 발행할 이벤트 수')
+        parser.add_argument('--interval', type=float, default=0.5, help='발행할 이벤트가 없을 때 대기 시간(초)')
+        parser.add_argument('--once', action='store_true', help='밀린 이벤트를 모두 발행한 뒤 종료')
+        parser.add_argument('--purge-days', type=int, help='발행 후 지정한 일수가 지난 이벤트 삭제')
+
+    def handle(self, *args, **options):
+        if options['purge_days'] is not None:
+            deleted = purge_published(options['purge_days'])
+            self.stdout.write(f"발행 완료 이벤트 {deleted}건을 삭제했습니다.")
+
+        if options['once']:
+            total = 0
+            while True:
+                published = relay_batch(options['batch_size'])
+                total += published
+                if published < options['batch_size']:
+                    break
+            self.stdout.write(self.style.SUCCESS(f"이벤트 {total}건을 발행했습니다."))
+            return
+
+        stop_event = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+        self.stdout.write(self.style.SUCCESS("예약 이벤트 relay를 시작했습니다."))
+        try:
+            run_relay(options['batch_size'], options['interval'], stop_event)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from reservation.outbox import create_consumer_group, replay_from
+
+
+class Command(BaseCommand):
+    help = '예약 이벤트 소비자 그룹을 생성하거나 읽기 위치를 되돌려 이벤트를 다시 받도록 합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('group', help='소비자 그룹 이름')
+        parser.add_argument('--from', dest='start_id', default='0', help="다시 받을 시작 스트림 ID (기본: '0', 처음부터)")
+
+    def handle(self, *args, **options):
+        create_consumer_group(options['group'], options['start_id'])
+        replay_from(options['group'], options['start_id'])
+        self.stdout.write(self.style.SUCCESS(f"{options['group']} 그룹이 {options['start_id']} 이후의 이벤트를 다시 받습니다."))
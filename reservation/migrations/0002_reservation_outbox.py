@@ -0,0 +1,29 @@
+# Generated by Django 5.2 on 2026-10-19 18:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservation', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReservationEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('reservation_id', models.BigIntegerField()),
+                ('user_id', models.BigIntegerField()),
+                ('event_type', models.CharField(choices=[('created', 'Created'), ('modified', 'Modified'), ('confirmed', 'Confirmed'), ('cancelled', 'Cancelled')], max_length=20)),
+                ('payload', models.JSONField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('published_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'reservation_outbox',
+                'indexes': [models.Index(condition=models.Q(('published_at__isnull', True)), fields=['id'], name='reservation_outbox_pending_idx')],
+            },
+        ),
+    ]
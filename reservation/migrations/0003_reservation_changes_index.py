@@ -0,0 +1,20 @@
+# Generated by Django 5.2 on 2026-10-19 18:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('examslots', '0001_initial'),
+        ('reservation', '0002_reservation_outbox'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['user', 'updated_at', 'id'], name='reservations_user_changes_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-19 18:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservation', '0003_reservation_changes_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reservation',
+            name='exam_type',
+            field=models.CharField(db_default='default', default='default', help_text='시험 종류', max_length=30),
+        ),
+    ]
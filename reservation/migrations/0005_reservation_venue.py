@@ -0,0 +1,20 @@
+# Generated by Django 5.2 on 2026-10-19 19:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('examslots', '0006_venues'),
+        ('reservation', '0004_reservation_exam_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reservation',
+            name='venue',
+            field=models.ForeignKey(db_default=1, default=1, help_text='시험장', on_delete=django.db.models.deletion.PROTECT, related_name='reservations', to='examslots.venue'),
+        ),
+    ]
@@ -1,8 +1,11 @@
 from django.db import models
 from django.contrib.auth import get_user_model
-from examslots.models import ExamSlot
+from examslots.models import ExamSlot, Venue, DEFAULT_VENUE_ID
+from examslots.granularity import DEFAULT_EXAM_TYPE
 from django.db import transaction
 from django.core.exceptions import ValidationError
+from django.utils import timezone
+from common.versioning import bump_versions, user_version_key
 
 User = get_user_model()
 
@@ -14,6 +17,9 @@ class Reservation(models.Model):
     ]
 
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='reservations')
+    exam_type = models.CharField(max_length=30, default=DEFAULT_EXAM_TYPE, db_default=DEFAULT_EXAM_TYPE, help_text="시험 종류")
+    venue = models.ForeignKey(Venue, on_delete=models.PROTECT, related_name='reservations',
+                              default=DEFAULT_VENUE_ID, db_default=DEFAULT_VENUE_ID, help_text="시험장")
     exam_slots = models.ManyToManyField(ExamSlot, related_name='reservations')
     start_time = models.DateTimeField()
     end_time = models.DateTimeField()
@@ -25,9 +31,41 @@ class Reservation(models.Model):
     class Meta:
         db_table = 'reservations'
         app_label = 'reservation'
+        indexes = [
+            # 사용자별 변경분 조회 (updated_at, id 커서)
+            models.Index(fields=['user', 'updated_at', 'id'], name='reservations_user_changes_idx'),
+        ]
 
     def __str__(self):
-        return f"Reservation: {self.user.username} - {self.start_time} to {self.end_time}"
+        # 목록 출력 시 사용자 조회가 반복되지 않도록 user_id만 사용합니다.
+        return f"Reservation: {self.user_id} - {self.start_time} to {self.end_time}"
+
+    def build_event(self, event_type):
+        return ReservationEvent(
+            reservation_id=self.id,
+            user_id=self.user_id,
+            event_type=event_type,
+            payload={
+                'id': self.id,
+                'user_id': self.user_id,
+                'exam_type': self.exam_type,
+                'venue': self.venue_id,
+                'start_time': self.start_time.isoformat(),
+                'end_time': self.end_time.isoformat(),
+                'count': self.count,
+                'status': self.status,
+            }
+        )
+
+    def record_event(self, event_type):
+        """
+        예약 상태 변경 이벤트를 outbox에 기록합니다. 호출한 트랜잭션과 함께 커밋됩니다.
+        사용자의 예약 데이터 버전(ETag)도 함께 갱신합니다.
+        """
+        event = self.build_event(event_type)
+        event.save()
+        bump_versions(user_version_key(self.user_id))
+        return event
 
     @transaction.atomic
     def confirm(self):
@@ -38,14 +76,13 @@ class Reservation(models.Model):
         if not exam_slots:
             raise ValidationError("예약에 해당하는 시간대가 없습니다.")
             
-        slot_ids = [slot.id for slot in exam_slots]
-        locked_slots = ExamSlot.objects.select_for_update().filter(id__in=slot_ids)
+        # 인원 검사와 잠금은 update_slots(examslots.capacity)에서 처리합니다.
+        ExamSlot.update_slots(exam_slots, self.count)
         
-        ExamSlot.update_slots(locked_slots, self.count)
-        
-        Reservation.objects.filter(id=self.id).update(status='accepted')
+        Reservation.objects.filter(id=self.id).update(status='accepted', updated_at=timezone.now())
         
         self.refresh_from_db()
+        self.record_event('confirmed')
         return self
         
     @transaction.atomic
@@ -58,12 +95,12 @@ class Reservation(models.Model):
             raise ValidationError("예약 시작 시간이 종료 시간보다 크거나 같을 수 없습니다.")
         
         if self.status == 'accepted':
-            current_slots = list(self.exam_slots.select_for_update().all())
+            current_slots = list(self.exam_slots.all())
             
             ExamSlot.update_slots(current_slots, -self.count)
             
             try:
-                new_slots = ExamSlot.check_and_get_available_slots(start_time, end_time, count)
+                new_slots = ExamSlot.check_and_get_available_slots(start_time, end_time, count, self.exam_type, self.venue_id)
                 
                 self.start_time = start_time
                 self.end_time = end_time
@@ -78,7 +115,7 @@ class Reservation(models.Model):
                 raise ValidationError(f"예약 변경이 불가능합니다: {str(e)}")
                 
         else:
-            new_slots = ExamSlot.check_and_get_available_slots(start_time, end_time, count)
+            new_slots = ExamSlot.check_and_get_available_slots(start_time, end_time, count, self.exam_type, self.venue_id)
             
             self.start_time = start_time
             self.end_time = end_time
@@ -87,6 +124,7 @@ class Reservation(models.Model):
             
             self.exam_slots.set(new_slots)
             
+        self.record_event('modified')
         return self
         
     @transaction.atomic
@@ -95,12 +133,44 @@ class Reservation(models.Model):
             return self
             
         if self.status == 'accepted':
-            current_slots = list(self.exam_slots.select_for_update().all())
+            current_slots = list(self.exam_slots.all())
             ExamSlot.update_slots(current_slots, -self.count)
             
         self.exam_slots.clear()
         
         self.status = 'cancelled'
         self.save(update_fields=['status', 'updated_at'])
+        self.record_event('cancelled')
         
         return self
+
+
+class ReservationEvent(models.Model):
+    """
+    예약 상태 변경 이벤트 outbox
+
+    예약 변경과 같은 트랜잭션에서 기록되며, relay_outbox 명령이 Redis Stream으로 발행합니다.
+    """
+    EVENT_TYPES = [
+        ('created', 'Created'),
+        ('modified', 'Modified'),
+        ('confirmed', 'Confirmed'),
+        ('cancelled', 'Cancelled'),
+    ]
+
+    reservation_id = models.BigIntegerField()
+    user_id = models.BigIntegerField()
+    event_type = models.CharField(max_length=20, choices=EVENT_TYPES)
+    payload = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    published_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'reservation_outbox'
+        app_label = 'reservation'
+        indexes = [
+            models.Index(fields=['id'], condition=models.Q(published_at__isnull=True), name='reservation_outbox_pending_idx'),
+        ]
+
+    def __str__(self):
+        return f"ReservationEvent: {self.event_type} - {self.reservation_id}"
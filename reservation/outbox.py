@@ -0,0 +1,116 @@
+import json
+import logging
+import time
+from datetime import timedelta
+from django.db import connection, transaction
+from django.utils import timezone
+from redis.exceptions import ResponseError
+from common.distributed_lock import redis_client
+from .models import ReservationEvent
+
+logger = logging.getLogger(__name__)
+
+EVENT_STREAM_KEY = "reservation:events"
+EVENT_STREAM_MAXLEN = 1000000
+# pg_try_advisory_xact_lock(namespace, 0)의 namespace (한 번에 하나의 relay만 발행)
+RELAY_LOCK_NAMESPACE = 7302
+
+
+def _acquire_relay_lock():
+    """현재 트랜잭션이 끝날 때까지 relay 잠금을 잡습니다. 다른 relay가 발행 중이면 False를 반환합니다."""
+    if connection.vendor != 'postgresql':
+        return True
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_try_advisory_xact_lock(%s, 0)", [RELAY_LOCK_NAMESPACE])
+        return cursor.fetchone()[0]
+
+
+def relay_batch(batch_size=500):
+    """
+    발행되지 않은 outbox 이벤트를 id 순서로 Redis Stream에 발행합니다.
+
+    여러 relay 프로세스가 실행되어도 advisory lock으로 한 번에 하나만 발행하므로(나머지는 0 반환) 묶음끼리 순서가 섞이지 않습니다.
+    Redis 발행에 실패하면 트랜잭션이 롤백되어 다음 실행에서 다시 발행됩니다. (at-least-once)
+
+    순서 보장 범위
+    - 같은 예약의 이벤트: 예약 변경은 예약 단위로 순서대로 커밋되므로 뒤의 변경이 더 큰 id로 나중에 보이며, 발행 순서도 같습니다.
+    - 서로 다른 예약의 이벤트: 작은 id의 트랜잭션이 나중에 커밋되면 큰 id보다 늦게 발행될 수 있습니다.
+    소비자는 event_id로 중복을 거르고, 예약별 순서(reservation_id 단위)만 가정해야 합니다.
+    """
+    with transaction.atomic():
+        if not _acquire_relay_lock():
+            return 0
+        events = list(
+            ReservationEvent.objects.select_for_update()
+            .filter(published_at__isnull=True)
+            .order_by('id')[:batch_size]
+        )
+        if not events:
+            return 0
+
+        pipe = redis_client.pipeline(transaction=False)
+        for event in events:
+            pipe.xadd(EVENT_STREAM_KEY, {
+                'event_id': event.id,
+                'event_type': event.event_type,
+                'reservation_id': event.reservation_id,
+                'user_id': event.user_id,
+                'payload': json.dumps(event.payload),
+                'created_at': event.created_at.isoformat(),
+            }, maxlen=EVENT_STREAM_MAXLEN, approximate=True)
+        pipe.execute()
+
+        ReservationEvent.objects.filter(id__in=[event.id for event in events]).update(published_at=timezone.now())
+        return len(events)
+
+
+def purge_published(retention_days):
+    """보관 기간이 지난 발행 완료 이벤트를 삭제합니다."""
+    before = timezone.now() - timedelta(days=retention_days)
+    deleted, _ = ReservationEvent.objects.filter(published_at__lt=before).delete()
+    return deleted
+
+
+def run_relay(batch_size=500, interval=0.5, stop_event=None):
+    while stop_event is None or not stop_event.is_set():
+        try:
+            published = relay_batch(batch_size)
+        except Exception as e:
+            logger.error(f"Error relaying reservation events: {str(e)}")
+            published = 0
+        # 밀린 이벤트가 있으면 바로 다음 묶음을 처리합니다.
+        if published < batch_size:
+            time.sleep(interval)
+
+
+def create_consumer_group(group, start_id='$'):
+    """
+    이벤트 소비자 그룹을 생성합니다.
+    start_id가 '0'이면 스트림에 남아 있는 이벤트를 처음부터 받습니다.
+    """
+    try:
+        redis_client.xgroup_create(EVENT_STREAM_KEY, group, id=start_id, mkstream=True)
+    except ResponseError as e:
+        if 'BUSYGROUP' not in str(e):
+            raise
+
+
+def replay_from(group, start_id='0'):
+    """소비자 그룹의 읽기 위치를 start_id로 되돌려 이후 이벤트를 다시 받도록 합니다."""
+    redis_client.xgroup_setid(EVENT_STREAM_KEY, group, start_id)
+
+
+def read_events(group, consumer, count=100, block_ms=1000):
+    response = redis_client.xreadgroup(group, consumer, {EVENT_STREAM_KEY: '>'}, count=count, block=block_ms)
+    events = []
+    for _, messages in response or []:
+        for message_id, fields in messages:
+            fields = {key.decode(): value.decode() for key, value in fields.items()}
+            fields['payload'] = json.loads(fields['payload'])
+            events.append((message_id, fields))
+    return events
+
+
+def ack_events(group, message_ids):
+    if message_ids:
+        redis_client.xack(EVENT_STREAM_KEY, group, *message_ids)
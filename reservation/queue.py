@@ -0,0 +1,261 @@
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from redis.exceptions import ResponseError
+from common.distributed_lock import redis_client
+from common.versioning import bump_versions, user_version_key
+from examslots.models import ExamSlot, range_condition
+from examslots.granularity import DEFAULT_EXAM_TYPE, first_index, minute_of_day, slot_minutes, slot_start
+from .models import Reservation, ReservationEvent
+from .serializers import ReservationDetailSerializer
+
+logger = logging.getLogger(__name__)
+
+STREAM_KEY = "reservation:requests"
+GROUP_NAME = "reservation-workers"
+REQUEST_KEY_PREFIX = "reservation:request:"
+REQUEST_TTL = 60 * 60 * 24
+STREAM_MAXLEN = 1000000
+
+
+def enqueue_reservation(user_id, start_time, end_time, count, exam_type=DEFAULT_EXAM_TYPE, venue=None):
+    """예약 요청을 Redis Stream에 등록하고 번호표(ticket)를 반환합니다. (venue를 생략하면 워커가 시험장을 배정)"""
+    ticket = uuid.uuid4().hex
+    pipe = redis_client.pipeline()
+    pipe.hset(f"{REQUEST_KEY_PREFIX}{ticket}", mapping={'status': 'queued', 'user_id': user_id})
+    pipe.expire(f"{REQUEST_KEY_PREFIX}{ticket}", REQUEST_TTL)
+    pipe.xadd(STREAM_KEY, {
+        'ticket': ticket,
+        'user_id': user_id,
+        'start_time': start_time.isoformat(),
+        'end_time': end_time.isoformat(),
+        'count': count,
+        'exam_type': exam_type,
+        'venue': venue or '',
+    }, maxlen=STREAM_MAXLEN, approximate=True)
+    pipe.execute()
+    return ticket
+
+
+def get_request_status(ticket):
+    data = redis_client.hgetall(f"{REQUEST_KEY_PREFIX}{ticket}")
+    if not data:
+        return None
+    data = {key.decode(): value.decode() for key, value in data.items()}
+    result = {'ticket': ticket, 'status': data['status'], 'user_id': int(data['user_id'])}
+    if 'reservation' in data:
+        result['reservation'] = json.loads(data['reservation'])
+    if 'error' in data:
+        result['error'] = data['error']
+    return result
+
+
+def _slot_keys(start_time, end_time, exam_type):
+    """요청 범위의 (시험 종류, 날짜, 시간대 번호) 목록"""
+    minutes = slot_minutes(exam_type)
+    keys = []
+    current = slot_start(start_time.date(), first_index(start_time, minutes), minutes)
+    while current < end_time:
+        keys.append((exam_type, current.date(), minute_of_day(current) // minutes))
+        current += timedelta(minutes=minutes)
+    return keys
+
+
+def _group_requests(requests):
+    """같은 시간대를 하나라도 공유하는 요청끼리 묶습니다. (union-find)"""
+    parent = list(range(len(requests)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    owner = {}
+    for i, request in enumerate(requests):
+        for key in request['slot_keys']:
+            if key in owner:
+                parent[find(i)] = find(owner[key])
+            else:
+                owner[key] = i
+
+    groups = {}
+    for i, request in enumerate(requests):
+        groups.setdefault(find(i), []).append(request)
+    return list(groups.values())
+
+
+def _lock_slots(group):
+    """
+    그룹의 요청 범위에 해당하는 시간대만 잠그고 (시험 종류, 날짜, 시간대 번호)별 목록으로 반환합니다.
+    시험장을 지정한 요청은 그 시험장의 시간대만 잠급니다. (범위 사이의 다른 날짜/시간대나 다른 시험장은 잠그지 않음)
+    """
+    condition = models.Q(pk__in=[])
+    for request in group:
+        request_condition = range_condition(request['start_time'], request['end_time'], request['exam_type'])
+        if request['venue'] is not None:
+            request_condition &= models.Q(venue_id=request['venue'])
+        condition |= request_condition
+
+    slots = {}
+    for slot in ExamSlot.objects.select_for_update().with_usage().filter(condition).order_by('id'):
+        slots.setdefault((slot.exam_type, slot.date, slot.slot_index), []).append(slot)
+    return slots
+
+
+def _apply_group(group):
+    """
+    하나의 그룹을 하나의 트랜잭션으로 처리합니다.
+    요청 범위의 시간대만 한 번에 잠그고 조회한 뒤 요청마다 시험장을 배정하고,
+    예약과 예약-시간대 연결 행을 각각 bulk insert 합니다.
+    """
+    with transaction.atomic():
+        slots = _lock_slots(group)
+
+        accepted = []
+        for request in group:
+            candidates = [
+                slot for key in request['slot_keys'] for slot in slots.get(key, [])
+                if request['venue'] is None or slot.venue_id == request['venue']
+            ]
+            try:
+                request['slots'] = ExamSlot.choose_venue(candidates, request['count'])
+            except ValidationError as e:
+                request['error'] = e.messages[0]
+                continue
+            accepted.append(request)
+
+        reservations = Reservation.objects.bulk_create([
+            Reservation(
+                user_id=request['user_id'],
+                exam_type=request['exam_type'],
+                venue_id=request['slots'][0].venue_id,
+                start_time=request['start_time'],
+                end_time=request['end_time'],
+                count=request['count'],
+                status='pending'
+            )
+            for request in accepted
+        ])
+
+        through = Reservation.exam_slots.through
+        through.objects.bulk_create([
+            through(reservation_id=reservation.id, examslot_id=slot.id)
+            for request, reservation in zip(accepted, reservations)
+            for slot in request['slots']
+        ])
+
+        ReservationEvent.objects.bulk_create([reservation.build_event('created') for reservation in reservations])
+        bump_versions(*{user_version_key(reservation.user_id) for reservation in reservations})
+
+    for request, reservation in zip(accepted, reservations):
+        request['reservation'] = ReservationDetailSerializer(reservation).data
+
+
+def process_messages(messages):
+    """
+    스트림 메시지 묶음을 처리하고 각 번호표에 결과를 기록합니다.
+    처리한 메시지 ID 목록을 반환합니다.
+    """
+    requests = []
+    for message_id, fields in messages:
+        fields = {key.decode(): value.decode() for key, value in fields.items()}
+        start_time = datetime.fromisoformat(fields['start_time'])
+        end_time = datetime.fromisoformat(fields['end_time'])
+        # 시험 종류가 없는 이전 형식의 메시지는 기본 종류로, 시험장이 없으면 자동 배정으로 처리합니다.
+        exam_type = fields.get('exam_type', DEFAULT_EXAM_TYPE)
+        venue = int(fields['venue']) if fields.get('venue') else None
+        requests.append({
+            'message_id': message_id,
+            'ticket': fields['ticket'],
+            'user_id': int(fields['user_id']),
+            'start_time': start_time,
+            'end_time': end_time,
+            'count': int(fields['count']),
+            'exam_type': exam_type,
+            'venue': venue,
+            'slot_keys': _slot_keys(start_time, end_time, exam_type),
+        })
+
+    for group in _group_requests(requests):
+        try:
+            _apply_group(group)
+        except Exception as e:
+            logger.error(f"Error processing reservation batch: {str(e)}")
+            for request in group:
+                request.setdefault('error', '예약 처리 중 오류가 발생했습니다. 다시 시도해주세요.')
+
+    pipe = redis_client.pipeline()
+    for request in requests:
+        key = f"{REQUEST_KEY_PREFIX}{request['ticket']}"
+        if 'reservation' in request:
+            pipe.hset(key, mapping={'status': 'succeeded', 'reservation': json.dumps(request['reservation'])})
+        else:
+            pipe.hset(key, mapping={'status': 'failed', 'error': request.get('error', '예약 처리 중 오류가 발생했습니다.')})
+        pipe.expire(key, REQUEST_TTL)
+    pipe.execute()
+
+    return [request['message_id'] for request in requests]
+
+
+def ensure_group():
+    try:
+        redis_client.xgroup_create(STREAM_KEY, GROUP_NAME, id='0', mkstream=True)
+    except ResponseError as e:
+        if 'BUSYGROUP' not in str(e):
+            raise
+
+
+def default_consumer_name(index=0):
+    return f"{socket.gethostname()}-{os.getpid()}-{index}"
+
+
+def reclaim_pending(consumer, claim_idle_ms, batch_size=500):
+    """
+    다른 워커가 가져간 뒤 claim_idle_ms 이상 ACK 하지 않은 메시지(워커 종료 등)를 가져와 처리합니다.
+    처리한 메시지 수를 반환합니다.
+    """
+    processed = 0
+    start_id = '0-0'
+    while True:
+        start_id, claimed = redis_client.xautoclaim(
+            STREAM_KEY, GROUP_NAME, consumer, claim_idle_ms, start_id=start_id, count=batch_size
+        )[:2]
+        # 스트림에서 잘려 나간(trim) 메시지는 내용 없이 돌아오므로 처리하지 않고 ACK 합니다.
+        messages = [(message_id, fields) for message_id, fields in claimed if fields]
+        ids = process_messages(messages) if messages else []
+        ids += [message_id for message_id, fields in claimed if not fields]
+        if ids:
+            redis_client.xack(STREAM_KEY, GROUP_NAME, *ids)
+        processed += len(messages)
+        if start_id in (b'0-0', '0-0'):
+            return processed
+
+
+def run_worker(consumer, batch_size=500, block_ms=1000, claim_idle_ms=60000, claim_interval=30, stop_event=None):
+    """
+    예약 요청 스트림을 처리하는 워커 루프
+    - 시작할 때와 이후 claim_interval초마다 다른 워커가 처리하지 못하고 남긴 메시지
+      (claim_idle_ms 이상 ACK 되지 않은 메시지)를 먼저 가져옵니다.
+    """
+    ensure_group()
+
+    next_claim = 0
+    while stop_event is None or not stop_event.is_set():
+        if time.monotonic() >= next_claim:
+            reclaim_pending(consumer, claim_idle_ms, batch_size)
+            next_claim = time.monotonic() + claim_interval
+
+        response = redis_client.xreadgroup(GROUP_NAME, consumer, {STREAM_KEY: '>'}, count=batch_size, block=block_ms)
+        if not response:
+            continue
+        for _, messages in response:
+            ids = process_messages(messages)
+            if ids:
+                redis_client.xack(STREAM_KEY, GROUP_NAME, *ids)
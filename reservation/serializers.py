@@ -1,8 +1,10 @@
 from rest_framework import serializers
 from .models import Reservation
+from examslots.models import Venue
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from datetime import timedelta
+from examslots.granularity import DEFAULT_EXAM_TYPE, is_aligned, is_exam_type, slot_minutes
 
 User = get_user_model()
 
@@ -26,54 +28,192 @@ class ReservationSerializer(serializers.Serializer):
         help_text="예약 인원 수",
         required=False
     )
+    exam_type = serializers.CharField(
+        help_text="시험 종류 (생략 시 default, 수정 시에는 기존 예약의 종류를 사용)",
+        required=False
+    )
+    venue = serializers.PrimaryKeyRelatedField(
+        queryset=Venue.objects.all(),
+        help_text="시험장 ID (생략 시 남은 인원이 가장 많은 시험장, 수정 시에는 기존 예약의 시험장을 사용)",
+        required=False
+    )
 
     def validate(self, data):
-        start_time = data.get('start_time')
-        end_time = data.get('end_time')
-        count = data.get('count')
+        # 수정 요청은 기존 예약의 시험 종류를 context로 전달받습니다.
+        exam_type = self.context.get('exam_type') or data.get('exam_type', DEFAULT_EXAM_TYPE)
+        validate_schedule(data.get('start_time'), data.get('end_time'), data.get('count'), exam_type)
+        return data
 
-        if start_time and start_time.minute != 0:
-            raise serializers.ValidationError({
-                'start_time': '시험 시작 시간은 정각(00분)이어야 합니다.'
-            })
-        
-        if end_time and end_time.minute != 0:
-            raise serializers.ValidationError({
-                'end_time': '시험 종료 시간은 정각(00분)이어야 합니다.'
-            })
+def validate_schedule(start_time, end_time, count, exam_type):
+    """
+    예약 시간/인원 규칙을 확인합니다. 입력하지 않은 값(None)은 건너뜁니다.
+    (예약 생성/수정 API와 일괄 처리 API가 함께 사용)
+    """
+    if not is_exam_type(exam_type):
+        raise serializers.ValidationError({
+            'exam_type': '알 수 없는 시험 종류입니다.'
+        })
+    minutes = slot_minutes(exam_type)
+    unit = '정각(00분)이어야' if minutes == 60 else f'{minutes}분 단위여야'
 
-        current_datetime = timezone.now()
+    if start_time and not is_aligned(start_time, minutes):
+        raise serializers.ValidationError({
+            'start_time': f'시험 시작 시간은 {unit} 합니다.'
+        })
 
-        if start_time:
-            min_datetime = current_datetime + timedelta(days=3)
-            if start_time < min_datetime:
-                raise serializers.ValidationError({
-                    'start_time': '현재 시간에서 3일 이상 이후의 날짜만 신청이 가능합니다.'
-                })
+    if end_time and not is_aligned(end_time, minutes):
+        raise serializers.ValidationError({
+            'end_time': f'시험 종료 시간은 {unit} 합니다.'
+        })
 
-            max_datetime = current_datetime + timedelta(days=90)
-            if start_time > max_datetime:
-                raise serializers.ValidationError({
-                    'start_time': '3개월 이내의 날짜만 신청이 가능합니다.'
-                })
+    current_datetime = timezone.now()
 
-        if start_time and end_time and start_time >= end_time:
+    if start_time:
+        min_datetime = current_datetime + timedelta(days=3)
+        if start_time < min_datetime:
             raise serializers.ValidationError({
-                'end_time': '종료 시간은 시작 시간보다 이후여야 합니다.'
+                'start_time': '현재 시간에서 3일 이상 이후의 날짜만 신청이 가능합니다.'
             })
 
-        if count is not None and count > 50000:
+        max_datetime = current_datetime + timedelta(days=90)
+        if start_time > max_datetime:
             raise serializers.ValidationError({
-                'count': '최대 5만명까지만 예약할 수 있습니다.'
+                'start_time': '3개월 이내의 날짜만 신청이 가능합니다.'
             })
 
-        return data
+    if start_time and end_time and start_time >= end_time:
+        raise serializers.ValidationError({
+            'end_time': '종료 시간은 시작 시간보다 이후여야 합니다.'
+        })
+
+    if count is not None and count > 50000:
+        raise serializers.ValidationError({
+            'count': '최대 5만명까지만 예약할 수 있습니다.'
+        })
 
 class ReservationDetailSerializer(serializers.ModelSerializer):
+    # 목록 직렬화 시 행마다 사용자를 조회하지 않도록 외래 키 값을 그대로 사용합니다.
+    user = serializers.IntegerField(source='user_id', read_only=True, help_text='사용자 ID')
+    venue = serializers.IntegerField(source='venue_id', read_only=True, help_text='시험장 ID')
+
     class Meta:
         model = Reservation
-        fields = ['id', 'user', 'start_time', 'end_time', 'status', 'created_at', 'count']
-        read_only_fields = ['id', 'user', 'status', 'created_at'] 
+        fields = ['id', 'user', 'exam_type', 'venue', 'start_time', 'end_time', 'status', 'created_at', 'count']
+        read_only_fields = ['id', 'user', 'exam_type', 'venue', 'status', 'created_at'] 
 
 class ReservationListResponseSerializer(serializers.Serializer):
-    reservations = ReservationDetailSerializer(many=True)
\ No newline at end of file
+    reservations = ReservationDetailSerializer(many=True)
+
+class ReservationChangeSerializer(ReservationDetailSerializer):
+    class Meta(ReservationDetailSerializer.Meta):
+        fields = ReservationDetailSerializer.Meta.fields + ['updated_at']
+
+class ReservationChangeListResponseSerializer(serializers.Serializer):
+    changes = ReservationChangeSerializer(many=True, help_text='변경된 예약 목록 (updated_at, id 순)')
+    cursor = serializers.CharField(help_text='다음 요청의 since 값')
+    has_more = serializers.BooleanField(help_text='아직 전달하지 않은 변경분이 있는지 여부')
+
+class ReservationRequestStatusSerializer(serializers.Serializer):
+    ticket = serializers.CharField(help_text='예약 요청 번호표')
+    status = serializers.ChoiceField(choices=['queued', 'succeeded', 'failed'], help_text='처리 상태')
+    reservation = serializers.DictField(required=False, help_text='생성된 예약 (succeeded인 경우)')
+    error = serializers.CharField(required=False, help_text='실패 사유 (failed인 경우)')
+
+class ReservationBulkCancelSerializer(serializers.Serializer):
+    start_time = serializers.DateTimeField(
+        format="%Y-%m-%d %H:%M",
+        input_formats=["%Y-%m-%d %H:%M"],
+        help_text="취소할 시간대 범위의 시작 (YYYY-MM-DD HH:MM 형식, 예: 2025-04-15 00:00)"
+    )
+    end_time = serializers.DateTimeField(
+        format="%Y-%m-%d %H:%M",
+        input_formats=["%Y-%m-%d %H:%M"],
+        help_text="취소할 시간대 범위의 끝 (이 시각에 시작하는 시간대는 제외, 예: 2025-04-16 00:00)"
+    )
+    chunk_size = serializers.IntegerField(
+        min_value=1,
+        max_value=5000,
+        default=500,
+        help_text="한 트랜잭션에서 취소할 예약 수"
+    )
+    venue = serializers.PrimaryKeyRelatedField(
+        queryset=Venue.objects.all(),
+        required=False,
+        help_text="취소할 시험장 ID (시험장 휴무), 생략 시 모든 시험장"
+    )
+
+    def validate(self, data):
+        if data['start_time'] >= data['end_time']:
+            raise serializers.ValidationError({
+                'end_time': '종료 시간은 시작 시간보다 이후여야 합니다.'
+            })
+
+        return data
+
+class ReservationBulkCancelProgressSerializer(serializers.Serializer):
+    type = serializers.ChoiceField(choices=['progress', 'error', 'done'], help_text='줄 종류')
+    cancelled = serializers.IntegerField(help_text='지금까지 취소한 예약 수')
+    total = serializers.IntegerField(help_text='취소 대상 예약 수')
+    released_slots = serializers.IntegerField(required=False, help_text='이번 묶음에서 인원을 해제한 시간대 수 (progress)')
+    user_ids = serializers.ListField(child=serializers.IntegerField(), required=False,
+                                     help_text='이번 묶음에서 취소된 예약의 사용자 id (progress)')
+    users = serializers.IntegerField(required=False, help_text='예약이 취소된 사용자 수 (done)')
+    error = serializers.CharField(required=False, help_text='실패 사유 (error)')
+
+class ReservationBatchOperationSerializer(serializers.Serializer):
+    op = serializers.ChoiceField(choices=['create', 'modify', 'cancel', 'confirm'], help_text='작업 종류')
+    reservation = serializers.IntegerField(required=False, help_text='대상 예약 ID (modify, cancel, confirm)')
+    user = serializers.IntegerField(required=False, help_text='예약할 사용자 ID (create, 생략 시 요청한 관리자)')
+    start_time = serializers.DateTimeField(
+        format="%Y-%m-%d %H:%M",
+        input_formats=["%Y-%m-%d %H:%M"],
+        required=False,
+        help_text="예약 시작 시간 (create 필수, modify 선택)"
+    )
+    end_time = serializers.DateTimeField(
+        format="%Y-%m-%d %H:%M",
+        input_formats=["%Y-%m-%d %H:%M"],
+        required=False,
+        help_text="예약 종료 시간 (create 필수, modify 선택)"
+    )
+    count = serializers.IntegerField(min_value=1, required=False, help_text='예약 인원 수 (create 필수, modify 선택)')
+    exam_type = serializers.CharField(required=False, help_text='시험 종류 (create, 생략 시 default)')
+    venue = serializers.IntegerField(required=False, help_text='시험장 ID (create, 생략 시 남은 인원이 가장 많은 시험장)')
+
+    def validate(self, data):
+        if data['op'] == 'create':
+            missing = [field for field in ('start_time', 'end_time', 'count') if field not in data]
+            if missing:
+                raise serializers.ValidationError({field: '이 필드는 필수 항목입니다.' for field in missing})
+        elif 'reservation' not in data:
+            raise serializers.ValidationError({'reservation': '이 필드는 필수 항목입니다.'})
+
+        return data
+
+class ReservationBatchSerializer(serializers.Serializer):
+    atomic = serializers.BooleanField(
+        default=True,
+        help_text='true: 하나라도 실패하면 모두 반영하지 않음, false: 성공한 작업만 반영'
+    )
+    operations = serializers.ListField(
+        child=serializers.DictField(),
+        min_length=1,
+        max_length=500,
+        help_text='작업 목록 (순서대로 처리, 각 항목은 ReservationBatchOperation 형식)'
+    )
+
+class ReservationBatchResultSerializer(serializers.Serializer):
+    index = serializers.IntegerField(help_text='요청한 작업 순서 (0부터)')
+    op = serializers.CharField(allow_null=True, help_text='작업 종류')
+    status = serializers.ChoiceField(
+        choices=['succeeded', 'failed', 'skipped'],
+        help_text='처리 결과 (skipped: atomic 요청에서 다른 작업이 실패하여 반영하지 않음)'
+    )
+    reservation = serializers.DictField(required=False, help_text='처리 후 예약 (succeeded인 경우)')
+    error = serializers.CharField(required=False, help_text='실패 사유 (failed인 경우)')
+
+class ReservationBatchResponseSerializer(serializers.Serializer):
+    atomic = serializers.BooleanField()
+    succeeded = serializers.IntegerField(help_text='반영된 작업 수')
+    failed = serializers.IntegerField(help_text='실패한 작업 수')
+    results = ReservationBatchResultSerializer(many=True)
@@ -1,18 +1,26 @@
 from datetime import datetime, timezone
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection, transaction
 from django.conf import settings
 from redis import Redis
 from rest_framework.test import APIClient
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 import datetime
-from reservation.models import Reservation, ExamSlot
+from reservation.models import Reservation, ReservationEvent, ExamSlot
+from examslots.models import Venue, DEFAULT_VENUE_ID
 import threading
 import time
 import json
 
 from exam_scheduler import settings
 from reservation.models import User
+from django.urls import reverse
+from common.distributed_lock import redis_client
+from common.query_budget import QueryBudgetTestMixin
+from unittest import mock
+from reservation import outbox, queue
 
 User = get_user_model()
 
@@ -197,4 +205,594 @@ class APIDistributedLockTest(TestCase):
         elif results['client2'].status_code == 409:
             has_409 = True
         
-        self.assertTrue(has_409, "분산 락 작동 X")
\ No newline at end of file
+        self.assertTrue(has_409, "분산 락 작동 X")
+
+
+class ReservationFixtureMixin:
+    # 예약 API 테스트 공용 데이터: 5일 뒤 하루 24개 시간대와 예약 생성/사용 인원 조회 도우미
+    MAX_CAPACITY = 100
+
+    def setUp(self):
+        super().setUp()
+        self.date = timezone.now().date() + datetime.timedelta(days=5)
+        self.slots = [ExamSlot.objects.create(date=self.date, hour=hour, max_capacity=self.MAX_CAPACITY) for hour in range(24)]
+
+    def _time(self, hour):
+        return datetime.datetime.combine(self.date, datetime.time(hour, 0))
+
+    def _format(self, hour):
+        return self._time(hour).strftime('%Y-%m-%d %H:%M')
+
+    def _create(self, user, hours=(9, 12), count=1, status='pending'):
+        # 확정 예약은 시간대 인원도 함께 반영합니다.
+        reservation = Reservation.objects.create(
+            user=user, start_time=self._time(hours[0]), end_time=self._time(hours[1]), count=count, status=status
+        )
+        reservation.exam_slots.add(*self.slots[hours[0]:hours[1]])
+        if status == 'accepted':
+            ExamSlot.update_slots(self.slots[hours[0]:hours[1]], count)
+        return reservation
+
+    def _used(self, hour):
+        return ExamSlot.objects.with_usage().get(id=self.slots[hour].id).used_count
+
+
+class ReservationQueryBudgetTest(ReservationFixtureMixin, QueryBudgetTestMixin, TestCase):
+    # 예약 API 쿼리 예산 테스트 (예약 수가 늘어나도 쿼리 수가 일정해야 함)
+    SIZES = [1, 10, 50]
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='budgetuser', password='password1234!')
+        self.admin = User.objects.create_superuser(username='budgetadmin', password='password1234!')
+        self.others = [User.objects.create_user(username=f'budgetother{i}') for i in range(5)]
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        super().setUp()
+        for key in redis_client.keys("throttle:*"):
+            redis_client.delete(key)
+
+    def _seed(self, size):
+        # 본인과 다른 사용자의 예약을 각각 size개까지 채웁니다.
+        for user in (self.user, self.others[size % len(self.others)]):
+            for _ in range(size - Reservation.objects.filter(user=user).count()):
+                self._create(user)
+
+    def _as_admin(self):
+        self.client.force_authenticate(user=self.admin)
+
+    def test_reservation_create(self):
+        def setup(size):
+            self._seed(size)
+            return reverse('reservation')
+        self.assertQueriesConstant('post', self.SIZES, setup, {
+            'start_time': self._format(9),
+            'end_time': self._format(12),
+            'count': 1,
+        })
+
+    def test_reservation_create_adds_slots_at_once(self):
+        # 시간대 수가 늘어나도 연결 쿼리 수는 같아야 함
+        counts = []
+        for hours in ((9, 10), (9, 17)):
+            response, count = self.request_within_budget('post', reverse('reservation'), {
+                'start_time': self._format(hours[0]),
+                'end_time': self._format(hours[1]),
+                'count': 1,
+            })
+            self.assertEqual(response.status_code, 201)
+            counts.append(count)
+        self.assertEqual(counts[0], counts[1])
+
+    def test_reservation_detail(self):
+        def setup(size):
+            self._seed(size)
+            return reverse('reservation_detail', args=[self._create(self.user).id])
+        self.assertQueriesConstant('get', self.SIZES, setup)
+        self.assertQueriesConstant('patch', self.SIZES, setup, {'count': 2})
+        self.assertQueriesConstant('delete', self.SIZES, setup)
+
+    def test_reservation_list(self):
+        def setup(size):
+            self._seed(size)
+            return reverse('reservation_list')
+        self.assertQueriesConstant('get', self.SIZES, setup)
+
+    def test_reservation_changes(self):
+        def setup(size):
+            self._seed(size)
+            return reverse('reservation_changes')
+        self.assertQueriesConstant('get', self.SIZES, setup)
+
+    def test_reservation_queue_and_request_status(self):
+        # Redis만 조회하는 API는 DB를 조회하지 않아야 함
+        self.assertQueriesConstant('get', self.SIZES, lambda size: self._seed(size) or f"{reverse('reservation_queue')}?ticket=1")
+        self.assertQueriesConstant('get', self.SIZES, lambda size: self._seed(size) or reverse('reservation_request_status', args=['missing']))
+
+    def test_admin_reservation_list(self):
+        self._as_admin()
+
+        def setup(size):
+            self._seed(size)
+            return reverse('admin_reservation')
+        self.assertQueriesConstant('get', self.SIZES, setup)
+
+    def test_admin_reservation_detail(self):
+        self._as_admin()
+
+        def setup(size):
+            self._seed(size)
+            return reverse('admin_reservation_detail', args=[self._create(self.user).id])
+        self.assertQueriesConstant('get', self.SIZES, setup)
+        self.assertQueriesConstant('patch', self.SIZES, setup, {'count': 2})
+        self.assertQueriesConstant('delete', self.SIZES, setup)
+
+    def test_admin_reservation_confirm(self):
+        self._as_admin()
+
+        def setup(size):
+            self._seed(size)
+            return reverse('admin_reservation_confirm', args=[self._create(self.user).id])
+        self.assertQueriesConstant('post', self.SIZES, setup)
+
+    def test_admin_reservation_bulk_cancel(self):
+        # 취소할 예약이 늘어나도 요청과 (한 묶음의) 스트림 처리 쿼리 수는 일정해야 함
+        self._as_admin()
+        stream_counts = {}
+        for size in self.SIZES:
+            self._seed(size)
+            response, _ = self.request_within_budget('post', reverse('admin_reservation_bulk_cancel'), {
+                'start_time': self._format(0),
+                'end_time': self._format(23),
+                'chunk_size': 1000,
+            })
+            with CaptureQueriesContext(connection) as captured:
+                lines = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+            self.assertEqual(lines[-1]['type'], 'done')
+            stream_counts[size] = len(captured)
+        self.assertEqual(len(set(stream_counts.values())), 1, stream_counts)
+
+    def test_reservation_batch(self):
+        # 작업 수가 늘어나도 일괄 처리 쿼리 수는 일정해야 함
+        # (SQLite는 bulk_create/bulk_update를 변수 999개 단위로 나누므로 한 묶음에 들어가는 크기까지만 확인)
+        self._as_admin()
+        counts = {}
+        for size in (1, 5, 10):
+            operations = []
+            for _ in range(size):
+                operations += [
+                    {'op': 'create', 'user': self.others[0].id, 'count': 1,
+                     'start_time': self._format(9), 'end_time': self._format(11)},
+                    {'op': 'modify', 'reservation': self._create(self.user).id, 'count': 2},
+                    {'op': 'cancel', 'reservation': self._create(self.user, status='accepted').id},
+                    {'op': 'confirm', 'reservation': self._create(self.user).id},
+                ]
+            response, counts[size] = self.request_within_budget('post', reverse('reservation_batch'), {'operations': operations})
+            self.assertEqual(response.status_code, 200, response.data)
+            self.assertEqual(response.data['succeeded'], size * 4)
+        self.assertEqual(len(set(counts.values())), 1, counts)
+
+
+class ReservationBulkCancelTest(ReservationFixtureMixin, TestCase):
+    # 시간대 범위 예약 일괄 취소 테스트
+    # (인원 관리 방식별 해제 결과는 examslots.tests.CapacityBackendParityTest에서 확인)
+
+    def setUp(self):
+        super().setUp()
+        self.admin = User.objects.create_superuser(username='bulkcanceladmin', password='password1234!')
+        self.users = [User.objects.create_user(username=f'bulkcancel{i}') for i in range(3)]
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def _cancel(self, start_hour, end_hour, chunk_size=500):
+        response = self.client.post(reverse('admin_reservation_bulk_cancel'), {
+            'start_time': self._format(start_hour),
+            'end_time': self._format(end_hour),
+            'chunk_size': chunk_size,
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        return [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+
+    def test_cancel_releases_capacity(self):
+        accepted = self._create(self.users[0], (9, 12), count=3, status='accepted')
+        other_accepted = self._create(self.users[1], (10, 11), count=2, status='accepted')
+        pending = self._create(self.users[2], (11, 13))
+        outside = self._create(self.users[2], (14, 16), count=4, status='accepted')
+
+        lines = self._cancel(10, 12, chunk_size=2)
+
+        self.assertEqual([line['type'] for line in lines], ['progress', 'progress', 'done'])
+        self.assertEqual(lines[-1], {'type': 'done', 'cancelled': 3, 'total': 3, 'users': 3})
+        self.assertEqual(sorted(user_id for line in lines[:-1] for user_id in line['user_ids']),
+                         sorted(user.id for user in self.users))
+
+        for reservation in (accepted, other_accepted, pending):
+            reservation.refresh_from_db()
+            self.assertEqual(reservation.status, 'cancelled')
+            self.assertFalse(reservation.exam_slots.exists())
+        outside.refresh_from_db()
+        self.assertEqual(outside.status, 'accepted')
+
+        self.assertEqual([self._used(hour) for hour in (9, 10, 11, 12, 14)], [0, 0, 0, 0, 4])
+        self.assertEqual(ReservationEvent.objects.filter(event_type='cancelled').count(), 3)
+
+    def test_cancel_again_does_nothing(self):
+        # 이미 취소된 예약은 다시 취소하지 않아야 함
+        self._create(self.users[0], (9, 12), status='accepted')
+        self._cancel(9, 12)
+        self.assertEqual(self._cancel(0, 23), [{'type': 'done', 'cancelled': 0, 'total': 0, 'users': 0}])
+        self.assertEqual(self._used(9), 0)
+
+    def test_invalid_range(self):
+        response = self.client.post(reverse('admin_reservation_bulk_cancel'), {
+            'start_time': self._format(12),
+            'end_time': self._format(9),
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_admin_only(self):
+        self.client.force_authenticate(user=self.users[0])
+        response = self.client.post(reverse('admin_reservation_bulk_cancel'), {}, format='json')
+        self.assertEqual(response.status_code, 403)
+
+
+class ReservationBatchTest(ReservationFixtureMixin, TestCase):
+    # 예약 일괄 처리 테스트
+    # (인원 관리 방식별 반영 결과는 examslots.tests.CapacityBackendParityTest에서 확인)
+
+    def setUp(self):
+        super().setUp()
+        self.admin = User.objects.create_superuser(username='batchadmin', password='password1234!')
+        self.users = [User.objects.create_user(username=f'batchuser{i}') for i in range(3)]
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def _batch(self, operations, atomic=True):
+        return self.client.post(reverse('reservation_batch'), {'atomic': atomic, 'operations': operations}, format='json')
+
+    def test_mixed_operations(self):
+        accepted = self._create(self.users[0], (9, 12), count=3, status='accepted')
+        pending = self._create(self.users[1], (10, 11), count=2)
+        other = self._create(self.users[2], (11, 13))
+
+        response = self._batch([
+            {'op': 'create', 'user': self.users[2].id, 'start_time': self._format(13), 'end_time': self._format(14), 'count': 1},
+            {'op': 'modify', 'reservation': accepted.id, 'start_time': self._format(14), 'end_time': self._format(16), 'count': 2},
+            {'op': 'cancel', 'reservation': other.id},
+            {'op': 'confirm', 'reservation': pending.id},
+        ])
+
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual([result['status'] for result in response.data['results']], ['succeeded'] * 4)
+        created = Reservation.objects.get(id=response.data['results'][0]['reservation']['id'])
+        self.assertEqual((created.user_id, created.status, created.exam_slots.count()), (self.users[2].id, 'pending', 1))
+        self.assertEqual(list(accepted.exam_slots.order_by('hour').values_list('hour', flat=True)), [14, 15])
+        self.assertEqual([Reservation.objects.get(id=r.id).status for r in (accepted, pending, other)], ['accepted', 'accepted', 'cancelled'])
+        self.assertFalse(other.exam_slots.exists())
+
+        # 확정 예약 이동(9~11시 -3, 14~15시 +2)과 확정(10시 +2)이 반영되어야 함
+        self.assertEqual([self._used(hour) for hour in (9, 10, 11, 13, 14, 15)], [0, 2, 0, 0, 2, 2])
+        self.assertEqual(
+            list(ReservationEvent.objects.filter(created_at__isnull=False).order_by('id').values_list('event_type', flat=True))[-4:],
+            ['created', 'modified', 'cancelled', 'confirmed']
+        )
+
+    def test_atomic_failure_applies_nothing(self):
+        accepted = self._create(self.users[0], (9, 10), status='accepted')
+        pending = self._create(self.users[1], (9, 10))
+
+        response = self._batch([
+            {'op': 'confirm', 'reservation': pending.id},
+            {'op': 'confirm', 'reservation': accepted.id},
+        ])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([result['status'] for result in response.data['results']], ['skipped', 'failed'])
+        self.assertEqual(response.data['results'][1]['error'], '대기 중인 예약만 확정할 수 있습니다.')
+        pending.refresh_from_db()
+        self.assertEqual(pending.status, 'pending')
+        self.assertEqual(self._used(9), 1)
+
+    def test_best_effort_applies_successful_operations(self):
+        accepted = self._create(self.users[0], (9, 10), status='accepted')
+        pending = self._create(self.users[1], (9, 10))
+
+        response = self._batch([
+            {'op': 'confirm', 'reservation': pending.id},
+            {'op': 'confirm', 'reservation': accepted.id},
+            {'op': 'cancel'},
+            {'op': 'cancel', 'reservation': 0},
+        ], atomic=False)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['succeeded'], response.data['failed']), (1, 3))
+        self.assertEqual(response.data['results'][2]['error'], 'reservation: 이 필드는 필수 항목입니다.')
+        self.assertEqual(response.data['results'][3]['error'], '예약을 찾을 수 없습니다.')
+        pending.refresh_from_db()
+        self.assertEqual(pending.status, 'accepted')
+        self.assertEqual(self._used(9), 2)
+
+    def test_operations_see_earlier_changes(self):
+        # 앞의 작업이 해제한 인원은 뒤의 작업이 사용할 수 있어야 함
+        ExamSlot.objects.filter(id=self.slots[20].id).update(max_capacity=5)
+        accepted = self._create(self.users[0], (20, 21), count=5, status='accepted')
+        pending = self._create(self.users[1], (20, 21), count=3)
+
+        response = self._batch([{'op': 'confirm', 'reservation': pending.id}])
+        self.assertEqual(response.status_code, 400)
+
+        response = self._batch([
+            {'op': 'cancel', 'reservation': accepted.id},
+            {'op': 'confirm', 'reservation': pending.id},
+        ])
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(self._used(20), 3)
+
+    def test_admin_only(self):
+        self.client.force_authenticate(user=self.users[0])
+        self.assertEqual(self._batch([{'op': 'cancel', 'reservation': 1}]).status_code, 403)
+
+
+class ReservationQueueTest(TestCase):
+    # 비동기 예약 요청 처리 테스트
+
+    def setUp(self):
+        redis_client.delete(queue.STREAM_KEY)
+        queue.ensure_group()
+        self.users = [User.objects.create_user(username=f'queueuser{i}') for i in range(2)]
+        self.date = timezone.now().date() + datetime.timedelta(days=5)
+        self.slots = [ExamSlot.objects.create(date=self.date, hour=hour, max_capacity=3) for hour in range(9, 12)]
+
+    def tearDown(self):
+        redis_client.delete(queue.STREAM_KEY)
+
+    def _time(self, hour):
+        return datetime.datetime.combine(self.date, datetime.time(hour, 0))
+
+    def _request(self, start_hour, end_hour, count=1, user=None):
+        start_time, end_time = self._time(start_hour), self._time(end_hour)
+        return {
+            'user_id': (user or self.users[0]).id, 'start_time': start_time, 'end_time': end_time, 'count': count,
+            'exam_type': 'default', 'venue': None, 'slot_keys': queue._slot_keys(start_time, end_time, 'default'),
+        }
+
+    def _read(self, consumer):
+        return redis_client.xreadgroup(queue.GROUP_NAME, consumer, {queue.STREAM_KEY: '>'}, count=100)[0][1]
+
+    def test_group_requests(self):
+        # 시간대를 하나라도 공유하는 요청끼리(간접적으로 이어진 요청 포함) 같은 그룹이어야 함
+        requests = [self._request(9, 11), self._request(12, 13), self._request(10, 12), self._request(11, 12), self._request(14, 15)]
+        groups = queue._group_requests(requests)
+        self.assertEqual(
+            sorted(sorted(requests.index(request) for request in group) for group in groups),
+            [[0, 2, 3], [1], [4]]
+        )
+
+    def test_lock_slots_only_requested_range(self):
+        # 요청 범위의 시간대만 잠가야 함 (범위 사이의 날짜, 다른 시간대, 지정하지 않은 시험장 제외)
+        venue = Venue.objects.create(code='queuevenue', name='대기열 시험장')
+        other_venue = ExamSlot.objects.create(date=self.date, hour=9, max_capacity=3, venue=venue)
+        next_day = self.date + datetime.timedelta(days=1)
+        between = ExamSlot.objects.create(date=next_day, hour=9, max_capacity=3)
+        last_day = ExamSlot.objects.create(date=next_day + datetime.timedelta(days=1), hour=9, max_capacity=3)
+
+        later = self._request(9, 10)
+        later.update(start_time=self._time(9) + datetime.timedelta(days=2), end_time=self._time(10) + datetime.timedelta(days=2))
+        own_venue = self._request(9, 11)
+        own_venue['venue'] = DEFAULT_VENUE_ID
+
+        with transaction.atomic():
+            locked = {slot.id for slots in queue._lock_slots([own_venue, later]).values() for slot in slots}
+        self.assertEqual(locked, {self.slots[0].id, self.slots[1].id, last_day.id})
+        self.assertNotIn(other_venue.id, locked)
+        self.assertNotIn(between.id, locked)
+
+        # 시험장을 지정하지 않은 요청은 모든 시험장의 시간대를 잠가야 함
+        with transaction.atomic():
+            locked = {slot.id for slots in queue._lock_slots([self._request(9, 10)]).values() for slot in slots}
+        self.assertEqual(locked, {self.slots[0].id, other_venue.id})
+
+    def test_apply_group_capacity_error(self):
+        # 수용할 수 없는 요청만 실패하고 나머지는 예약이 생성되어야 함
+        ok, too_many, missing = self._request(9, 11, count=3), self._request(10, 12, count=4, user=self.users[1]), self._request(12, 13)
+        queue._apply_group([ok, too_many, missing])
+
+        self.assertEqual(ok['reservation']['status'], 'pending')
+        self.assertEqual(
+            list(Reservation.objects.get(id=ok['reservation']['id']).exam_slots.order_by('hour').values_list('hour', flat=True)),
+            [9, 10]
+        )
+        self.assertIn('4명을 수용할 수 없습니다', too_many['error'])
+        self.assertEqual(missing['error'], '해당 시간대에 예약 가능한 자리가 없습니다.')
+        self.assertEqual(Reservation.objects.count(), 1)
+
+    def test_process_messages(self):
+        succeeded = queue.enqueue_reservation(self.users[0].id, self._time(9), self._time(10), 2)
+        failed = queue.enqueue_reservation(self.users[1].id, self._time(10), self._time(11), 5)
+
+        messages = self._read('test-consumer')
+        self.assertEqual(queue.process_messages(messages), [message_id for message_id, _ in messages])
+
+        self.assertEqual(queue.get_request_status(succeeded)['status'], 'succeeded')
+        self.assertEqual(queue.get_request_status(succeeded)['reservation']['user'], self.users[0].id)
+        self.assertEqual(queue.get_request_status(failed)['status'], 'failed')
+        self.assertEqual(Reservation.objects.get().user_id, self.users[0].id)
+
+    def test_worker_reclaims_periodically(self):
+        # 워커가 시작된 뒤 종료된 다른 워커가 남긴 메시지도 주기적으로 가져와 처리해야 함
+        read_group = redis_client.xreadgroup
+        stop_event = threading.Event()
+        calls = []
+
+        def xreadgroup(*args, **kwargs):
+            calls.append(args)
+            if len(calls) == 1:
+                # 시작 시 회수 이후에 다른 워커가 메시지를 가져간 뒤 종료된 상황
+                self.ticket = queue.enqueue_reservation(self.users[0].id, self._time(9), self._time(10), 1)
+                read_group(queue.GROUP_NAME, 'dead-consumer', {queue.STREAM_KEY: '>'}, count=100)
+            else:
+                stop_event.set()
+            return []
+
+        with mock.patch.object(redis_client, 'xreadgroup', side_effect=xreadgroup):
+            queue.run_worker('live-consumer', block_ms=1, claim_idle_ms=0, claim_interval=0, stop_event=stop_event)
+
+        self.assertEqual(queue.get_request_status(self.ticket)['status'], 'succeeded')
+        self.assertEqual(redis_client.xpending(queue.STREAM_KEY, queue.GROUP_NAME)['pending'], 0)
+
+
+class OutboxRelayTest(TestCase):
+    # outbox 이벤트 발행/재수신 테스트
+
+    def setUp(self):
+        redis_client.delete(outbox.EVENT_STREAM_KEY)
+        self.user = User.objects.create_user(username='outboxuser')
+        now = timezone.now()
+        self.reservation = Reservation.objects.create(user=self.user, start_time=now, end_time=now + datetime.timedelta(hours=1))
+        self.events = ReservationEvent.objects.bulk_create(
+            [self.reservation.build_event(event_type) for event_type in ('created', 'modified', 'confirmed')]
+        )
+
+    def tearDown(self):
+        redis_client.delete(outbox.EVENT_STREAM_KEY)
+
+    def _read(self, group):
+        events = outbox.read_events(group, 'test-consumer', block_ms=None)
+        outbox.ack_events(group, [message_id for message_id, _ in events])
+        return [(int(fields['event_id']), fields['event_type']) for _, fields in events]
+
+    def test_relay_and_replay(self):
+        outbox.create_consumer_group('test-group', start_id='0')
+        self.assertEqual(outbox.relay_batch(), 3)
+        self.assertEqual(outbox.relay_batch(), 0)
+        self.assertFalse(ReservationEvent.objects.filter(published_at__isnull=True).exists())
+
+        # 같은 예약의 이벤트는 생성 순서대로 발행되어야 함
+        expected = [(event.id, event.event_type) for event in self.events]
+        self.assertEqual(self._read('test-group'), expected)
+        self.assertEqual(self._read('test-group'), [])
+
+        # 읽기 위치를 되돌리면 같은 이벤트를 다시 받아야 함
+        outbox.replay_from('test-group', '0')
+        self.assertEqual(self._read('test-group'), expected)
+
+    def test_relay_skips_while_another_relay_runs(self):
+        # 다른 relay가 발행 중이면 아무것도 발행하지 않아야 함
+        with mock.patch('reservation.outbox._acquire_relay_lock', return_value=False):
+            self.assertEqual(outbox.relay_batch(), 0)
+        self.assertEqual(ReservationEvent.objects.filter(published_at__isnull=True).count(), 3)
+        self.assertEqual(redis_client.exists(outbox.EVENT_STREAM_KEY), 0)
+
+
+class ReservationChangesTest(TestCase):
+    # 예약 변경분 조회 테스트
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='changesuser')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.now = timezone.now()
+        self.reservations = [
+            Reservation.objects.create(user=self.user, start_time=self.now, end_time=self.now + datetime.timedelta(hours=1))
+            for _ in range(3)
+        ]
+
+    def _set_updated(self, reservation, seconds_ago):
+        Reservation.objects.filter(id=reservation.id).update(updated_at=timezone.now() - datetime.timedelta(seconds=seconds_ago))
+
+    def _changes(self, since=None):
+        url = reverse('reservation_changes') + (f"?since={since}" if since is not None else '')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return [change['id'] for change in response.data['changes']], response.data['cursor'], response.data['has_more']
+
+    def test_cursor_round_trip(self):
+        for i, reservation in enumerate(self.reservations):
+            self._set_updated(reservation, 60 - i)
+
+        ids, cursor, has_more = self._changes()
+        self.assertEqual(ids, [reservation.id for reservation in self.reservations])
+        self.assertFalse(has_more)
+        self.assertEqual(self._changes(cursor), ([], cursor, False))
+
+        # 이후 변경된 예약만 다시 받아야 함
+        self._set_updated(self.reservations[0], 30)
+        ids, next_cursor, _ = self._changes(cursor)
+        self.assertEqual(ids, [self.reservations[0].id])
+        self.assertEqual(self._changes(next_cursor)[0], [])
+
+    def test_pages(self):
+        for reservation in self.reservations:
+            self._set_updated(reservation, 60)
+
+        with mock.patch('reservation.views.CHANGES_PAGE_SIZE', 2):
+            ids, cursor, has_more = self._changes()
+            self.assertEqual((len(ids), has_more), (2, True))
+            rest, _, has_more = self._changes(cursor)
+        self.assertEqual(ids + rest, sorted(reservation.id for reservation in self.reservations))
+        self.assertFalse(has_more)
+
+    def test_recent_changes_delivered_again(self):
+        # 최근 5초 안의 변경분은 늦게 커밋된 같은 시각의 변경을 놓치지 않도록 커서가 그 앞에 머물러 다시 전달됨
+        for reservation in self.reservations[:2]:
+            self._set_updated(reservation, 60)
+        self._set_updated(self.reservations[2], 1)
+
+        ids, cursor, _ = self._changes()
+        self.assertEqual(len(ids), 3)
+        self.assertEqual(self._changes(cursor)[0], [self.reservations[2].id])
+
+        # 5초가 지나면 커서가 변경분 뒤로 이동함
+        with mock.patch('reservation.views.timezone.now', return_value=timezone.now() + datetime.timedelta(seconds=10)):
+            ids, cursor, _ = self._changes(cursor)
+            self.assertEqual(ids, [self.reservations[2].id])
+            self.assertEqual(self._changes(cursor)[0], [])
+
+    def test_invalid_cursor(self):
+        for since in ('not-a-cursor', 'bm90LWEtY3Vyc29y', 'MjAyNS0wMS0wMXx4'):
+            self.assertEqual(self.client.get(f"{reverse('reservation_changes')}?since={since}").status_code, 400)
+
+
+class ReservationDetailTest(ReservationFixtureMixin, TestCase):
+    # 본인 예약 목록/상세(예약 ID 지정) 조회, 수정, 삭제 테스트
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='detailuser', password='password1234!')
+        self.other = User.objects.create_user(username='detailother', password='password1234!')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.older = self._create(self.user, (9, 10))
+        self.newer = self._create(self.user, (12, 13), status='accepted')
+
+    def _url(self, reservation):
+        return reverse('reservation_detail', args=[reservation.id])
+
+    def test_list_returns_every_reservation(self):
+        response = self.client.get(reverse('reservation_list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([reservation['id'] for reservation in response.data['reservations']], [self.newer.id, self.older.id])
+
+    def test_detail_by_id(self):
+        # 최근 예약이 아니어도 ID로 조회, 수정, 삭제할 수 있어야 함
+        older, newer = self.client.get(self._url(self.older)), self.client.get(self._url(self.newer))
+        self.assertEqual((older.data['id'], newer.data['id']), (self.older.id, self.newer.id))
+        # 같은 사용자 버전이라도 예약마다 ETag가 달라야 함
+        self.assertNotEqual(older['ETag'], newer['ETag'])
+
+        response = self.client.patch(self._url(self.older), {'count': 2}, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data['count'], 2)
+
+        self.assertEqual(self.client.delete(self._url(self.older)).status_code, 204)
+        self.older.refresh_from_db()
+        self.assertEqual(self.older.status, 'cancelled')
+        self.newer.refresh_from_db()
+        self.assertEqual(self.newer.status, 'accepted')
+
+    def test_other_users_reservation_not_found(self):
+        other = self._create(self.other, (9, 10))
+        self.assertEqual(self.client.get(self._url(other)).status_code, 404)
+        self.assertEqual(self.client.delete(self._url(other)).status_code, 404)
+        other.refresh_from_db()
+        self.assertEqual(other.status, 'pending')
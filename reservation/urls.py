@@ -3,8 +3,14 @@ from . import views
 
 urlpatterns = [
     path('', views.reservation_view, name='reservation'),
-    path('my/', views.reservation_detail_view, name='reservation_detail'),
+    path('my/', views.reservation_list_view, name='reservation_list'),
+    path('my/<int:reservation_id>/', views.reservation_detail_view, name='reservation_detail'),
+    path('my/changes/', views.reservation_changes_view, name='reservation_changes'),
+    path('batch/', views.reservation_batch_view, name='reservation_batch'),
+    path('queue/', views.reservation_queue_view, name='reservation_queue'),
+    path('requests/<str:ticket>/', views.reservation_request_status_view, name='reservation_request_status'),
     path('admin/', views.admin_reservation_view, name='admin_reservation'),
+    path('admin/bulk-cancel/', views.admin_reservation_bulk_cancel_view, name='admin_reservation_bulk_cancel'),
     path('admin/<int:reservation_id>/', views.admin_reservation_detail_view, name='admin_reservation_detail'),
     path('admin/<int:reservation_id>/confirm/', views.admin_reservation_confirm_view, name='admin_reservation_confirm'),
 ]
\ No newline at end of file
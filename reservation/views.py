@@ -1,16 +1,42 @@
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+from django.conf import settings
 from django.db import transaction
 from django.core.exceptions import ValidationError
-from common.serializers import ErrorResponseSerializer
+from common.serializers import ErrorResponseSerializer, AdmissionTicketSerializer
 from .models import Reservation
-from .serializers import ReservationListResponseSerializer, ReservationSerializer, ReservationDetailSerializer
+from .serializers import (
+    ReservationListResponseSerializer,
+    ReservationSerializer,
+    ReservationDetailSerializer,
+    ReservationRequestStatusSerializer,
+    ReservationChangeListResponseSerializer,
+    ReservationBulkCancelSerializer,
+    ReservationBulkCancelProgressSerializer,
+    ReservationBatchSerializer,
+    ReservationBatchResponseSerializer
+)
+from .queue import enqueue_reservation, get_request_status
+from .bulk import bulk_cancel, find_affected_reservations
+from .batch import run_batch
 from examslots.models import ExamSlot
+from examslots.granularity import DEFAULT_EXAM_TYPE
 from django.shortcuts import get_object_or_404
+from django.http import StreamingHttpResponse
+from django.db.models import Q
+from django.utils import timezone
+from datetime import datetime, timedelta
+import base64
+import json
 from common.distributed_lock import with_distributed_lock
+from common.throttling import token_bucket_throttles
+from common.admission import with_admission_control, get_status as get_admission_status
+from common.versioning import conditional_on_version, user_version_key
+from common.query_budget import query_budget
 
 @swagger_auto_schema(
     method='post',
@@ -19,12 +45,17 @@ from common.distributed_lock import with_distributed_lock
     request_body=ReservationSerializer,
     responses={
         201: ReservationDetailSerializer,
+        202: ReservationRequestStatusSerializer,
         400: ErrorResponseSerializer,
-        401: ErrorResponseSerializer
+        401: ErrorResponseSerializer,
+        429: AdmissionTicketSerializer
     }
 )
+@query_budget(8)
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@throttle_classes(token_bucket_throttles('reservation_create'))
+@with_admission_control('reservation')
 @transaction.atomic
 def reservation_view(request):
     """
@@ -33,27 +64,39 @@ def reservation_view(request):
     - 로그인이 필요합니다.
     - 현재 시간에서 3일 이상 이후부터 3개월 이내의 날짜만 신청 가능합니다.
     - 최대 5만명까지 예약할 수 있습니다.
+    - RESERVATION_ASYNC_MODE가 켜져 있으면 요청을 대기열에 등록하고 번호표를 반환합니다. (202)
     """
     serializer = ReservationSerializer(data=request.data)
     if serializer.is_valid():
         start_time = serializer.validated_data['start_time']
         end_time = serializer.validated_data['end_time']
         count = serializer.validated_data['count']
+        exam_type = serializer.validated_data.get('exam_type', DEFAULT_EXAM_TYPE)
+        venue = serializer.validated_data.get('venue')
+        venue_id = venue.id if venue else None
+
+        if getattr(settings, 'RESERVATION_ASYNC_MODE', False):
+            ticket = enqueue_reservation(request.user.id, start_time, end_time, count, exam_type, venue_id)
+            return Response(ReservationRequestStatusSerializer({'ticket': ticket, 'status': 'queued'}).data,
+                             status=status.HTTP_202_ACCEPTED)
 
         try:
-            available_slots = ExamSlot.check_and_get_available_slots(start_time, end_time, count)
+            # 시험장을 지정하지 않으면 남은 인원이 가장 많은 시험장을 배정합니다.
+            available_slots = ExamSlot.check_and_get_available_slots(start_time, end_time, count, exam_type, venue_id)
             
             with transaction.atomic():
                 reservation = Reservation.objects.create(
                     user=request.user,
+                    exam_type=exam_type,
+                    venue_id=available_slots[0].venue_id,
                     start_time=start_time,
                     end_time=end_time,
                     count=count,
                     status='pending'
                 )
                 
-                for slot in available_slots:
-                    reservation.exam_slots.add(slot)
+                reservation.exam_slots.add(*available_slots)
+                reservation.record_event('created')
                 response_serializer = ReservationDetailSerializer(reservation)
                 return Response(response_serializer.data, status=status.HTTP_201_CREATED)
             
@@ -64,6 +107,69 @@ def reservation_view(request):
     
     return Response(ErrorResponseSerializer(serializer.errors).data, status=status.HTTP_400_BAD_REQUEST)
 
+@swagger_auto_schema(
+    method='get',
+    operation_summary="비동기 예약 요청 결과 조회 API",
+    operation_description="비동기 모드에서 발급된 예약 요청 번호표의 처리 결과를 조회합니다. (queued, succeeded, failed)",
+    responses={
+        200: ReservationRequestStatusSerializer,
+        404: ErrorResponseSerializer
+    }
+)
+@query_budget(0)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def reservation_request_status_view(request, ticket):
+    """
+    비동기 예약 요청 결과 조회 API
+
+    본인이 요청한 번호표만 조회할 수 있습니다.
+    """
+    result = get_request_status(ticket)
+    if result is None or result['user_id'] != request.user.id:
+        return Response(ErrorResponseSerializer({'error': '예약 요청을 찾을 수 없습니다.'}).data,
+                         status=status.HTTP_404_NOT_FOUND)
+    return Response(ReservationRequestStatusSerializer(result).data)
+
+@swagger_auto_schema(
+    method='get',
+    operation_summary="예약 대기열 상태 조회 API",
+    operation_description="예약 요청이 많아 발급된 대기 번호표의 상태를 조회합니다. "
+                          "admitted가 true가 되면 ADMIT_LEASE_SECONDS(기본 10초) 안에 X-Admission-Ticket 헤더에 번호표를 담아 "
+                          "예약 요청을 다시 보내주세요. 그 안에 요청하지 않으면 번호표가 만료됩니다.",
+    manual_parameters=[
+        openapi.Parameter('ticket', openapi.IN_QUERY, description="대기 번호표", type=openapi.TYPE_INTEGER, required=True)
+    ],
+    responses={
+        200: AdmissionTicketSerializer,
+        400: ErrorResponseSerializer,
+        404: ErrorResponseSerializer
+    }
+)
+@query_budget(0)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def reservation_queue_view(request):
+    """
+    예약 대기열 상태 조회 API
+
+    DB를 조회하지 않고 Redis에서 대기 순번만 확인합니다.
+    """
+    ticket = request.query_params.get('ticket', '')
+    if not ticket.isdigit():
+        return Response(ErrorResponseSerializer({'error': '올바른 번호표를 입력해주세요.'}).data,
+                         status=status.HTTP_400_BAD_REQUEST)
+
+    result = get_admission_status('reservation', request.user.pk, int(ticket))
+    if result is None:
+        return Response(ErrorResponseSerializer({'error': '만료되었거나 존재하지 않는 번호표입니다.'}).data,
+                         status=status.HTTP_404_NOT_FOUND)
+
+    response = Response(AdmissionTicketSerializer(result).data)
+    if not result['admitted']:
+        response['Retry-After'] = str(result['retry_after'])
+    return response
+
 @swagger_auto_schema(
     method='get',
     operation_summary="예약 목록 조회 API",
@@ -73,6 +179,7 @@ def reservation_view(request):
         401: ErrorResponseSerializer
     }
 )
+@query_budget(3)
 @api_view(['GET'])
 @permission_classes([IsAuthenticated, IsAdminUser])
 @transaction.atomic
@@ -91,6 +198,34 @@ def admin_reservation_view(request):
         return Response(ErrorResponseSerializer({'error': '예약 목록 조회 중 오류가 발생했습니다.'}).data,
                      status=status.HTTP_500_INTERNAL_SERVER_ERROR)
             
+@swagger_auto_schema(
+    method='get',
+    operation_summary="본인 예약 목록 조회 API",
+    operation_description="본인의 예약 목록을 최근 신청 순으로 조회합니다. 수정/삭제는 예약 ID로 요청하세요.",
+    responses={
+        200: ReservationListResponseSerializer,
+        401: ErrorResponseSerializer,
+        403: ErrorResponseSerializer
+    }
+)
+@query_budget(3)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@conditional_on_version(lambda request: user_version_key(request.user.id))
+def reservation_list_view(request):
+    """
+    본인 예약 목록 조회 API
+
+    - 로그인이 필요합니다.
+    - 최근 신청한 예약부터 반환합니다.
+    """
+    if request.user.is_superuser:
+        return Response(ErrorResponseSerializer({'error': '관리자 전용 API를 이용해주세요.'}).data,
+                         status=status.HTTP_403_FORBIDDEN)
+
+    reservations = Reservation.objects.filter(user=request.user).order_by('-created_at', '-id')
+    return Response(ReservationListResponseSerializer({'reservations': reservations}).data)
+
 @swagger_auto_schema(
     method='get',
     operation_summary="예약 상세 조회 API",
@@ -127,11 +262,17 @@ def admin_reservation_view(request):
         500: ErrorResponseSerializer
     }
 )
+@query_budget(GET=3, PATCH=9, DELETE=6)
 @api_view(['GET', 'PATCH', 'DELETE'])
 @permission_classes([IsAuthenticated])
+# 예약마다 응답이 다르므로 같은 사용자 버전이라도 예약 ID를 ETag에 포함합니다.
+@conditional_on_version(lambda request: user_version_key(request.user.id),
+                        lambda request: str(request.resolver_match.kwargs['reservation_id']))
+@with_admission_control('reservation', methods=('PATCH', 'DELETE'))
 @transaction.atomic
-def reservation_detail_view(request):
-    reservation = get_object_or_404(Reservation, user=request.user)
+def reservation_detail_view(request, reservation_id):
+    # 다른 사용자의 예약은 존재 여부를 알 수 없도록 404로 응답합니다.
+    reservation = get_object_or_404(Reservation, id=reservation_id, user=request.user)
     if request.user.is_superuser:
         return Response(ErrorResponseSerializer({'error': '관리자 전용 API를 이용해주세요.'}).data,
                          status=status.HTTP_403_FORBIDDEN)
@@ -145,7 +286,7 @@ def reservation_detail_view(request):
             return Response(ErrorResponseSerializer({'error': '대기 중인 예약만 수정할 수 있습니다.'}).data,
                              status=status.HTTP_400_BAD_REQUEST)
         
-        serializer = ReservationSerializer(data=request.data, partial=True)
+        serializer = ReservationSerializer(data=request.data, partial=True, context={'exam_type': reservation.exam_type})
         if serializer.is_valid():
             try:
                 validated_data = serializer.validated_data
@@ -157,7 +298,9 @@ def reservation_detail_view(request):
                 new_slots = ExamSlot.check_and_get_available_slots(
                     start_time,
                     end_time,
-                    count
+                    count,
+                    reservation.exam_type,
+                    reservation.venue_id
                 )
                 
                 with transaction.atomic():
@@ -167,6 +310,7 @@ def reservation_detail_view(request):
                     reservation.save()
                     
                     reservation.exam_slots.set(new_slots)
+                    reservation.record_event('modified')
                     
                     response_serializer = ReservationDetailSerializer(reservation)
                     return Response(response_serializer.data, status=status.HTTP_200_OK)
@@ -189,6 +333,7 @@ def reservation_detail_view(request):
             reservation.save()
             
             reservation.exam_slots.clear()
+            reservation.record_event('cancelled')
 
             return Response(status=status.HTTP_204_NO_CONTENT)
         except ValidationError as e:
@@ -198,6 +343,75 @@ def reservation_detail_view(request):
             return Response(ErrorResponseSerializer({'error': '예약 처리 중 오류가 발생했습니다. 다시 시도해주세요.'}).data,
                              status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+CHANGES_PAGE_SIZE = 100
+# 늦게 커밋된 트랜잭션의 변경분을 놓치지 않도록 최근 변경분은 다음 요청에서 한 번 더 전달합니다.
+CHANGES_CURSOR_LAG = timedelta(seconds=5)
+
+def _encode_change_cursor(updated_at, reservation_id):
+    return base64.urlsafe_b64encode(f"{updated_at.isoformat()}|{reservation_id}".encode()).decode()
+
+def _decode_change_cursor(cursor):
+    updated_at, reservation_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+    return datetime.fromisoformat(updated_at), int(reservation_id)
+
+@swagger_auto_schema(
+    method='get',
+    operation_summary="예약 변경분 조회 API",
+    operation_description="since 커서 이후에 변경(생성/수정/확정/취소)된 본인의 예약만 조회합니다. "
+                          "응답의 cursor를 다음 요청의 since로 전달하세요. since를 생략하면 전체 예약을 반환합니다.",
+    manual_parameters=[
+        openapi.Parameter('since', openapi.IN_QUERY, description="이전 응답의 cursor", type=openapi.TYPE_STRING)
+    ],
+    responses={
+        200: ReservationChangeListResponseSerializer,
+        400: ErrorResponseSerializer,
+        401: ErrorResponseSerializer
+    }
+)
+@query_budget(1)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def reservation_changes_view(request):
+    """
+    예약 변경분 조회 API
+
+    - (updated_at, id) 순으로 정렬하여 최대 100건씩 반환합니다.
+    - has_more가 true이면 cursor로 바로 다음 요청을 보내주세요.
+    """
+    reservations = Reservation.objects.filter(user=request.user)
+
+    since = request.query_params.get('since')
+    if since:
+        try:
+            updated_at, reservation_id = _decode_change_cursor(since)
+        except (ValueError, UnicodeDecodeError):
+            return Response(ErrorResponseSerializer({'error': '올바른 커서가 아닙니다.'}).data,
+                             status=status.HTTP_400_BAD_REQUEST)
+        reservations = reservations.filter(
+            Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, id__gt=reservation_id)
+        )
+
+    changes = list(reservations.order_by('updated_at', 'id')[:CHANGES_PAGE_SIZE + 1])
+    has_more = len(changes) > CHANGES_PAGE_SIZE
+    changes = changes[:CHANGES_PAGE_SIZE]
+
+    if changes:
+        last = changes[-1]
+        cursor = _encode_change_cursor(last.updated_at, last.id)
+        safe_until = timezone.now() - CHANGES_CURSOR_LAG
+        if not has_more and last.updated_at > safe_until:
+            cursor = _encode_change_cursor(safe_until, 0)
+            if since and _decode_change_cursor(since) > (safe_until, 0):
+                cursor = since
+    else:
+        cursor = since or ''
+
+    return Response(ReservationChangeListResponseSerializer({
+        'changes': changes,
+        'cursor': cursor,
+        'has_more': has_more,
+    }).data)
+
 @swagger_auto_schema(
     method='get',
     operation_summary="관리자용 예약 상세 조회 API",
@@ -236,6 +450,7 @@ def reservation_detail_view(request):
         500: ErrorResponseSerializer
     }
 )
+@query_budget(GET=1, PATCH=9, DELETE=8)
 @api_view(['GET', 'PATCH', 'DELETE'])
 @permission_classes([IsAdminUser])
 def admin_reservation_detail_view(request, reservation_id):
@@ -256,7 +471,7 @@ def _admin_reservation_modify_view(request, reservation_id):
     reservation = get_object_or_404(Reservation, id=reservation_id)
     
     if request.method == 'PATCH':
-        serializer = ReservationSerializer(data=request.data, partial=True)
+        serializer = ReservationSerializer(data=request.data, partial=True, context={'exam_type': reservation.exam_type})
         if serializer.is_valid():
             try:
                 validated_data = serializer.validated_data
@@ -305,6 +520,7 @@ def _admin_reservation_modify_view(request, reservation_id):
         409: ErrorResponseSerializer
     }
 )
+@query_budget(14)
 @api_view(['POST'])
 @permission_classes([IsAdminUser])
 @with_distributed_lock(
@@ -326,4 +542,90 @@ def admin_reservation_confirm_view(request, reservation_id):
                          status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return Response(ErrorResponseSerializer({'error': '예약 확정 중 오류가 발생했습니다.'}).data,
-                         status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+                         status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+@swagger_auto_schema(
+    method='post',
+    operation_summary="관리자용 시간대 범위 예약 일괄 취소 API",
+    operation_description="시험장 휴무 등으로 시간대 범위(start_time 이상 end_time 미만)에 연결된 모든 예약을 취소하고 인원을 해제합니다. "
+                          "chunk_size개씩 트랜잭션을 나누어 처리하며, 진행 상황을 NDJSON(application/x-ndjson)으로 한 줄씩 전송합니다. "
+                          "progress 줄의 user_ids로 알림 대상 사용자를 확인할 수 있습니다.",
+    request_body=ReservationBulkCancelSerializer,
+    responses={
+        200: ReservationBulkCancelProgressSerializer(many=True),
+        400: ErrorResponseSerializer,
+        403: ErrorResponseSerializer
+    }
+)
+@query_budget(2)
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def admin_reservation_bulk_cancel_view(request):
+    """
+    시간대 범위 예약 일괄 취소 관리자 API
+
+    취소 대상은 요청 시점에 한 번 조회하며, 응답을 전송하면서 묶음 단위로 취소합니다.
+    중간에 실패하면 error 줄을 보내고 중단하며, 이미 처리한 묶음의 취소는 유지됩니다.
+    """
+    serializer = ReservationBulkCancelSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(ErrorResponseSerializer(serializer.errors).data, status=status.HTTP_400_BAD_REQUEST)
+
+    venue = serializer.validated_data.get('venue')
+    reservation_ids = find_affected_reservations(
+        serializer.validated_data['start_time'],
+        serializer.validated_data['end_time'],
+        venue.id if venue else None
+    )
+    lines = (
+        json.dumps(ReservationBulkCancelProgressSerializer(item).data, ensure_ascii=False) + '\n'
+        for item in bulk_cancel(reservation_ids, serializer.validated_data['chunk_size'])
+    )
+    return StreamingHttpResponse(lines, content_type='application/x-ndjson')
+
+
+@swagger_auto_schema(
+    method='post',
+    operation_summary="관리자용 예약 일괄 처리 API",
+    operation_description="예약 생성(create)/수정(modify)/취소(cancel)/확정(confirm) 작업 목록(최대 500개)을 한 번의 요청으로 순서대로 처리하고 "
+                          "작업별 결과를 반환합니다. 각 작업의 형식은 ReservationBatchOperation을 참고하세요. "
+                          "atomic이 true(기본값)이면 하나라도 실패할 때 아무것도 반영하지 않고 400을 반환하며, "
+                          "false이면 성공한 작업만 반영합니다.",
+    request_body=ReservationBatchSerializer,
+    responses={
+        200: ReservationBatchResponseSerializer,
+        400: ReservationBatchResponseSerializer,
+        403: ErrorResponseSerializer,
+        500: ErrorResponseSerializer
+    }
+)
+@query_budget(13)
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def reservation_batch_view(request):
+    """
+    예약 일괄 처리 관리자 API (여러 응시자의 예약을 관리하는 제휴 시스템용)
+
+    - 작업은 요청한 순서대로 하나의 트랜잭션에서 처리되며, 같은 예약을 여러 번 대상으로 할 수 있습니다.
+    - 관련 예약과 시간대를 작업 수와 관계없이 같은 수의 쿼리로 불러오고, 시간대 인원 변경은 합산하여 한 번에 반영합니다.
+    - create의 user를 생략하면 요청한 관리자의 예약으로 생성합니다.
+    """
+    serializer = ReservationBatchSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(ErrorResponseSerializer(serializer.errors).data, status=status.HTTP_400_BAD_REQUEST)
+
+    atomic = serializer.validated_data['atomic']
+    try:
+        results = run_batch(serializer.validated_data['operations'], request.user.id, atomic)
+    except Exception as e:
+        return Response(ErrorResponseSerializer({'error': '예약 처리 중 오류가 발생했습니다. 다시 시도해주세요.'}).data,
+                         status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    failed = sum(1 for result in results if result['status'] == 'failed')
+    response = ReservationBatchResponseSerializer({
+        'atomic': atomic,
+        'succeeded': sum(1 for result in results if result['status'] == 'succeeded'),
+        'failed': failed,
+        'results': results,
+    })
+    return Response(response.data, status=status.HTTP_400_BAD_REQUEST if atomic and failed else status.HTTP_200_OK)
@@ -0,0 +1,52 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from .models import User
+from .token_cache import get_cached_user, cache_user, load_user
+from .token_store import is_redis_store, resolve_token
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Redis 캐시를 사용하는 토큰 인증
+
+    토큰 -> 사용자 스냅샷을 Redis(및 선택적으로 프로세스 내부 LRU)에 저장하여
+    매 요청마다 발생하던 Token/User 조회 쿼리를 생략합니다.
+    AUTH_TOKEN_STORE['BACKEND']가 'redis'인 경우 authtoken 테이블 대신 Redis 토큰 저장소를 사용합니다.
+    request.auth에는 토큰 키(문자열)가 저장됩니다.
+    """
+
+    def authenticate_credentials(self, key):
+        if is_redis_store():
+            return self._authenticate_redis_store(key)
+
+        user = get_cached_user(key)
+
+        if user is None:
+            user, token = super().authenticate_credentials(key)
+            cache_user(key, user)
+            return (user, token.key)
+
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+
+        return (user, key)
+
+    def _authenticate_redis_store(self, key):
+        user_id, raw = resolve_token(key)
+        if user_id is None:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+
+        if raw is not None:
+            user = load_user(raw)
+        else:
+            try:
+                user = User.objects.get(pk=user_id)
+            except User.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+            cache_user(key, user)
+
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+
+        return (user, key)
@@ -0,0 +1,137 @@
+import csv
+import io
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+import django
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1000
+# API 요청 안에서 해싱할 수 있는 최대 사용자 수 (더 많으면 bulk_signup 명령 사용)
+API_MAX_ROWS = 500
+
+
+def parse_users(content, input_format):
+    """
+    CSV(username,password 헤더) 또는 NDJSON(한 줄에 하나의 JSON 객체) 형식의 사용자 목록을 파싱합니다.
+    """
+    if isinstance(content, bytes):
+        content = content.decode('utf-8-sig')
+
+    if input_format == 'csv':
+        reader = csv.DictReader(io.StringIO(content))
+        if not reader.fieldnames or not {'username', 'password'} <= set(reader.fieldnames):
+            raise ValidationError("CSV 헤더에 username, password 컬럼이 필요합니다.")
+        return [{'username': row.get('username'), 'password': row.get('password')} for row in reader]
+
+    if input_format == 'ndjson':
+        rows = []
+        for line_no, line in enumerate(content.splitlines(), start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rows.append(json.loads(line))
+            except json.JSONDecodeError:
+                raise ValidationError(f"{line_no}번째 줄이 올바른 JSON 형식이 아닙니다.")
+        return rows
+
+    raise ValidationError("지원하지 않는 형식입니다. (csv, ndjson)")
+
+
+def detect_format(content_type=None, filename=None):
+    if filename:
+        if filename.endswith('.csv'):
+            return 'csv'
+        if filename.endswith(('.ndjson', '.jsonl')):
+            return 'ndjson'
+    if content_type:
+        if 'csv' in content_type:
+            return 'csv'
+        if 'ndjson' in content_type or 'jsonl' in content_type:
+            return 'ndjson'
+    return None
+
+
+def _validate_rows(rows):
+    username_field = User._meta.get_field('username')
+    valid = {}
+    skipped = []
+
+    for row in rows:
+        username = (row.get('username') or '').strip() if isinstance(row, dict) else ''
+        password = row.get('password') if isinstance(row, dict) else None
+
+        if not username or not password:
+            skipped.append({'username': username, 'reason': '사용자명과 비밀번호는 필수입니다.'})
+            continue
+        try:
+            username_field.run_validators(username)
+        except ValidationError as e:
+            skipped.append({'username': username, 'reason': ' '.join(e.messages)})
+            continue
+        if username in valid:
+            skipped.append({'username': username, 'reason': '입력 데이터에 중복된 사용자명입니다.'})
+            continue
+        valid[username] = password
+
+    return valid, skipped
+
+
+def _hash_passwords(passwords, workers):
+    if workers <= 1 or len(passwords) < 2:
+        return [make_password(password) for password in passwords]
+
+    # spawn 방식의 프로세스에서도 Django 설정을 사용할 수 있도록 초기화합니다.
+    with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as executor:
+        chunksize = max(1, len(passwords) // (workers * 4))
+        return list(executor.map(make_password, passwords, chunksize=chunksize))
+
+
+def bulk_create_users(rows, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    사용자를 일괄 생성합니다.
+
+    - 이미 존재하는 사용자명은 username__in 쿼리 한 번으로 확인합니다.
+    - workers가 1보다 크면 비밀번호 해싱을 프로세스 풀에서 병렬로 처리합니다. (기본: CPU 수, API에서는 1)
+    - bulk_create로 chunk_size 단위로 나누어 저장합니다.
+
+    반환값: {'created': [사용자명], 'skipped': [{'username', 'reason'}]}
+    """
+    valid, skipped = _validate_rows(rows)
+
+    existing = set(User.objects.filter(username__in=list(valid)).values_list('username', flat=True))
+    for username in existing:
+        skipped.append({'username': username, 'reason': '이미 존재하는 사용자명입니다.'})
+        del valid[username]
+
+    usernames = list(valid)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    hashed = _hash_passwords([valid[username] for username in usernames], workers)
+
+    created = []
+    for start in range(0, len(usernames), chunk_size):
+        chunk = [
+            User(username=username, password=password)
+            for username, password in zip(usernames[start:start + chunk_size], hashed[start:start + chunk_size])
+        ]
+        # 동시에 생성된 사용자명과 충돌하는 행은 무시되므로, 저장된 해시(솔트가 달라 행마다 다름)가
+        # 같은 행만 이번에 생성된 것으로 봅니다.
+        with transaction.atomic():
+            User.objects.bulk_create(chunk, ignore_conflicts=True)
+            saved = dict(User.objects.filter(username__in=[user.username for user in chunk]).values_list('username', 'password'))
+        for user in chunk:
+            if saved.get(user.username) == user.password:
+                created.append(user.username)
+            else:
+                skipped.append({'username': user.username, 'reason': '이미 존재하는 사용자명입니다.'})
+        logger.info(f"Bulk signup progress: {start + len(chunk)}/{len(usernames)}")
+
+    return {'created': created, 'skipped': skipped}
@@ -0,0 +1,38 @@
+import json
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from users.bulk import DEFAULT_CHUNK_SIZE, bulk_create_users, detect_format, parse_users
+
+
+class Command(BaseCommand):
+    help = 'CSV(username,password) 또는 NDJSON 파일로 사용자를 일괄 생성합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='입력 파일 경로')
+        parser.add_argument('--format', choices=['csv', 'ndjson'], help='입력 형식 (생략 시 확장자로 판단)')
+        parser.add_argument('--workers', type=int, default=None, help='비밀번호 해싱 프로세스 수 (기본: CPU 수)')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='bulk_create 단위')
+        parser.add_argument('--report', help='결과 리포트(JSON)를 저장할 경로')
+
+    def handle(self, *args, **options):
+        input_format = options['format'] or detect_format(filename=options['path'])
+
+        try:
+            with open(options['path'], 'rb') as f:
+                rows = parse_users(f.read(), input_format)
+        except OSError as e:
+            raise CommandError(f"파일을 읽을 수 없습니다: {e}")
+        except ValidationError as e:
+            raise CommandError(' '.join(e.messages))
+
+        report = bulk_create_users(rows, workers=options['workers'], chunk_size=options['chunk_size'])
+
+        if options['report']:
+            with open(options['report'], 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+
+        for item in report['skipped']:
+            self.stdout.write(f"skipped {item['username']}: {item['reason']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(report['created'])}명 생성, {len(report['skipped'])}명 제외"
+        ))
@@ -1,5 +1,7 @@
 from django.db import models
+from django.db.models.functions import Upper
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex, OpClass
 
 class User(AbstractUser):
     created_at = models.DateTimeField(auto_now_add=True)
@@ -8,3 +10,10 @@ class User(AbstractUser):
     class Meta:
         db_table = 'users'
         app_label = 'users'
+        indexes = [
+            # username 접두어 검색 (istartswith)
+            models.Index(OpClass(Upper('username'), name='text_pattern_ops'), name='users_username_prefix_idx'),
+            # username 부분 문자열 검색 (icontains, pg_trgm 필요)
+            GinIndex(OpClass(Upper('username'), name='gin_trgm_ops'), name='users_username_trgm_idx'),
+            models.Index(fields=['created_at'], name='users_created_at_idx'),
+        ]
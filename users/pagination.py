@@ -0,0 +1,12 @@
+from rest_framework.pagination import CursorPagination
+
+
+class UserCursorPagination(CursorPagination):
+    """
+    관리자 사용자 목록 커서 페이지네이션
+    - OFFSET 없이 id 기준으로 다음 페이지를 조회하므로 사용자 수가 많아도 일정한 비용으로 동작합니다.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    ordering = '-id'
@@ -30,8 +30,24 @@ class LoginSerializer(serializers.Serializer):
     username = serializers.CharField(help_text='사용자명 (필수)')
     password = serializers.CharField(help_text='비밀번호 (필수)', write_only=True)
 
+class AdminUserSerializer(UserSerializer):
+    reservation_count = serializers.IntegerField(read_only=True, help_text='예약 수 (with_reservation_count=true인 경우에만 포함)')
+
+    class Meta(UserSerializer.Meta):
+        fields = UserSerializer.Meta.fields + ['reservation_count']
+
 class UserListResponseSerializer(serializers.Serializer):
-    users = UserSerializer(many=True)
+    next = serializers.CharField(allow_null=True, required=False, help_text='다음 페이지 URL')
+    previous = serializers.CharField(allow_null=True, required=False, help_text='이전 페이지 URL')
+    users = AdminUserSerializer(many=True)
+
+class BulkSignupSkippedSerializer(serializers.Serializer):
+    username = serializers.CharField(help_text='사용자명')
+    reason = serializers.CharField(help_text='생성하지 않은 사유')
+
+class BulkSignupResponseSerializer(serializers.Serializer):
+    created = serializers.ListField(child=serializers.CharField(), help_text='생성된 사용자명 목록')
+    skipped = BulkSignupSkippedSerializer(many=True, help_text='생성하지 않은 사용자 목록')
 
 class AuthTokenSerializer(serializers.Serializer):
     token = serializers.CharField(help_text='인증 토큰')
@@ -1,3 +1,314 @@
-from django.test import TestCase
+from datetime import datetime, timedelta
+from unittest import mock
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework.authtoken.models import Token
+from users.models import User
+from users import bulk
+from users.token_cache import TOKEN_KEY_PREFIX, invalidate_user
+from users.token_store import STORE_KEY_PREFIX, revoke_user_tokens
+from common.distributed_lock import redis_client
+from common.query_budget import QueryBudgetTestMixin
+from reservation.models import Reservation
 
-# Create your tests here.
+
+class CachedTokenAuthenticationTest(TestCase):
+    # Redis 토큰 캐시 인증 테스트
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='cacheuser', password='password1234!')
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def tearDown(self):
+        invalidate_user(self.user.id)
+
+    def test_cached_token_skips_db(self):
+        # 첫 요청 이후에는 Token/User 조회 쿼리가 발생하지 않아야 함
+        self.client.get(reverse('user_detail'))
+        self.assertTrue(redis_client.exists(f"{TOKEN_KEY_PREFIX}{self.token.key}"))
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('user_detail'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['username'], 'cacheuser')
+
+    def test_logout_invalidates_cache(self):
+        # 로그아웃 후에는 캐시된 토큰으로 인증할 수 없어야 함
+        self.client.get(reverse('user_detail'))
+        self.client.post(reverse('logout'))
+
+        self.assertFalse(redis_client.exists(f"{TOKEN_KEY_PREFIX}{self.token.key}"))
+        response = self.client.get(reverse('user_detail'))
+        self.assertEqual(response.status_code, 401)
+
+    def test_user_update_invalidates_cache(self):
+        # 사용자 정보 수정 시 캐시된 스냅샷이 갱신되어야 함
+        self.client.get(reverse('user_detail'))
+        self.client.put(reverse('user_detail'), {'username': 'renamed'}, format='json')
+
+        response = self.client.get(reverse('user_detail'))
+        self.assertEqual(response.data['username'], 'renamed')
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password('password1234!'))
+
+
+@override_settings(AUTH_TOKEN_STORE={'BACKEND': 'redis', 'TIMEOUT': 60, 'SLIDING': True})
+class RedisTokenStoreTest(TestCase):
+    # Redis 토큰 저장소 테스트
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='storeuser', password='password1234!')
+        self.client = APIClient()
+
+    def tearDown(self):
+        revoke_user_tokens(self.user.id)
+
+    def _login(self):
+        response = self.client.post(reverse('login'), {'username': 'storeuser', 'password': 'password1234!'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        return response.data['token']
+
+    def test_login_does_not_write_token_table(self):
+        # 로그인 시 authtoken 테이블에 쓰기가 발생하지 않아야 함
+        key = self._login()
+        self.assertFalse(Token.objects.filter(user=self.user).exists())
+        self.assertTrue(redis_client.ttl(f"{STORE_KEY_PREFIX}{key}") > 0)
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {key}')
+        response = self.client.get(reverse('user_detail'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_login_rotates_token(self):
+        # 재로그인 시 이전 토큰은 폐기되어야 함
+        old_key = self._login()
+        new_key = self._login()
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {old_key}')
+        self.assertEqual(self.client.get(reverse('user_detail')).status_code, 401)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {new_key}')
+        self.assertEqual(self.client.get(reverse('user_detail')).status_code, 200)
+
+    def test_logout_all(self):
+        # 전체 로그아웃 시 사용자 토큰 인덱스의 모든 토큰이 폐기되어야 함
+        key = self._login()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {key}')
+        self.client.post(reverse('logout_all'))
+
+        self.assertFalse(redis_client.exists(f"{STORE_KEY_PREFIX}{key}"))
+        self.assertEqual(self.client.get(reverse('user_detail')).status_code, 401)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class UserBulkCreateTest(TestCase):
+    # 사용자 일괄 생성 API 테스트
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username='bulkadmin', password='password1234!')
+        User.objects.create_user(username='bulkexisting', password='password1234!')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def _post(self, body, content_type, query=''):
+        return self.client.post(f"{reverse('user_admin_bulk')}{query}", body, content_type=content_type)
+
+    def test_ndjson_body(self):
+        response = self._post(
+            '{"username": "bulk1", "password": "password1234!"}\n\n{"username": "bulk2", "password": "password1234!"}\n',
+            'application/x-ndjson'
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], ['bulk1', 'bulk2'])
+        self.assertTrue(User.objects.get(username='bulk2').check_password('password1234!'))
+
+    def test_csv_file(self):
+        upload = SimpleUploadedFile('users.csv', 'username,password\nbulkcsv,password1234!\n'.encode('utf-8'))
+        response = self.client.post(reverse('user_admin_bulk'), {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], ['bulkcsv'])
+
+    def test_duplicate_usernames_skipped(self):
+        response = self._post(
+            'username,password\nbulkexisting,password1234!\nbulkdup,password1234!\nbulkdup,password1234!\nbulkmissing,\n',
+            'text/csv'
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], ['bulkdup'])
+        self.assertEqual(
+            sorted(item['username'] for item in response.data['skipped']),
+            ['bulkdup', 'bulkexisting', 'bulkmissing']
+        )
+
+    def test_concurrently_created_username_reported_as_skipped(self):
+        # 존재 여부 확인 이후 다른 요청이 같은 사용자명을 만들면 생성 목록이 아닌 제외 목록에 있어야 함
+        def hash_and_race(passwords, workers):
+            User.objects.create_user(username='bulkrace', password='other1234!')
+            return [f"md5$salt${i}" for i in range(len(passwords))]
+
+        with mock.patch('users.bulk._hash_passwords', side_effect=hash_and_race):
+            report = bulk.bulk_create_users([
+                {'username': 'bulkrace', 'password': 'password1234!'},
+                {'username': 'bulkok', 'password': 'password1234!'},
+            ])
+        self.assertEqual(report['created'], ['bulkok'])
+        self.assertEqual(report['skipped'], [{'username': 'bulkrace', 'reason': '이미 존재하는 사용자명입니다.'}])
+        self.assertTrue(User.objects.get(username='bulkrace').check_password('other1234!'))
+
+    def test_missing_file(self):
+        # file 필드 없는 multipart 요청은 400이어야 함
+        response = self.client.post(reverse('user_admin_bulk'), {'other': 'value'}, format='multipart')
+        self.assertEqual(response.status_code, 400)
+
+    def test_too_many_rows(self):
+        rows = '\n'.join(f'{{"username": "bulkmany{i}", "password": "password1234!"}}' for i in range(bulk.API_MAX_ROWS + 1))
+        response = self._post(rows, 'application/x-ndjson')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(User.objects.filter(username__startswith='bulkmany').exists())
+
+    def test_hashes_in_process(self):
+        # API 요청에서는 프로세스 풀을 만들지 않아야 함
+        with mock.patch('users.bulk.ProcessPoolExecutor') as executor:
+            response = self._post('username,password\nbulkp1,password1234!\nbulkp2,password1234!\n', 'text/csv')
+        self.assertEqual(response.status_code, 201)
+        executor.assert_not_called()
+
+
+class AdminUserListTest(TestCase):
+    # 관리자 사용자 목록 검색/필터/페이지네이션 테스트
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username='listadmin', password='password1234!')
+        self.users = {name: User.objects.create_user(username=name) for name in ('alpha1', 'Alpha2', 'xalpha', 'beta')}
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def _usernames(self, query):
+        response = self.client.get(f"{reverse('user_admin')}?{query}")
+        self.assertEqual(response.status_code, 200)
+        return sorted(user['username'] for user in response.data['users'])
+
+    def test_search_modes(self):
+        # 접두어 검색이 기본이며 대소문자를 구분하지 않음
+        self.assertEqual(self._usernames('search=alpha'), ['Alpha2', 'alpha1'])
+        self.assertEqual(self._usernames('search=alpha&search_mode=prefix'), ['Alpha2', 'alpha1'])
+        self.assertEqual(self._usernames('search=alpha&search_mode=contains'), ['Alpha2', 'alpha1', 'xalpha'])
+        self.assertEqual(self.client.get(f"{reverse('user_admin')}?search=alpha&search_mode=regex").status_code, 400)
+
+    def test_filters(self):
+        User.objects.filter(username='alpha1').update(created_at=datetime(2025, 3, 1, 23, 59))
+        User.objects.filter(username='Alpha2').update(created_at=datetime(2025, 3, 2, 0, 0))
+        User.objects.filter(username='xalpha').update(created_at=datetime(2025, 3, 3, 12, 0))
+
+        # 날짜 필터는 시작일과 종료일을 모두 포함함
+        self.assertEqual(self._usernames('created_after=2025-03-01&created_before=2025-03-02'), ['Alpha2', 'alpha1'])
+        self.assertEqual(self._usernames('created_after=2025-03-02&created_before=2025-03-03'), ['Alpha2', 'xalpha'])
+        self.assertEqual(self._usernames('is_superuser=true'), ['listadmin'])
+        self.assertEqual(self.client.get(f"{reverse('user_admin')}?created_after=2025-13-01").status_code, 400)
+
+    def test_reservation_count(self):
+        now = timezone.now()
+        Reservation.objects.bulk_create([
+            Reservation(user=self.users['beta'], start_time=now, end_time=now + timedelta(hours=1)) for _ in range(2)
+        ])
+        response = self.client.get(f"{reverse('user_admin')}?search=beta&with_reservation_count=true")
+        self.assertEqual(response.data['users'][0]['reservation_count'], 2)
+        response = self.client.get(f"{reverse('user_admin')}?search=beta")
+        self.assertNotIn('reservation_count', response.data['users'][0])
+
+    def test_cursor_pages_are_stable(self):
+        # 페이지를 넘기는 중에 사용자가 추가되어도 기존 사용자가 중복되거나 빠지지 않아야 함
+        expected = list(User.objects.order_by('-id').values_list('id', flat=True))
+        seen = []
+        url = f"{reverse('user_admin')}?page_size=2"
+        while url:
+            response = self.client.get(url)
+            seen += [user['id'] for user in response.data['users']]
+            User.objects.create_user(username=f"listnew{len(seen)}")
+            url = response.data['next']
+        self.assertEqual(seen, expected)
+
+
+class UserQueryBudgetTest(QueryBudgetTestMixin, TestCase):
+    # 사용자 API 쿼리 예산 테스트 (사용자/예약 수가 늘어나도 쿼리 수가 일정해야 함)
+    SIZES = [1, 10, 50]
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='budgetuser', password='password1234!')
+        self.admin = User.objects.create_superuser(username='budgetadmin', password='password1234!')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def tearDown(self):
+        for user_id in User.objects.values_list('id', flat=True):
+            revoke_user_tokens(user_id)
+
+    def _seed(self, size):
+        # 예약이 있는 사용자를 size명까지 채웁니다.
+        now = timezone.now()
+        existing = User.objects.filter(username__startswith='budgetseed').count()
+        users = User.objects.bulk_create([User(username=f'budgetseed{i}') for i in range(existing, size)])
+        Reservation.objects.bulk_create([
+            Reservation(user=user, start_time=now, end_time=now + timedelta(hours=1)) for user in users
+        ])
+
+    def _new_user(self):
+        return User.objects.create_user(username=f'budgetnew{User.objects.count()}', password='password1234!')
+
+    def test_login_and_logout(self):
+        self.client.force_authenticate(user=None)
+        self.assertQueriesConstant('post', self.SIZES, lambda size: self._seed(size) or reverse('login'),
+                                   {'username': 'budgetuser', 'password': 'password1234!'})
+
+        self.client.force_authenticate(user=self.user, token='budget-token')
+        self.assertQueriesConstant('post', self.SIZES, lambda size: self._seed(size) or reverse('logout'))
+        self.assertQueriesConstant('post', self.SIZES, lambda size: self._seed(size) or reverse('logout_all'))
+
+    def test_signup(self):
+        def setup(size):
+            self._seed(size)
+            self.signup_data['username'] = f'budgetsignup{size}'
+            return reverse('users')
+        self.signup_data = {'password': 'password1234!'}
+        self.assertQueriesConstant('post', self.SIZES, setup, self.signup_data)
+
+    def test_user_detail(self):
+        def setup(size):
+            self._seed(size)
+            self.client.force_authenticate(user=self._new_user())
+            return reverse('user_detail')
+        self.assertQueriesConstant('get', self.SIZES, setup)
+        self.assertQueriesConstant('put', self.SIZES, setup, {'password': 'newpassword1234!'})
+        self.assertQueriesConstant('delete', self.SIZES, setup)
+
+    def test_admin_user_list(self):
+        def setup(size):
+            self._seed(size)
+            return f"{reverse('user_admin')}?with_reservation_count=true&page_size=100"
+        self.assertQueriesConstant('get', self.SIZES, setup)
+
+    def test_admin_user_bulk(self):
+        # 업로드한 사용자 수가 늘어나도 쿼리 수가 일정해야 함 (chunk 크기 이하)
+        def setup(size):
+            self.rows = '\n'.join(f'{{"username": "budgetbulk{size}_{i}", "password": "password1234!"}}' for i in range(size))
+            return f"{reverse('user_admin_bulk')}?type=ndjson"
+
+        counts = {}
+        for size in (1, 5, 20):
+            path = setup(size)
+            with self.settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher']):
+                _, counts[size] = self.request_within_budget(
+                    'post', path, self.rows, content_type='application/x-ndjson'
+                )
+        self.assertEqual(len(set(counts.values())), 1, counts)
+
+    def test_admin_user_detail(self):
+        def setup(size):
+            self._seed(size)
+            return reverse('user_admin_detail', args=[self._new_user().id])
+        self.assertQueriesConstant('get', self.SIZES, setup)
+        self.assertQueriesConstant('put', self.SIZES, setup, {'password': 'newpassword1234!'})
+        self.assertQueriesConstant('delete', self.SIZES, setup)
@@ -0,0 +1,144 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DEFAULT_DB_ALIAS
+from common.distributed_lock import redis_client
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+TOKEN_KEY_PREFIX = "auth:token:"
+USER_TOKENS_KEY_PREFIX = "auth:user_tokens:"
+
+# 비밀번호 해시는 Redis에 저장하지 않습니다. (접근 시 DB에서 지연 로딩)
+SNAPSHOT_FIELDS = [f.attname for f in User._meta.concrete_fields if f.attname != 'password']
+
+
+def _get_config():
+    config = getattr(settings, 'AUTH_TOKEN_CACHE', {})
+    return {
+        'TIMEOUT': config.get('TIMEOUT', 300),
+        'LOCAL_MAXSIZE': config.get('LOCAL_MAXSIZE', 0),
+        'LOCAL_TIMEOUT': config.get('LOCAL_TIMEOUT', 5),
+    }
+
+
+class LocalTTLCache:
+    """
+    프로세스 내부 LRU 캐시 (TTL 지원)
+    - 다른 프로세스의 무효화를 감지할 수 없으므로 TTL은 짧게 유지해야 합니다.
+    """
+
+    def __init__(self, maxsize, timeout):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.timeout, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_where(self, predicate):
+        with self._lock:
+            for key in [k for k, (_, v) in self._data.items() if predicate(v)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_config = _get_config()
+local_cache = LocalTTLCache(_config['LOCAL_MAXSIZE'], _config['LOCAL_TIMEOUT'])
+
+
+def dump_user(user):
+    return json.dumps({name: getattr(user, name) for name in SNAPSHOT_FIELDS}, cls=DjangoJSONEncoder)
+
+
+def load_user(raw):
+    data = json.loads(raw)
+    values = []
+    for field in User._meta.concrete_fields:
+        if field.attname in data:
+            values.append(field.to_python(data[field.attname]))
+    # 스냅샷에 없는 필드(password)는 deferred 상태가 되어 save() 시 갱신 대상에서 제외됩니다.
+    return User.from_db(DEFAULT_DB_ALIAS, [name for name in SNAPSHOT_FIELDS if name in data], values)
+
+
+def get_cached_user(key):
+    raw = local_cache.get(key)
+    if raw is None:
+        try:
+            raw = redis_client.get(f"{TOKEN_KEY_PREFIX}{key}")
+        except Exception as e:
+            logger.error(f"Error reading token cache: {str(e)}")
+            return None
+        if raw is None:
+            return None
+        local_cache.set(key, raw)
+    return load_user(raw)
+
+
+def cache_user(key, user):
+    raw = dump_user(user)
+    timeout = _config['TIMEOUT']
+    try:
+        pipe = redis_client.pipeline()
+        pipe.set(f"{TOKEN_KEY_PREFIX}{key}", raw, ex=timeout)
+        pipe.sadd(f"{USER_TOKENS_KEY_PREFIX}{user.pk}", key)
+        pipe.expire(f"{USER_TOKENS_KEY_PREFIX}{user.pk}", timeout)
+        pipe.execute()
+    except Exception as e:
+        logger.error(f"Error writing token cache: {str(e)}")
+        return
+    local_cache.set(key, raw)
+
+
+def invalidate_token(key):
+    local_cache.delete(key)
+    try:
+        redis_client.delete(f"{TOKEN_KEY_PREFIX}{key}")
+    except Exception as e:
+        logger.error(f"Error invalidating token cache: {str(e)}")
+
+
+def invalidate_user(user_id):
+    """해당 사용자의 모든 토큰 스냅샷을 삭제합니다. (사용자 수정/삭제, 토큰 교체 시 호출)"""
+    index_key = f"{USER_TOKENS_KEY_PREFIX}{user_id}"
+    try:
+        keys = [k.decode() for k in redis_client.smembers(index_key)]
+        pipe = redis_client.pipeline()
+        for key in keys:
+            pipe.delete(f"{TOKEN_KEY_PREFIX}{key}")
+        pipe.delete(index_key)
+        pipe.execute()
+    except Exception as e:
+        logger.error(f"Error invalidating token cache for user {user_id}: {str(e)}")
+    local_cache.delete_where(lambda raw: json.loads(raw).get('id') == user_id)
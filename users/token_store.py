@@ -0,0 +1,107 @@
+import logging
+from django.conf import settings
+from rest_framework.authtoken.models import Token
+from common.distributed_lock import redis_client
+from .token_cache import TOKEN_KEY_PREFIX, invalidate_token, invalidate_user
+
+logger = logging.getLogger(__name__)
+
+STORE_KEY_PREFIX = "auth:rtoken:"
+STORE_USER_KEY_PREFIX = "auth:rtoken_user:"
+
+# 토큰 조회와 만료 시간 연장(sliding expiration), 캐시된 사용자 스냅샷 조회를 한 번의 호출로 처리합니다.
+# KEYS[1]: 토큰 키, KEYS[2]: 캐시된 사용자 스냅샷 키, ARGV[1]: TTL, ARGV[2]: 사용자 토큰 인덱스 키 접두어
+_RESOLVE_SCRIPT = redis_client.register_script("""
+local user_id = redis.call('GET', KEYS[1])
+if not user_id then
+    return false
+end
+local ttl = tonumber(ARGV[1])
+if ttl > 0 then
+    redis.call('EXPIRE', KEYS[1], ttl)
+    redis.call('EXPIRE', ARGV[2] .. user_id, ttl)
+end
+return {user_id, redis.call('GET', KEYS[2])}
+""")
+
+
+def _get_config():
+    config = getattr(settings, 'AUTH_TOKEN_STORE', {})
+    return {
+        'BACKEND': config.get('BACKEND', 'db'),
+        'TIMEOUT': config.get('TIMEOUT', 60 * 60 * 24),
+        'SLIDING': config.get('SLIDING', True),
+    }
+
+
+def is_redis_store():
+    return _get_config()['BACKEND'] == 'redis'
+
+
+def issue_token(user):
+    """
+    기존 토큰을 모두 폐기하고 새 토큰을 발급합니다.
+    Redis 저장소를 사용하는 경우 DB에 쓰기가 발생하지 않습니다.
+    """
+    revoke_user_tokens(user.id)
+
+    if not is_redis_store():
+        return Token.objects.create(user=user).key
+
+    key = Token.generate_key()
+    timeout = _get_config()['TIMEOUT']
+    pipe = redis_client.pipeline()
+    pipe.set(f"{STORE_KEY_PREFIX}{key}", user.id, ex=timeout)
+    pipe.sadd(f"{STORE_USER_KEY_PREFIX}{user.id}", key)
+    pipe.expire(f"{STORE_USER_KEY_PREFIX}{user.id}", timeout)
+    pipe.execute()
+    return key
+
+
+def resolve_token(key):
+    """
+    Redis 저장소에서 토큰을 조회합니다.
+    (user_id, 캐시된 사용자 스냅샷 또는 None)을 반환하며, 토큰이 없으면 (None, None)을 반환합니다.
+    """
+    config = _get_config()
+    ttl = config['TIMEOUT'] if config['SLIDING'] else 0
+    result = _RESOLVE_SCRIPT(
+        keys=[f"{STORE_KEY_PREFIX}{key}", f"{TOKEN_KEY_PREFIX}{key}"],
+        args=[ttl, STORE_USER_KEY_PREFIX]
+    )
+    if not result:
+        return None, None
+    user_id, raw = result
+    return int(user_id), raw
+
+
+def revoke_token(key):
+    if is_redis_store():
+        try:
+            user_id = redis_client.get(f"{STORE_KEY_PREFIX}{key}")
+            pipe = redis_client.pipeline()
+            pipe.delete(f"{STORE_KEY_PREFIX}{key}")
+            if user_id is not None:
+                pipe.srem(f"{STORE_USER_KEY_PREFIX}{user_id.decode()}", key)
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"Error revoking token: {str(e)}")
+            raise
+    else:
+        Token.objects.filter(key=key).delete()
+    invalidate_token(key)
+
+
+def revoke_user_tokens(user_id):
+    """해당 사용자의 모든 토큰을 폐기합니다. (모든 기기에서 로그아웃)"""
+    if is_redis_store():
+        index_key = f"{STORE_USER_KEY_PREFIX}{user_id}"
+        keys = [k.decode() for k in redis_client.smembers(index_key)]
+        pipe = redis_client.pipeline()
+        for key in keys:
+            pipe.delete(f"{STORE_KEY_PREFIX}{key}")
+        pipe.delete(index_key)
+        pipe.execute()
+    else:
+        Token.objects.filter(user_id=user_id).delete()
+    invalidate_user(user_id)
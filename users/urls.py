@@ -4,8 +4,10 @@ from . import views
 urlpatterns = [
     path('login/', views.login_view, name='login'),
     path('logout/', views.logout_view, name='logout'),
+    path('logout/all/', views.logout_all_view, name='logout_all'),
     path('signup/', views.user_view, name='users'),
     path('my/', views.user_detail_view, name='user_detail'),
     path('admin/', views.admin_user_view, name='user_admin'),
+    path('admin/bulk/', views.admin_user_bulk_view, name='user_admin_bulk'),
     path('admin/<int:user_id>/', views.admin_user_detail_view, name='user_admin_detail'),
 ] 
\ No newline at end of file
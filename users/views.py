@@ -1,22 +1,33 @@
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth import authenticate
+from django.db.models import Count
+from datetime import datetime, timedelta
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, parser_classes
 from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
 from rest_framework.response import Response
-from rest_framework.authtoken.models import Token
+from rest_framework.parsers import MultiPartParser
+from django.core.exceptions import ValidationError
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from .models import User
+from .token_cache import invalidate_user
+from .token_store import issue_token, revoke_token, revoke_user_tokens
+from .bulk import API_MAX_ROWS, bulk_create_users, detect_format, parse_users
+from .pagination import UserCursorPagination
 from .serializers import (
     UserListResponseSerializer,
     UserSerializer,
+    AdminUserSerializer,
     UserCreateSerializer,
     UserUpdateSerializer,
     LoginSerializer,
-    AuthTokenSerializer
+    AuthTokenSerializer,
+    BulkSignupResponseSerializer
 )
 from common.serializers import ErrorResponseSerializer
+from common.versioning import conditional_on_version, bump_versions, user_version_key
+from common.query_budget import query_budget
 
 @swagger_auto_schema(
     method='post',
@@ -28,6 +39,7 @@ from common.serializers import ErrorResponseSerializer
         400: ErrorResponseSerializer
     }
 )
+@query_budget(3)
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def login_view(request):
@@ -44,10 +56,9 @@ def login_view(request):
         user = authenticate(username=username, password=password)
         
         if user is not None:
-            Token.objects.filter(user=user).delete()
-            token = Token.objects.create(user=user)
+            token_key = issue_token(user)
             response_data = {
-                'token': token.key,
+                'token': token_key,
                 'user': UserSerializer(user).data,
                 'user_id': user.id,
                 'username': user.username,
@@ -71,6 +82,7 @@ def login_view(request):
         401: ErrorResponseSerializer
     }
 )
+@query_budget(1)
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def logout_view(request):
@@ -81,8 +93,34 @@ def logout_view(request):
     Swagger UI에서는 토큰 값만 입력하세요.
     """
     try:
-        if hasattr(request.user, 'auth_token'):
-            request.user.auth_token.delete()
+        revoke_token(request.auth)
+        return Response(status=status.HTTP_200_OK)
+    except Exception as e:
+        return Response(
+            ErrorResponseSerializer({'error': f'로그아웃 처리 중 오류가 발생했습니다: {str(e)}'}).data,
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+@swagger_auto_schema(
+    method='post',
+    operation_summary="전체 로그아웃 API",
+    operation_description="현재 사용자에게 발급된 모든 인증 토큰을 무효화합니다.",
+    responses={
+        200: None,
+        401: ErrorResponseSerializer
+    }
+)
+@query_budget(1)
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def logout_all_view(request):
+    """
+    전체 로그아웃 API
+    
+    현재 사용자의 모든 기기에서 발급된 인증 토큰을 삭제합니다.
+    """
+    try:
+        revoke_user_tokens(request.user.id)
         return Response(status=status.HTTP_200_OK)
     except Exception as e:
         return Response(
@@ -100,6 +138,7 @@ def logout_view(request):
         400: ErrorResponseSerializer
     }
 )
+@query_budget(3)
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def user_view(request):
@@ -126,15 +165,96 @@ def user_view(request):
                             status=status.HTTP_201_CREATED)
     return Response(ErrorResponseSerializer(serializer.errors).data, status=status.HTTP_400_BAD_REQUEST)
 
+class RawUploadParser(MultiPartParser):
+    """multipart 파일 업로드 외에 text/csv, application/x-ndjson 본문도 그대로 받습니다."""
+    media_type = '*/*'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if media_type and media_type.startswith('multipart/'):
+            return super().parse(stream, media_type, parser_context)
+        return stream.read() if stream else b''
+
+@swagger_auto_schema(
+    method='post',
+    operation_summary="사용자 일괄 생성 API",
+    operation_description="관리자가 CSV(username,password) 또는 NDJSON 형식으로 여러 사용자를 한 번에 생성합니다. "
+                          "multipart의 file 필드 또는 요청 본문(Content-Type: text/csv, application/x-ndjson)으로 전달할 수 있습니다. "
+                          f"한 번에 최대 {API_MAX_ROWS}명까지 생성할 수 있으며, 더 많은 사용자는 bulk_signup 명령을 사용해주세요.",
+    manual_parameters=[
+        openapi.Parameter(
+            'type',
+            openapi.IN_QUERY,
+            description="입력 형식 (csv, ndjson). 생략 시 파일 확장자 또는 Content-Type으로 판단합니다.",
+            type=openapi.TYPE_STRING,
+            required=False
+        )
+    ],
+    responses={
+        201: BulkSignupResponseSerializer,
+        400: ErrorResponseSerializer,
+        403: ErrorResponseSerializer
+    }
+)
+@query_budget(5)
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+@parser_classes([RawUploadParser])
+def admin_user_bulk_view(request):
+    """
+    사용자 일괄 생성 관리자 API
+
+    이미 존재하거나 형식이 잘못된 사용자는 건너뛰고, 생성/제외된 사용자 목록을 반환합니다.
+    비밀번호는 요청을 처리하는 프로세스에서 해싱합니다. (프로세스 풀은 bulk_signup 명령에서만 사용)
+    """
+    upload = request.FILES.get('file')
+    if upload is not None:
+        content = upload.read()
+        input_format = request.query_params.get('type') or detect_format(filename=upload.name)
+    else:
+        content = request.data
+        input_format = request.query_params.get('type') or detect_format(content_type=request.content_type)
+
+    # file 필드 없이 multipart로 보낸 경우 request.data는 QueryDict입니다.
+    if not isinstance(content, (bytes, str)):
+        return Response(ErrorResponseSerializer({'error': '업로드할 파일(file) 또는 요청 본문이 필요합니다.'}).data,
+                         status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        rows = parse_users(content, input_format)
+    except ValidationError as e:
+        return Response(ErrorResponseSerializer({'error': ' '.join(e.messages)}).data,
+                         status=status.HTTP_400_BAD_REQUEST)
+
+    if len(rows) > API_MAX_ROWS:
+        return Response(ErrorResponseSerializer({'error': f'한 번에 최대 {API_MAX_ROWS}명까지 생성할 수 있습니다. bulk_signup 명령을 사용해주세요.'}).data,
+                         status=status.HTTP_400_BAD_REQUEST)
+
+    report = bulk_create_users(rows, workers=1)
+    return Response(BulkSignupResponseSerializer(report).data, status=status.HTTP_201_CREATED)
+
 @swagger_auto_schema(
     method='get',
     operation_summary="사용자 목록 조회 API",
-    operation_description="관리자만 모든 사용자 목록을 조회할 수 있습니다.",
+    operation_description="관리자만 모든 사용자 목록을 조회할 수 있습니다. 커서 기반 페이지네이션과 사용자명 검색, 필터를 지원합니다.",
+    manual_parameters=[
+        openapi.Parameter('search', openapi.IN_QUERY, description="사용자명 검색어", type=openapi.TYPE_STRING),
+        openapi.Parameter('search_mode', openapi.IN_QUERY, description="검색 방식 (prefix: 접두어, contains: 부분 문자열, 기본값: prefix)",
+                          type=openapi.TYPE_STRING, enum=['prefix', 'contains']),
+        openapi.Parameter('is_superuser', openapi.IN_QUERY, description="관리자 여부 (true/false)", type=openapi.TYPE_BOOLEAN),
+        openapi.Parameter('created_after', openapi.IN_QUERY, description="가입일 시작 (YYYY-MM-DD, 포함)", type=openapi.TYPE_STRING),
+        openapi.Parameter('created_before', openapi.IN_QUERY, description="가입일 종료 (YYYY-MM-DD, 포함)", type=openapi.TYPE_STRING),
+        openapi.Parameter('with_reservation_count', openapi.IN_QUERY, description="사용자별 예약 수 포함 여부 (true/false)",
+                          type=openapi.TYPE_BOOLEAN),
+        openapi.Parameter('cursor', openapi.IN_QUERY, description="페이지 커서", type=openapi.TYPE_STRING),
+        openapi.Parameter('page_size', openapi.IN_QUERY, description="페이지 크기 (최대 500)", type=openapi.TYPE_INTEGER),
+    ],
     responses={
         200: UserListResponseSerializer,
+        400: ErrorResponseSerializer,
         403: ErrorResponseSerializer
     }
 )
+@query_budget(1)
 @api_view(['GET'])
 @permission_classes([IsAdminUser])
 def admin_user_view(request):
@@ -142,9 +262,47 @@ def admin_user_view(request):
     사용자 API
 
     관리자만 모든 사용자 목록을 조회할 수 있습니다.
+    - search: 사용자명 검색 (search_mode=prefix|contains)
+    - is_superuser, created_after, created_before: 필터
+    - with_reservation_count=true: 사용자별 예약 수를 하나의 집계 쿼리로 함께 조회
     """
+    params = request.query_params
     users = User.objects.all()
-    user_data = UserListResponseSerializer({'users': UserSerializer(users, many=True).data})
+
+    search = params.get('search')
+    if search:
+        search_mode = params.get('search_mode', 'prefix')
+        if search_mode == 'prefix':
+            users = users.filter(username__istartswith=search)
+        elif search_mode == 'contains':
+            users = users.filter(username__icontains=search)
+        else:
+            return Response(ErrorResponseSerializer({'error': 'search_mode는 prefix 또는 contains만 가능합니다.'}).data,
+                             status=status.HTTP_400_BAD_REQUEST)
+
+    if 'is_superuser' in params:
+        users = users.filter(is_superuser=params.get('is_superuser').lower() == 'true')
+
+    try:
+        # created_at 인덱스를 사용할 수 있도록 날짜가 아닌 시각 범위로 비교합니다.
+        if params.get('created_after'):
+            users = users.filter(created_at__gte=datetime.strptime(params['created_after'], '%Y-%m-%d'))
+        if params.get('created_before'):
+            users = users.filter(created_at__lt=datetime.strptime(params['created_before'], '%Y-%m-%d') + timedelta(days=1))
+    except ValueError:
+        return Response(ErrorResponseSerializer({'error': '올바른 날짜 형식이 아닙니다. (YYYY-MM-DD)'}).data,
+                         status=status.HTTP_400_BAD_REQUEST)
+
+    if params.get('with_reservation_count', '').lower() == 'true':
+        users = users.annotate(reservation_count=Count('reservations'))
+
+    paginator = UserCursorPagination()
+    page = paginator.paginate_queryset(users, request)
+    user_data = UserListResponseSerializer({
+        'next': paginator.get_next_link(),
+        'previous': paginator.get_previous_link(),
+        'users': AdminUserSerializer(page, many=True).data
+    })
     return Response(user_data.data)
 
 @swagger_auto_schema(
@@ -179,8 +337,10 @@ def admin_user_view(request):
         403: ErrorResponseSerializer,
     }
 )
+@query_budget(GET=0, PUT=1, DELETE=7)
 @api_view(['GET', 'PUT', 'DELETE'])
 @permission_classes([IsAuthenticated])
+@conditional_on_version(lambda request: user_version_key(request.user.id))
 def user_detail_view(request):
     """
     본인 정보 조회/수정/삭제 API
@@ -211,13 +371,17 @@ def user_detail_view(request):
                 request.user.password = make_password(serializer.validated_data['password'])
             
             request.user.save()
+            invalidate_user(request.user.id)
+            bump_versions(user_version_key(request.user.id))
             
             return Response(UserSerializer({'user_id': request.user.id, 'username': request.user.username}).data,
                              status=status.HTTP_200_OK)
         return Response(ErrorResponseSerializer(serializer.errors).data, status=status.HTTP_400_BAD_REQUEST)
     
     elif request.method == 'DELETE':
+        user_id = request.user.id
         request.user.delete()
+        revoke_user_tokens(user_id)
         return Response(
             status=status.HTTP_204_NO_CONTENT
         )
@@ -255,6 +419,7 @@ def user_detail_view(request):
         404: ErrorResponseSerializer
     }
 )
+@query_budget(GET=1, PUT=2, DELETE=8)
 @api_view(['GET', 'PUT', 'DELETE'])
 @permission_classes([IsAdminUser])
 def admin_user_detail_view(request, user_id):
@@ -289,6 +454,8 @@ def admin_user_detail_view(request, user_id):
                 user.password = make_password(serializer.validated_data['password'])
             
             user.save()
+            invalidate_user(user.id)
+            bump_versions(user_version_key(user.id))
             
             return Response(UserSerializer({'user_id': user.id, 'username': user.username}).data,
                              status=status.HTTP_200_OK)
@@ -299,6 +466,7 @@ def admin_user_detail_view(request, user_id):
             return Response(ErrorResponseSerializer({'error': '권한이 없습니다.'}).data,
                              status=status.HTTP_403_FORBIDDEN)
         user.delete()
+        revoke_user_tokens(user_id)
         return Response(
             status=status.HTTP_204_NO_CONTENT
         )    
\ No newline at end of file